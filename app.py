@@ -0,0 +1,38 @@
+import streamlit as st
+
+# Single-process entry point for every viewer:
+#     streamlit run app.py
+# Each page is one of the existing scripts, run as-is; they share one Python
+# process, so the connection pool, room index and LLM client caches
+# (viewer_data.py, webapp2.py) are built once for all pages and sessions.
+# The scripts still run on their own with `streamlit run <script>.py`.
+
+st.set_page_config(
+    page_title="Timetable Management",
+    page_icon=":calendar:",
+    layout="wide",
+    initial_sidebar_state="expanded",
+)
+
+# Pages grouped in the sidebar navigation, first one is the landing page
+PAGES = {
+    "Timetables": [
+        st.Page("single_app.py", title="Section Timetable", icon=":material/calendar_month:", default=True),
+        st.Page("slot_option.py", title="Section Periods", icon=":material/schedule:"),
+        st.Page("room_app.py", title="Room Timetable", icon=":material/meeting_room:"),
+        st.Page("my_timetable.py", title="My Timetable", icon=":material/person_pin:"),
+        st.Page("webapp.py", title="Class Timetable (CSE)", icon=":material/table_view:"),
+    ],
+    "Analytics": [
+        st.Page("utilization_app.py", title="Room Utilization", icon=":material/monitoring:"),
+    ],
+    "CSE Reference": [
+        st.Page("faculty.py", title="Faculty", icon=":material/person:"),
+        st.Page("timings.py", title="Period Timings", icon=":material/timer:"),
+    ],
+    "Assistant": [
+        st.Page("webapp2.py", title="Ask & Modify", icon=":material/smart_toy:"),
+    ],
+}
+
+st.navigation(PAGES).run()
@@ -0,0 +1,88 @@
+"""
+Memory footprint and first-render time of the viewers run as separate
+Streamlit processes versus one process running the multipage app.py.
+
+Each measurement runs in a fresh Python process through Streamlit's AppTest
+harness (the script runner without the web server, so both sides skip the
+same server overhead):
+  separate - one process per script: cold start (interpreter, imports,
+             first script run) and peak RSS, summed over the scripts
+  unified  - one process: app.py's landing page, then a switch to every
+             other page, with the process's peak RSS
+
+Pages that cannot start here (e.g. missing optional dependencies) are
+reported and left out of both totals.
+
+Run from the repository root:
+    python -m benchmarks.bench_app_startup [--runs 3]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+SCRIPTS = ["single_app.py", "slot_option.py", "room_app.py", "webapp.py", "faculty.py", "timings.py", "webapp2.py"]
+
+SEPARATE = """
+import json, resource, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+render = time.perf_counter() - start
+print(json.dumps({"ok": not at.exception, "render_s": render,
+                  "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+UNIFIED = """
+import json, resource, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=120).run()
+pages = {sys.argv[1]: (not at.exception, time.perf_counter() - start)}
+for page in sys.argv[2:]:
+    began = time.perf_counter()
+    at.switch_page(page).run()
+    pages[page] = (not at.exception, time.perf_counter() - began)
+print(json.dumps({"pages": pages, "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def run(code, *args):
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code, *args], capture_output=True, text=True, check=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["wall_s"] = time.perf_counter() - start
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="repeat each measurement, keep the best")
+    args = parser.parse_args()
+
+    separate = {}
+    for script in SCRIPTS:
+        results = [run(SEPARATE, script) for _ in range(args.runs)]
+        separate[script] = min(results, key=lambda result: result["wall_s"])
+
+    unified = min((run(UNIFIED, *SCRIPTS) for _ in range(args.runs)), key=lambda result: result["wall_s"])
+    ok = [script for script in SCRIPTS if separate[script]["ok"] and unified["pages"][script][0]]
+
+    print(f"{'page':<16}{'process start+render':>22}{'peak RSS':>11}{'render in app.py':>18}")
+    for script in SCRIPTS:
+        result = separate[script]
+        note = "" if script in ok else "   (fails here, not counted)"
+        print(f"{script:<16}{result['wall_s']:>20.2f} s{result['rss_mb']:>8.0f} MB{unified['pages'][script][1]:>16.2f} s{note}")
+
+    separate_s = sum(separate[script]["wall_s"] for script in ok)
+    separate_mb = sum(separate[script]["rss_mb"] for script in ok)
+    unified_s = sum(unified["pages"][script][1] for script in ok)
+    print(f"\n{len(ok)} pages")
+    print(f"  separate processes  {separate_s:7.2f} s to first render of every page, {separate_mb:6.0f} MB resident in total")
+    print(f"  one app.py process  {unified['wall_s']:7.2f} s for the process and every page "
+          f"({unified_s:.2f} s of page renders), {unified['rss_mb']:6.0f} MB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Excel upload into TIMETABLE: the old per-row iterrows loop versus the staged
+set-based path in bulk_upload (default: 5000 rows, half of them new NAMEs).
+
+Run from the repository root:
+    python -m benchmarks.bench_bulk_upload [--rows 5000] [--action add]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from bulk_upload import apply_upload, stage_frame
+
+COLUMNS = ["NAME", "CLASS", "DAY", "TIME", "SUBJECT", "PROFESSOR", "ROOM"]
+
+
+def make_table(db_file, rows):
+    conn = sqlite3.connect(db_file)
+    conn.execute(f"CREATE TABLE TIMETABLE ({', '.join(f'{col} TEXT' for col in COLUMNS)})")
+    conn.executemany(
+        f"INSERT INTO TIMETABLE VALUES ({', '.join('?' * len(COLUMNS))})",
+        [(f"N{i:06d}", f"C{i % 40}", "MONDAY", "P1", f"SUB{i % 90}", f"PROF{i % 300}", f"R{i % 120}") for i in range(rows)],
+    )
+    conn.commit()
+    return conn
+
+
+def upload_frame(rows):
+    """Half the NAMEs already exist in the table, half are new."""
+    start = rows // 2
+    return pd.DataFrame(
+        [(f"N{i:06d}", f"C{i % 40}", "TUESDAY", "P2", f"SUB{i % 90}", f"PROF{i % 300}", f"R{i % 120}") for i in range(start, start + rows)],
+        columns=[col.lower() for col in COLUMNS],
+    )
+
+
+def per_row(conn, df, column_mappings, action):
+    # The loop process_excel_file used before bulk_upload
+    cursor = conn.cursor()
+    for _, row in df.iterrows():
+        mapped_row = {column_mappings[col]: value for col, value in row.items()}
+        if action == "remove":
+            cursor.execute("DELETE FROM TIMETABLE WHERE NAME=?", (mapped_row.get("NAME"),))
+        elif action == "modify":
+            set_clause = ", ".join([f"{col}=?" for col in mapped_row.keys()])
+            cursor.execute(f"UPDATE TIMETABLE SET {set_clause} WHERE NAME=?", tuple(mapped_row.values()) + (mapped_row.get("NAME"),))
+        else:
+            cursor.execute("SELECT * FROM TIMETABLE WHERE NAME=?", (mapped_row.get("NAME"),))
+            if cursor.fetchone():
+                set_clause = ", ".join([f"{col}=?" for col in mapped_row.keys()])
+                cursor.execute(f"UPDATE TIMETABLE SET {set_clause} WHERE NAME=?", tuple(mapped_row.values()) + (mapped_row.get("NAME"),))
+            else:
+                placeholders = ", ".join(["?" for _ in mapped_row])
+                cursor.execute(f"INSERT INTO TIMETABLE ({', '.join(mapped_row.keys())}) VALUES ({placeholders})", tuple(mapped_row.values()))
+    conn.commit()
+
+
+def bulk(conn, df, column_mappings, action):
+    apply_upload(conn, stage_frame(df, column_mappings), action)
+
+
+def timed(fn, db_file, rows, df, column_mappings, action):
+    conn = make_table(db_file, rows)
+    start = time.perf_counter()
+    fn(conn, df, column_mappings, action)
+    elapsed = time.perf_counter() - start
+    snapshot = conn.execute("SELECT * FROM TIMETABLE ORDER BY NAME").fetchall()
+    conn.close()
+    os.remove(db_file)
+    return elapsed, snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--action", choices=["add", "modify", "remove"], default="add")
+    args = parser.parse_args()
+
+    df = upload_frame(args.rows)
+    column_mappings = {col.lower(): col for col in COLUMNS}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "timetable.db")
+        slow, slow_rows = timed(per_row, db_file, args.rows, df, column_mappings, args.action)
+        fast, fast_rows = timed(bulk, db_file, args.rows, df, column_mappings, args.action)
+
+    print(f"{args.action} {args.rows} rows into a {args.rows}-row TIMETABLE")
+    print(f"  per-row iterrows  {slow:8.3f} s")
+    print(f"  staged bulk       {fast:8.3f} s   ({slow / fast:.1f}x)")
+    print(f"  same result       {slow_rows == fast_rows}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Column mapping for an Excel upload: one model call per column (the old
+map_columns) versus column_mapping.ColumnMapper (fuzzy fast path, one batched
+prompt, persistent cache). Uses a local stub model with a fixed per-call
+latency, so no API key is needed.
+
+Run from the repository root:
+    python -m benchmarks.bench_column_mapping [--latency 0.8]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from column_mapping import ColumnMapper, stub_model
+
+DB_COLUMNS = ["NAME", "CLASS", "DAY", "TIME", "SUBJECT", "PROFESSOR", "ROOM"]
+HEADERS = ["Name", "Class ", "day", "Time Slot", "Subject Name", "Faculty", "Room No.", "Remarks"]
+ANSWERS = {"Time Slot": "TIME", "Subject Name": "SUBJECT", "Faculty": "PROFESSOR", "Room No.": "ROOM", "Remarks": "REMARKS"}
+
+
+def per_column(headers, db_columns, latency):
+    # The map_columns loop before ColumnMapper: one round trip per header
+    mappings = {}
+    for header in headers:
+        time.sleep(latency)
+        mappings[header] = ANSWERS.get(header, header.strip().upper())
+    return mappings, len(headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.8, help="seconds per stub model call")
+    args = parser.parse_args()
+
+    print(f"{len(HEADERS)} headers against {len(DB_COLUMNS)} columns, {args.latency:.2f} s per model call\n")
+    print(f"{'path':<28}{'seconds':>10}{'model calls':>14}")
+
+    start = time.perf_counter()
+    _, calls = per_column(HEADERS, DB_COLUMNS, args.latency)
+    print(f"{'per-column prompts':<28}{time.perf_counter() - start:>10.3f}{calls:>14}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mapper = ColumnMapper(stub_model(ANSWERS, args.latency), cache_path=os.path.join(tmp, "cache.db"))
+        for label, headers in [
+            ("fuzzy + batched (cold)", HEADERS),
+            ("cached (same headers)", HEADERS),
+            ("fuzzy only", ["name", "CLASS", "Day", "time", "subject", "professor", "room"]),
+        ]:
+            calls = mapper.model_calls
+            start = time.perf_counter()
+            mapper.map(headers, DB_COLUMNS)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<28}{elapsed:>10.3f}{mapper.model_calls - calls:>14}   ({mapper.last_source})")
+        print(f"\nmapping: {mapper.map(HEADERS, DB_COLUMNS)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Click-to-render latency of the "Get Timetable" path in single_app.py,
+connecting per call (before) versus the shared ConnectionPool (after).
+
+Run from the repository root:
+    python -m benchmarks.bench_connection_pool [--runs 500]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import time
+
+import pandas as pd
+
+from data_access import ConnectionPool
+
+BASE_DIR = os.path.join(os.getcwd(), "Database")
+BRANCH = "CSE"
+TIMETABLE_DB = os.path.join(BASE_DIR, BRANCH, "cse_timetable.db")
+FACULTY_DB = os.path.join(BASE_DIR, BRANCH, "cse_faculty.db")
+TIMINGS_DB = os.path.join(BASE_DIR, BRANCH, "cse_timings.db")
+
+TIMETABLE_QUERY = """
+    SELECT ROOM, STRENGTH, MONDAY_P1 AS P1, MONDAY_P2 AS P2, MONDAY_P3 AS P3, MONDAY_P4 AS P4,
+           MONDAY_P5 AS P5, MONDAY_P6 AS P6, MONDAY_P7 AS P7
+    FROM TIMETABLE
+    WHERE BLOCK = ? AND YEAR = ? AND SECTION = ?
+"""
+TIMINGS_QUERY = "SELECT Period, Start_Time, End_Time FROM timings"
+
+
+def faculty_query(subjects):
+    placeholders = ",".join(["?"] * len(subjects))
+    return f"""
+        SELECT Year, sections, Subject, Name AS Faculty_Name
+        FROM faculty
+        WHERE Subject IN ({placeholders}) AND Year = ? AND sections = ?
+    """
+
+
+def click(read_sql):
+    """One "Get Timetable" click: timetable, faculty and timings lookups plus the merge."""
+    timetable_df = read_sql(TIMETABLE_DB, TIMETABLE_QUERY, ("AB-02", "E1", "CSE-01"))
+    periods = ["P1", "P2", "P3", "P4", "P5", "P6", "P7"]
+    subjects = [sub for sub in timetable_df[periods].values.flatten() if pd.notna(sub)]
+    faculty_df = read_sql(FACULTY_DB, faculty_query(subjects), subjects + ["E1", "CSE-01"])
+    timings_df = read_sql(TIMINGS_DB, TIMINGS_QUERY, ())
+    return (
+        pd.DataFrame({"Period": periods[:len(subjects)], "Subject": subjects})
+        .merge(faculty_df, how="left", on="Subject")
+        .merge(timings_df, how="left", on="Period")
+    )
+
+
+def connect_per_call(db_path, query, params):
+    conn = sqlite3.connect(db_path)
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    return df
+
+
+def measure(read_sql, runs):
+    click(read_sql)  # warm-up
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        click(read_sql)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    pool = ConnectionPool().warm()
+    results = {
+        "connect per call": measure(connect_per_call, args.runs),
+        "shared pool": measure(pool.read_sql, args.runs),
+    }
+    pool.close()
+
+    print(f"{'mode':<18}{'p50 ms':>10}{'p95 ms':>10}")
+    for mode, (p50, p95) in results.items():
+        print(f"{mode:<18}{p50:>10.3f}{p95:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Dashboard data cost as TIMETABLE grows, and what keeping the counts costs
+writers.
+
+Each size is classes x 42 slots over a fixed 200 rooms and 300 professors,
+so the number of bars stays put while rows grow. The dashboard's data is
+fetched three ways:
+  full frame - SELECT * and value_counts per chart, as px.histogram did
+  group by   - one GROUP BY query per chart
+  maintained - dashboard_stats.read_dashboard_stats (the trigger-kept table)
+Then the write side: single-row UPDATEs and a 10k-row INSERT with and
+without the dashboard_counts triggers installed.
+
+Run from the repository root:
+    python -m benchmarks.bench_dashboard_stats [--classes 500 5000 20000]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_timetable_validator import DAYS, TIMES
+from dashboard_stats import install_dashboard_stats, read_dashboard_stats
+
+CHARTS = ["DAY", "SUBJECT", "ROOM", "PROFESSOR", "TIME"]
+ROOMS, PROFESSORS, SUBJECTS = 200, 300, 300
+
+
+def build(db_file, classes):
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE TIMETABLE (CLASS TEXT, DAY TEXT, TIME TEXT, SUBJECT TEXT, PROFESSOR TEXT, ROOM TEXT)")
+    slots = [(day, time) for day in DAYS for time in TIMES]
+    conn.executemany("INSERT INTO TIMETABLE VALUES (?, ?, ?, ?, ?, ?)", (
+        (f"C{c:05d}", day, time, f"SUB{(c * 7 + s) % SUBJECTS:03d}", f"Prof. {(c + s) % PROFESSORS:03d}",
+         f"Room {c % ROOMS:03d}")
+        for c in range(classes)
+        for s, (day, time) in enumerate(slots)
+    ))
+    conn.commit()
+    return conn
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def full_frame(conn):
+    df = pd.read_sql_query("SELECT * FROM TIMETABLE", conn)
+    return {col: df[col].value_counts() for col in CHARTS}
+
+
+def group_by(conn):
+    return {col: pd.read_sql_query(f"SELECT {col}, COUNT(*) FROM TIMETABLE GROUP BY {col}", conn) for col in CHARTS}
+
+
+def writes(conn, edits=200):
+    """ms per single-row UPDATE, ms for a 10k-row INSERT ... SELECT."""
+    start = time.perf_counter()
+    for i in range(edits):
+        conn.execute("UPDATE TIMETABLE SET ROOM = ? WHERE rowid = ?", (f"Room {i % ROOMS:03d}", i * 7 + 1))
+        conn.commit()
+    update_ms = (time.perf_counter() - start) / edits * 1000
+    start = time.perf_counter()
+    conn.execute("INSERT INTO TIMETABLE SELECT * FROM TIMETABLE LIMIT 10000")
+    conn.commit()
+    return update_ms, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, nargs="+", default=[500, 5000, 20000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'full frame':>13}{'group by':>11}{'maintained':>13}{'chart rows':>13}"
+          f"{'update ms (plain/trig)':>25}{'10k insert ms':>17}")
+    for classes in args.classes:
+        with tempfile.TemporaryDirectory() as tmp:
+            plain = build(os.path.join(tmp, "plain.db"), classes)
+            conn = build(os.path.join(tmp, "timetable.db"), classes)
+            install_dashboard_stats(conn)
+            rows = conn.execute("SELECT COUNT(*) FROM TIMETABLE").fetchone()[0]
+            counts = conn.execute("SELECT COUNT(*) FROM dashboard_counts WHERE dimension != 'ROOM_SLOT'").fetchone()[0]
+
+            full_ms = timed(lambda: full_frame(conn), repeat=1)
+            group_ms = timed(lambda: group_by(conn))
+            kept_ms = timed(lambda: read_dashboard_stats(conn))
+            plain_update, plain_insert = writes(plain)
+            kept_update, kept_insert = writes(conn)
+            plain.close()
+            conn.close()
+        print(f"{rows:>8}{full_ms:>10.1f} ms{group_ms:>8.1f} ms{kept_ms:>10.1f} ms{counts:>13}"
+              f"{plain_update:>15.3f} / {kept_update:.3f}{plain_insert:>9.0f} / {kept_insert:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Rows/sec of each Excel reader engine (see excel_reader.ENGINES) over the
+workbooks in Data/ and Modified Data/.
+
+Run from the repository root:
+    python -m benchmarks.bench_excel_readers [--repeat 3]
+"""
+import argparse
+import glob
+import os
+import time
+
+from excel_reader import READERS, available_engines
+
+WORKBOOK_EXTENSIONS = (".xlsx", ".xls", ".ods")
+
+
+def workbooks():
+    paths = glob.glob(os.path.join("Data", "*")) + glob.glob(os.path.join("Modified Data", "*", "*"))
+    return sorted(path for path in paths if path.lower().endswith(WORKBOOK_EXTENSIONS))
+
+
+def time_engine(engine, path, repeat):
+    """Best-of-repeat seconds and row count for one workbook, or None if the engine cannot read it."""
+    best, rows = None, 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            df = READERS[engine](path, 0)
+        except (ImportError, ValueError, OSError) as e:
+            return None, str(e).splitlines()[0][:40]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        rows = len(df)
+    return best, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per workbook; the fastest is kept")
+    args = parser.parse_args()
+
+    engines = available_engines()
+    paths = workbooks()
+    totals = {engine: [0.0, 0] for engine in engines}
+
+    width = max(len(path) for path in paths) + 2
+    print(f"{'workbook':<{width}}" + "".join(f"{engine + ' rows/s':>24}" for engine in engines))
+    for path in paths:
+        cells = []
+        for engine in engines:
+            seconds, rows = time_engine(engine, path, args.repeat)
+            if seconds is None:
+                cells.append(f"{'n/a':>24}")
+                continue
+            totals[engine][0] += seconds
+            totals[engine][1] += rows
+            cells.append(f"{rows / seconds:>24,.0f}")
+        print(f"{path:<{width}}" + "".join(cells))
+
+    print(f"\n{'engine':<18}{'rows':>8}{'seconds':>10}{'rows/s':>12}")
+    for engine, (seconds, rows) in totals.items():
+        rate = rows / seconds if seconds else 0
+        print(f"{engine:<18}{rows:>8}{seconds:>10.3f}{rate:>12,.0f}")
+    print("\nTotals cover only the workbooks each engine could read (openpyxl_stream skips .xls/.ods).")
+
+
+if __name__ == "__main__":
+    main()
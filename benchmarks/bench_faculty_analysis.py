@@ -0,0 +1,59 @@
+"""
+Faculty clash/load/streak analysis on a synthetic campus (default: 50
+branches x 4 years x 8 sections, 2000 faculty), timed end to end.
+
+Run from the repository root:
+    python -m benchmarks.bench_faculty_analysis [--branches 50] [--faculty 2000]
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from benchmarks.bench_slots_layout import synthetic_campus
+from database import timetable_to_slots
+from faculty_analysis import analyse
+
+
+def synthetic_faculty(slots, faculty_count, seed=17):
+    """Staff every (branch, year, subject): its sections split into groups of 1-3, each taught by one name."""
+    rng = random.Random(seed)
+    names = [f"Dr. Faculty {i:04d}" for i in range(faculty_count)]
+    rows = []
+    taught = slots.drop_duplicates(subset=["branch", "year", "subject", "section"])
+    for (branch, year, subject), group in taught.groupby(["branch", "year", "subject"]):
+        sections = sorted(group["section"])
+        while sections:
+            size = rng.randint(1, 3)
+            chunk, sections = sections[:size], sections[size:]
+            rows.append((branch, year, subject, rng.choice(names), ", ".join(chunk)))
+    return pd.DataFrame(rows, columns=["branch", "YEAR", "Subject", "Name", "sections"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--branches", type=int, default=50)
+    parser.add_argument("--faculty", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = synthetic_campus(args.branches, 8)
+    slots = pd.concat([timetable_to_slots(df, branch) for branch, df in frames.items()], ignore_index=True)
+    faculty = synthetic_faculty(slots, args.faculty)
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        report = analyse(faculty, slots)
+        timings.append(time.perf_counter() - start)
+
+    print(f"{args.branches} branches: {len(slots)} period cells, {len(faculty)} faculty rows, "
+          f"{faculty['Name'].nunique()} faculty")
+    print(f"  analyse()   best {min(timings):.3f} s of {args.runs}")
+    for name, df in report.items():
+        print(f"  {name:<10}{len(df):>8} rows")
+
+
+if __name__ == "__main__":
+    main()
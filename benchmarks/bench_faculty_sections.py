@@ -0,0 +1,85 @@
+"""
+Section filtering on the faculty table: LIKE over the comma-separated
+sections column versus the exploded faculty_sections index.
+
+Builds a synthetic faculty database (the CSE sheet's shape, scaled up to
+--sections sections with a few subjects each, some rows shared by two
+sections as "CSE-01, CSE-02") and times, per lookup:
+  like   - faculty.py's old filter, sections LIKE '%CSE-1%' (a full scan)
+  index  - rowid IN (SELECT faculty_id FROM faculty_sections WHERE section = ?)
+Also reports the rows each filter returns for section CSE-1, where LIKE
+also matches CSE-10..CSE-19, CSE-100.. and so on.
+
+Run from the repository root:
+    python -m benchmarks.bench_faculty_sections [--sections 2000] [--lookups 500]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from database import FACULTY_BY_SECTION_VIEW, write_faculty_sections
+
+SUBJECTS = ["DAA", "DLD", "P & S", "OS", "DBMS", "CN", "COA", "SE"]
+LIKE = "SELECT YEAR, subject_code, Subject, Name, sections FROM faculty WHERE (sections LIKE ? OR sections LIKE ?)"
+INDEX = ("SELECT YEAR, subject_code, Subject, Name, sections FROM faculty "
+         "WHERE rowid IN (SELECT faculty_id FROM faculty_sections WHERE section = ?)")
+
+
+def build(db_file, n_sections, seed):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(1, n_sections + 1):
+        for subject in SUBJECTS:
+            sections = f"CSE-{i}"
+            if i < n_sections and rng.random() < 0.2:
+                sections += f", CSE-{i + 1}"
+            rows.append((f"E{rng.randint(1, 4)}", f"23CS{rng.randint(1000, 9999)}", subject,
+                         f"Faculty {rng.randint(1, n_sections * 2)}", sections))
+    conn = sqlite3.connect(db_file)
+    with conn:
+        conn.execute("CREATE TABLE faculty (YEAR TEXT, subject_code TEXT, Subject TEXT, Name TEXT, sections TEXT)")
+        conn.executemany("INSERT INTO faculty VALUES (?, ?, ?, ?, ?)", rows)
+        write_faculty_sections(conn)
+        conn.execute(FACULTY_BY_SECTION_VIEW)
+    return conn, len(rows)
+
+
+def per_lookup(conn, query, params_for, sections):
+    start = time.perf_counter()
+    for section in sections:
+        conn.execute(query, params_for(section)).fetchall()
+    return (time.perf_counter() - start) / len(sections) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn, n_rows = build(os.path.join(tmp, "faculty.db"), args.sections, args.seed)
+        rng = random.Random(args.seed)
+        sections = [f"CSE-{rng.randint(1, args.sections)}" for _ in range(args.lookups)]
+
+        like_us = per_lookup(conn, LIKE, lambda s: (f"%{s}%", f"%{s} %"), sections)
+        index_us = per_lookup(conn, INDEX, lambda s: (s,), sections)
+
+        like_rows = conn.execute(LIKE, ("%CSE-1%", "%CSE-1 %")).fetchall()
+        index_rows = conn.execute(INDEX, ("CSE-1",)).fetchall()
+        n_index = conn.execute("SELECT COUNT(*) FROM faculty_sections").fetchone()[0]
+        conn.close()
+
+    print(f"{n_rows} faculty rows, {n_index} faculty_sections rows, {args.lookups} lookups")
+    print(f"  LIKE scan       {like_us:9.1f} us per lookup")
+    print(f"  section index   {index_us:9.1f} us per lookup   ({like_us / index_us:.0f}x)")
+    print(f"  rows for CSE-1: LIKE {len(like_rows)}, index {len(index_rows)} "
+          f"(LIKE also returns CSE-10, CSE-11, ...)")
+
+
+if __name__ == "__main__":
+    main()
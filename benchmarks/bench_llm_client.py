@@ -0,0 +1,81 @@
+"""
+llm_client.AsyncLLMClient against fake_llm_server under injected latency,
+errors, stalls and dropped connections: a burst of concurrent sessions, each
+making one call, with and without deadlines/retries.
+
+Run from the repository root:
+    python -m benchmarks.bench_llm_client [--sessions 40] [--error-rate 0.2] [--stall-rate 0.05]
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from fake_llm_server import FakeLLMServer
+from llm_client import AsyncLLMClient, HTTPBackend, LLMError
+
+
+def burst(client, sessions):
+    """Run one call per session thread at once; returns (latencies ms, outcome counts)."""
+    latencies, outcomes, lock = [], {"ok": 0, "error": 0, "timeout": 0}, threading.Lock()
+
+    def session(i):
+        start = time.perf_counter()
+        try:
+            client.generate(f"prompt\nselect * from timetable where id = {i}")
+            outcome = "ok"
+        except LLMError as e:
+            outcome = "timeout" if "within" in str(e) else "error"
+        with lock:
+            latencies.append((time.perf_counter() - start) * 1000)
+            outcomes[outcome] += 1
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    parser.add_argument("--drop-rate", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(
+        latency=args.latency, chunk_delay=0.01, error_rate=args.error_rate,
+        stall_rate=args.stall_rate, drop_rate=args.drop_rate, seed=42,
+    )
+    url = server.start()
+    configs = [
+        ("single attempt", dict(retries=0, stall_timeout=None)),
+        ("retries + stall cutoff", dict(retries=4, stall_timeout=1.0, backoff_base=0.1)),
+    ]
+    print(
+        f"{args.sessions} concurrent sessions; server: {args.latency:.2f} s latency, "
+        f"{args.error_rate:.0%} errors, {args.stall_rate:.0%} stalls, {args.drop_rate:.0%} drops; "
+        f"deadline {args.timeout:.1f} s, {args.concurrency} calls in flight at most\n"
+    )
+    print(f"{'client':<26}{'ok':>5}{'error':>7}{'timeout':>9}{'p50 ms':>9}{'p95 ms':>9}{'retries':>9}")
+    for label, options in configs:
+        client = AsyncLLMClient(HTTPBackend(url), timeout=args.timeout, max_concurrency=args.concurrency, **options)
+        latencies, outcomes = burst(client, args.sessions)
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(
+            f"{label:<26}{outcomes['ok']:>5}{outcomes['error']:>7}{outcomes['timeout']:>9}"
+            f"{statistics.median(latencies):>9.0f}{p95:>9.0f}{client.stats['retries']:>9}"
+        )
+        client.close()
+    print(f"\nmost requests the server saw at once: {server.stats['max_active']}")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
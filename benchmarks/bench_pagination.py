@@ -0,0 +1,71 @@
+"""
+What one dashboard interaction costs on a large TIMETABLE (default 5000
+classes x 42 slots = 210k rows):
+  full load - pd.read_sql_query("SELECT * FROM TIMETABLE"), as the dashboard
+              did on every rerun, and the frame's memory
+  offset    - LIMIT/OFFSET paging: cheap near the start, a scan to reach the end
+  keyset    - pagination.KeysetPager: a rowid seek, the same at any depth
+for the first, middle and last page; plus the rowid-span row estimate
+against COUNT(*).
+
+Run from the repository root:
+    python -m benchmarks.bench_pagination [--classes 5000] [--page-size 50]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_timetable_validator import build
+from pagination import KeysetPager
+
+
+def timed(fn, repeat=5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+    size = args.page_size
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "timetable.db")
+        build(db_file, args.classes).close()
+        conn = sqlite3.connect(db_file)
+        total = conn.execute("SELECT COUNT(*) FROM TIMETABLE").fetchone()[0]
+
+        full_ms, df = timed(lambda: pd.read_sql_query("SELECT * FROM TIMETABLE", conn), repeat=2)
+        print(f"{total} rows, {size} per page")
+        print(f"  full load   {full_ms:8.1f} ms   {df.memory_usage(deep=True).sum() / 2**20:6.1f} MB frame")
+
+        pager = KeysetPager(db_file, "TIMETABLE")
+        depths = {"first": 0, "middle": total // 2, "last": total - size}
+        for name, offset in depths.items():
+            offset_ms, _ = timed(lambda: pd.read_sql_query(
+                "SELECT * FROM TIMETABLE ORDER BY rowid LIMIT ? OFFSET ?", conn, params=(size, offset)))
+            # The cursor a reader would hold after paging to this depth
+            after = None if offset == 0 else conn.execute(
+                "SELECT rowid FROM TIMETABLE ORDER BY rowid LIMIT 1 OFFSET ?", (offset - 1,)).fetchone()
+            keyset_ms, page = timed(lambda: pager.page(after, size))
+            print(f"  {name:<7} page  offset {offset_ms:7.2f} ms   keyset {keyset_ms:7.2f} ms"
+                  f"   ({len(page.frame)} rows, {page.frame.memory_usage(deep=True).sum() / 1024:.0f} KB)")
+
+        count_ms, _ = timed(lambda: conn.execute("SELECT COUNT(*) FROM TIMETABLE").fetchone())
+        estimate_ms, estimate = timed(pager.estimate_rows)
+        print(f"  row count   COUNT(*) {count_ms:7.2f} ms   estimate {estimate_ms:7.3f} ms ({estimate} rows)")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
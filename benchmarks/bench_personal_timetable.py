@@ -0,0 +1,123 @@
+"""
+A faculty member's week on a synthetic campus (default: 20 branches x 4
+years x 8 sections, 600 faculty), two ways:
+  per section-day - the faculty rows for the name (faculty_by_section), then
+                    one slots query per (section, day) they teach, as a user
+                    clicking through faculty.py and single_app.py does
+  materialized    - one indexed query on personal_timetable
+plus the ingest-time cost of building personal_timetable.
+
+Run from the repository root:
+    python -m benchmarks.bench_personal_timetable [--branches 20] [--faculty 600] [--lookups 200]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_faculty_analysis import synthetic_faculty
+from benchmarks.bench_slots_layout import synthetic_campus
+from database import (
+    DAYS, FACULTY_BY_SECTION_VIEW, FREE_SUBJECTS, PERSONAL_TIMETABLE_COLUMNS, PERSONAL_TIMETABLE_SCHEMA,
+    SLOT_COLUMNS, SLOTS_SCHEMA, faculty_owner, personal_timetable_rows, sql_rows, timetable_to_slots,
+    write_faculty_sections,
+)
+
+
+def build(db_file, frames, faculty_count):
+    """slots, faculty (+ faculty_sections) and personal_timetable in one file; returns (names, build seconds, rows)."""
+    conn = sqlite3.connect(db_file)
+    slots = pd.concat([timetable_to_slots(df, branch) for branch, df in frames.items()], ignore_index=True)
+    for statement in SLOTS_SCHEMA:
+        conn.execute(statement)
+    conn.executemany(f"INSERT INTO slots VALUES ({', '.join('?' * len(SLOT_COLUMNS))})", sql_rows(slots))
+    faculty = synthetic_faculty(slots, faculty_count)
+    faculty.to_sql("faculty", conn, index=False)
+    write_faculty_sections(conn)
+    conn.execute(FACULTY_BY_SECTION_VIEW)
+    conn.commit()
+
+    start = time.perf_counter()
+    by_section = pd.read_sql_query("SELECT section, YEAR, Subject, Name FROM faculty_by_section", conn)
+    rows = personal_timetable_rows(slots, by_section)
+    for statement in PERSONAL_TIMETABLE_SCHEMA:
+        conn.execute(statement)
+    conn.executemany(
+        f"INSERT INTO personal_timetable VALUES ({', '.join('?' * len(PERSONAL_TIMETABLE_COLUMNS))})", sql_rows(rows)
+    )
+    conn.commit()
+    seconds = time.perf_counter() - start
+    conn.close()
+    return sorted(faculty["Name"].unique()), seconds, len(rows)
+
+
+def per_section_day(conn, name, blocks):
+    """The old path: one faculty query, then one slots query per (section, day)."""
+    taught = conn.execute("SELECT branch, YEAR, section, Subject FROM faculty_by_section WHERE Name = ?", (name,)).fetchall()
+    week, queries = [], 1
+    for branch, year, section, subject in taught:
+        for day in DAYS:
+            cells = conn.execute(
+                "SELECT period, room, subject FROM slots WHERE branch = ? AND block = ? AND year = ? AND section = ? AND day = ?",
+                (branch, blocks[branch, year, section], year, section, day),
+            ).fetchall()
+            queries += 1
+            week.extend(
+                (day, period, room) for period, room, cell_subject in cells
+                if cell_subject == subject and cell_subject.lower() not in FREE_SUBJECTS
+            )
+    return week, queries
+
+
+def materialized(conn, name):
+    return conn.execute(
+        "SELECT day, period, room FROM personal_timetable WHERE kind = 'faculty' AND owner = ? ORDER BY slot",
+        (faculty_owner(name),),
+    ).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--branches", type=int, default=20)
+    parser.add_argument("--faculty", type=int, default=600)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    frames = synthetic_campus(args.branches, 8)
+    blocks = {
+        (branch, row.YEAR, row.SECTION): row.BLOCK
+        for branch, df in frames.items()
+        for row in df.itertuples()
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "campus.db")
+        names, build_seconds, rows = build(db_file, frames, args.faculty)
+        names = random.Random(3).sample(names, min(args.lookups, len(names)))
+        conn = sqlite3.connect(db_file)
+
+        start = time.perf_counter()
+        queries = 0
+        for name in names:
+            queries += per_section_day(conn, name, blocks)[1]
+        old_ms = (time.perf_counter() - start) / len(names) * 1000
+
+        start = time.perf_counter()
+        for name in names:
+            materialized(conn, name)
+        new_ms = (time.perf_counter() - start) / len(names) * 1000
+
+        same = all(set(per_section_day(conn, name, blocks)[0]) == set(materialized(conn, name)) for name in names)
+        conn.close()
+
+    print(f"{args.branches} branches, {len(names)} faculty looked up; personal_timetable {rows} rows "
+          f"built in {build_seconds:.2f} s")
+    print(f"  per section-day  {old_ms:8.3f} ms/week   ({queries / len(names):.1f} queries)")
+    print(f"  materialized     {new_ms:8.3f} ms/week   (1 query)   same classes: {same}")
+
+
+if __name__ == "__main__":
+    main()
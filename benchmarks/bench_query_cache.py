@@ -0,0 +1,98 @@
+"""
+Viewer reruns with and without the query result cache.
+
+One "rerun" is what faculty.py does on every widget change: the distinct
+years, sections and subjects for the sidebar plus the filtered faculty
+rows. Compared:
+  direct     - a fresh sqlite3 connection and the four queries, as before
+  pool       - the shared ConnectionPool, queries still run every time
+  cache hit  - QueryCache between ingests (no SQLite at all)
+  cache miss - the first rerun after an ingest bumps the version stamp
+Then fills the cache with distinct queries to show the LRU bound holding.
+
+Run from the repository root:
+    python -m benchmarks.bench_query_cache [--reruns 2000]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from data_access import ConnectionPool, QueryCache
+from database import DATABASE_DIR, bump_db_version
+
+FACULTY_DB = os.path.join(DATABASE_DIR, "CSE", "cse_faculty.db")
+QUERIES = [
+    ("SELECT DISTINCT YEAR FROM faculty", ()),
+    ("SELECT DISTINCT sections FROM faculty", ()),
+    ("SELECT DISTINCT Subject FROM faculty", ()),
+    ("SELECT YEAR, subject_code, Subject, Name, sections FROM faculty WHERE 1=1 AND YEAR = ?", ("E2",)),
+]
+
+
+def per_rerun(fn, reruns):
+    start = time.perf_counter()
+    for _ in range(reruns):
+        fn()
+    return (time.perf_counter() - start) / reruns * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reruns", type=int, default=2000)
+    parser.add_argument("--max-entries", type=int, default=64)
+    args = parser.parse_args()
+
+    def direct():
+        conn = sqlite3.connect(FACULTY_DB)
+        for query, params in QUERIES:
+            pd.read_sql_query(query, conn, params=params)
+        conn.close()
+
+    pool = ConnectionPool().warm([FACULTY_DB])
+
+    def pooled():
+        for query, params in QUERIES:
+            pool.read_sql(FACULTY_DB, query, params)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        version_file = os.path.join(tmp, "db_version")
+        bump_db_version(version_file)
+        cache = QueryCache(pool, max_entries=args.max_entries, version_file=version_file)
+
+        def cached():
+            for query, params in QUERIES:
+                cache.read_sql(FACULTY_DB, query, params)
+
+        direct_us = per_rerun(direct, max(1, args.reruns // 10))
+        pool_us = per_rerun(pooled, args.reruns)
+        cached()
+        hit_us = per_rerun(cached, args.reruns)
+        hits = cache.stats["hits"]
+
+        miss_runs = max(1, args.reruns // 10)
+        start = time.perf_counter()
+        for _ in range(miss_runs):
+            bump_db_version(version_file)
+            cached()
+        miss_us = (time.perf_counter() - start) / miss_runs * 1e6
+        fresh = cache.read_sql(FACULTY_DB, *QUERIES[3]).equals(pool.read_sql(FACULTY_DB, *QUERIES[3]))
+
+        for i in range(args.max_entries * 4):
+            cache.read_sql(FACULTY_DB, "SELECT * FROM faculty LIMIT ?", (i,))
+
+    print(f"faculty page rerun ({len(QUERIES)} queries), per rerun:")
+    print(f"  direct connection   {direct_us:9.1f} us")
+    print(f"  connection pool     {pool_us:9.1f} us")
+    print(f"  cache hit           {hit_us:9.1f} us   ({pool_us / hit_us:.0f}x vs pool, {hits} hits, no SQLite)")
+    print(f"  cache miss          {miss_us:9.1f} us   (after a version bump, {cache.stats['invalidations']} invalidations)")
+    print(f"  results match SQLite after the bump: {fresh}")
+    print(f"  LRU bound: {len(cache)} entries (max {args.max_entries}), {cache.bytes / 1024:.0f} KiB, "
+          f"{cache.stats['evictions']} evictions")
+
+
+if __name__ == "__main__":
+    main()
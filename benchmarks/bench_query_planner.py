@@ -0,0 +1,98 @@
+"""
+Ask Question latency through query_planner.QueryPlanner versus the model
+round trip, on a synthetic TIMETABLE with a stub model of fixed latency.
+Reports which path served each question and p50 latency per path.
+
+Run from the repository root:
+    python -m benchmarks.bench_query_planner [--latency 1.0] [--rows 5000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from query_planner import QueryPlanner
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+SUBJECTS = ["Mathematics", "Physics", "Chemistry", "Data Structures", "Operating Systems", "English"]
+PROFESSORS = [f"Prof. {name}" for name in ["John", "Jane", "Ravi", "Anita", "Kumar", "Meena"]]
+ROOMS = [f"Room {n}" for n in range(101, 121)]
+CLASSES = [f"CLASS{n}" for n in range(1, 25)]
+TIMES = ["9:00 AM", "10:00 AM", "11:00 AM", "12:00 PM", "2:00 PM", "3:00 PM"]
+
+TEMPLATES = [
+    "What is the timetable for {day}?",
+    "Who is teaching {subject} on {day}?",
+    "What's happening in {room} on {day}?",
+    "When does {professor} teach?",
+    "Where is {subject} held?",
+    "{cls} timetable for {day}",
+    "How many classes does {professor} have?",
+    "Which rooms are free on {day} at 10 AM?",
+]
+
+
+def build(db_file, rows, seed=5):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE TIMETABLE (CLASS TEXT, DAY TEXT, TIME TEXT, SUBJECT TEXT, PROFESSOR TEXT, ROOM TEXT)")
+    conn.executemany(
+        "INSERT INTO TIMETABLE VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (rng.choice(CLASSES), rng.choice(DAYS), rng.choice(TIMES), rng.choice(SUBJECTS), rng.choice(PROFESSORS), rng.choice(ROOMS))
+            for _ in range(rows)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def questions(count, seed=11):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield rng.choice(TEMPLATES).format(
+            day=rng.choice(DAYS), subject=rng.choice(SUBJECTS), room=rng.choice(ROOMS),
+            professor=rng.choice(PROFESSORS), cls=rng.choice(CLASSES),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per stub model call")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--questions", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "timetable.db")
+        build(db_file, args.rows)
+        planner = QueryPlanner(db_file)
+        conn = sqlite3.connect(db_file)
+        timings = {"rules": [], "llm": []}
+        for question in questions(args.questions):
+            start = time.perf_counter()
+            plan = planner.plan(question)
+            if plan is not None:
+                conn.execute(plan.sql, plan.params).fetchall()
+                path = "rules"
+            else:
+                time.sleep(args.latency)  # stub model round trip
+                path = "llm"
+            timings[path].append((time.perf_counter() - start) * 1000)
+        conn.close()
+
+    total = sum(len(values) for values in timings.values())
+    print(f"{total} questions on a {args.rows}-row TIMETABLE, {args.latency:.2f} s per model call\n")
+    print(f"{'path':<8}{'share':>8}{'p50 ms':>12}")
+    for path, values in timings.items():
+        if values:
+            print(f"{path:<8}{len(values) / total:>8.0%}{statistics.median(values):>12.2f}")
+    overall = statistics.median([v for values in timings.values() for v in values])
+    print(f"\noverall p50 {overall:.2f} ms (every question through the model: {args.latency * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
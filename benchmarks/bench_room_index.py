@@ -0,0 +1,90 @@
+"""
+Free-room search on a synthetic campus (default: 100 branches): a SQL
+NOT IN over the slots table versus room_index.RoomIndex over the
+ingest-time room_occupancy bitmaps.
+
+Run from the repository root:
+    python -m benchmarks.bench_room_index [--branches 100] [--runs 2000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from benchmarks.bench_slots_layout import synthetic_campus
+from database import ROOM_OCCUPANCY_COLUMNS, SLOT_COLUMNS, SLOTS_SCHEMA, room_occupancy, sql_rows, timetable_to_slots
+from room_index import RoomIndex
+
+FREE_ROOMS_SQL = """
+    SELECT DISTINCT room FROM slots
+    WHERE block = ? AND strength >= ? AND room NOT IN (
+        SELECT room FROM slots WHERE day = ? AND period IN ('P2', 'P3', 'P4') AND lower(trim(subject)) NOT IN ('leisure', 'lesuire')
+    )
+"""
+
+
+def with_free_periods(frames, share=0.5, seed=13):
+    """Turn about `share` of the periods into leisure so some rooms come out free."""
+    rng = random.Random(seed)
+    for df in frames.values():
+        for column in [col for col in df.columns if "_P" in col]:
+            df[column] = [subject if rng.random() > share else "leisure" for subject in df[column]]
+    return frames
+
+
+def build(db_file, frames):
+    conn = sqlite3.connect(db_file)
+    for statement in SLOTS_SCHEMA:
+        conn.execute(statement)
+    slots = [timetable_to_slots(df, branch) for branch, df in frames.items()]
+    for branch_slots in slots:
+        conn.executemany(f"INSERT INTO slots VALUES ({', '.join('?' * len(SLOT_COLUMNS))})", sql_rows(branch_slots))
+    conn.execute(f"CREATE TABLE room_occupancy ({', '.join(ROOM_OCCUPANCY_COLUMNS)})")
+    for branch_slots in slots:
+        conn.executemany(
+            f"INSERT INTO room_occupancy VALUES ({', '.join('?' * len(ROOM_OCCUPANCY_COLUMNS))})",
+            sql_rows(room_occupancy(branch_slots)),
+        )
+    conn.commit()
+    conn.execute("ANALYZE")
+    return conn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--branches", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+
+    frames = with_free_periods(synthetic_campus(args.branches, 8))
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "campus.db")
+        conn = build(db_file, frames)
+        query = ("AB-03", 60, "WEDNESDAY")
+
+        sql_runs = max(1, args.runs // 20)
+        start = time.perf_counter()
+        for _ in range(sql_runs):
+            expected = sorted(row[0] for row in conn.execute(FREE_ROOMS_SQL, query))
+        sql_us = (time.perf_counter() - start) / sql_runs * 1e6
+        conn.close()
+
+        start = time.perf_counter()
+        index = RoomIndex([db_file]).refresh()
+        load_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            found = index.free_rooms("Wednesday", ["P2", "P3", "P4"], block="AB-03", min_capacity=60)
+        bitmap_us = (time.perf_counter() - start) / args.runs * 1e6
+
+    print(f"{args.branches} branches, {len(index.rooms)} rooms; free in AB-03 on Wednesday P2-P4, capacity >= 60")
+    print(f"  SQL over slots    {sql_us:10.1f} us")
+    print(f"  bitmap index      {bitmap_us:10.1f} us   ({sql_us / bitmap_us:.0f}x, one-off load {load_ms:.1f} ms)")
+    print(f"  same rooms        {sorted(found) == expected} ({len(found)} free)")
+
+
+if __name__ == "__main__":
+    main()
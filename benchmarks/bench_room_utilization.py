@@ -0,0 +1,100 @@
+"""
+Room utilization report on a synthetic campus (default 5000 rooms in 50
+blocks, every room-slot booked by a section with 70% probability, 20% of
+those leisure):
+  load     - room_utilization.load_slots from a slots table in SQLite
+  grid     - build_grid: the rooms x days x periods arrays
+  report   - analyse over the grid (rooms, blocks, periods, idle heatmap)
+  block    - analyse for one block
+  groupby  - the per-room and per-period figures with pandas groupby over
+             the slot rows, for comparison
+
+Run from the repository root:
+    python -m benchmarks.bench_room_utilization [--rooms 5000] [--blocks 50]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from database import DAYS, PERIODS, SLOT_COLUMNS, SLOTS_SCHEMA, sql_rows
+from room_utilization import analyse, build_grid, load_slots
+
+
+def synthetic_slots(rooms, blocks, booked=0.7, leisure=0.2, seed=7):
+    rng = np.random.default_rng(seed)
+    room = np.repeat(np.arange(rooms), len(DAYS) * len(PERIODS))
+    day = np.tile(np.repeat(np.arange(len(DAYS)), len(PERIODS)), rooms)
+    period = np.tile(np.arange(len(PERIODS)), rooms * len(DAYS))
+    keep = rng.random(len(room)) < booked
+    room, day, period = room[keep], day[keep], period[keep]
+    return pd.DataFrame({
+        "branch": "B" + pd.Series(room % 20).astype(str),
+        "block": "BLK-" + pd.Series(room % blocks).astype(str).str.zfill(2),
+        "year": "II",
+        "section": "S" + pd.Series(rng.integers(0, rooms, len(room))).astype(str),
+        "room": "R" + pd.Series(room).astype(str).str.zfill(5),
+        "strength": rng.integers(30, 71, len(room)),
+        "day": np.array(DAYS)[day],
+        "period": np.array(PERIODS)[period],
+        "subject": np.where(rng.random(len(room)) < leisure, "leisure", "SUB"),
+    })[SLOT_COLUMNS]
+
+
+def timed(fn, repeat=5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def groupby_report(slots):
+    busy = slots[slots["subject"] != "leisure"].drop_duplicates(subset=["room", "day", "period"])
+    per_room = busy.groupby("room").agg(busy_slots=("period", "size"), seats=("strength", "sum"))
+    per_room["capacity"] = slots.groupby("room")["strength"].max()
+    per_room["occupancy"] = per_room["busy_slots"] / (len(DAYS) * len(PERIODS))
+    per_room["seat_utilization"] = per_room["seats"] / (per_room["capacity"] * per_room["busy_slots"])
+    per_period = busy.groupby("period").size() / (slots["room"].nunique() * len(DAYS))
+    idle = slots["room"].nunique() - busy.groupby(["day", "period"]).size().unstack()
+    return per_room, per_period, idle
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=5000)
+    parser.add_argument("--blocks", type=int, default=50)
+    args = parser.parse_args()
+
+    slots = synthetic_slots(args.rooms, args.blocks)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "timetable.db")
+        conn = sqlite3.connect(db_file)
+        for statement in SLOTS_SCHEMA:
+            conn.execute(statement)
+        conn.executemany(f"INSERT INTO slots VALUES ({', '.join('?' * len(SLOT_COLUMNS))})", sql_rows(slots))
+        conn.commit()
+        conn.close()
+        load_ms, loaded = timed(lambda: load_slots([db_file]), repeat=3)
+
+    grid_ms, grid = timed(lambda: build_grid(loaded))
+    report_ms, report = timed(lambda: analyse(grid))
+    block_ms, _ = timed(lambda: analyse(grid, block="BLK-00"))
+    groupby_ms, _ = timed(lambda: groupby_report(loaded), repeat=3)
+
+    print(f"{len(grid.rooms)} rooms, {len(loaded)} slot rows, grid {grid.classes.shape} "
+          f"({(grid.classes.nbytes + grid.seats.nbytes) / 2**20:.1f} MB)")
+    print(f"  load     {load_ms:8.1f} ms")
+    print(f"  grid     {grid_ms:8.1f} ms")
+    print(f"  report   {report_ms:8.1f} ms   (occupancy {report['blocks']['occupancy'].mean():.0%})")
+    print(f"  block    {block_ms:8.1f} ms")
+    print(f"  groupby  {groupby_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Query latency of the wide DAY_Pn timetable layout versus the long slots table
+on a synthetic campus (default: 100 branches x 4 years x 8 sections).
+
+Run from the repository root:
+    python -m benchmarks.bench_slots_layout [--branches 100] [--runs 200]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from database import DAYS, PERIODS, SLOT_COLUMNS, SLOTS_SCHEMA, sql_rows, timetable_to_slots
+
+YEARS = ["E1", "E2", "E3", "E4"]
+SUBJECTS = [f"SUB{i:03d}" for i in range(200)] + ["leisure"]
+
+
+def synthetic_campus(branches, sections_per_year, seed=7):
+    """One wide timetable frame per branch, shaped like the ingested Excel sheets."""
+    rng = random.Random(seed)
+    frames = {}
+    for b in range(branches):
+        branch = f"BR{b:03d}"
+        rows = []
+        for year in YEARS:
+            for s in range(1, sections_per_year + 1):
+                row = {
+                    "BLOCK": f"AB-{b % 5 + 1:02d}",
+                    "YEAR": year,
+                    "SECTION": f"{branch}-{s:02d}",
+                    "ROOM": f"R-{b:03d}-{year}-{s:02d}",
+                    "STRENGTH": 60,
+                }
+                for day in DAYS:
+                    for period in PERIODS:
+                        row[f"{day}_{period}"] = rng.choice(SUBJECTS)
+                rows.append(row)
+        frames[branch] = pd.DataFrame(rows)
+    return frames
+
+
+def build(db_file, frames):
+    conn = sqlite3.connect(db_file)
+    wide = pd.concat([df.assign(BRANCH=branch) for branch, df in frames.items()], ignore_index=True)
+    wide.to_sql("timetable", conn, index=False)
+    for statement in SLOTS_SCHEMA:
+        conn.execute(statement)
+    for branch, df in frames.items():
+        conn.executemany(
+            f"INSERT INTO slots VALUES ({', '.join('?' * len(SLOT_COLUMNS))})",
+            sql_rows(timetable_to_slots(df, branch)),
+        )
+    conn.commit()
+    conn.execute("ANALYZE")
+    return conn
+
+
+def queries(frames):
+    """(name, wide sql, wide params, long sql, long params) for a probe section/room/subject."""
+    branch = list(frames)[len(frames) // 2]
+    probe = frames[branch].iloc[5]
+    any_p3 = ", ".join(f"{day}_P3" for day in DAYS)
+    any_cell = " OR ".join(f"{day}_{period} = ?" for day in DAYS for period in PERIODS)
+    section_key = (branch, probe["BLOCK"], probe["YEAR"], probe["SECTION"])
+    return [
+        (
+            "section on a day",
+            f"SELECT {', '.join(f'MONDAY_{p}' for p in PERIODS)} FROM timetable "
+            "WHERE BRANCH = ? AND BLOCK = ? AND YEAR = ? AND SECTION = ?",
+            section_key,
+            "SELECT period, subject FROM slots WHERE branch = ? AND block = ? AND year = ? AND section = ? AND day = ?",
+            section_key + ("MONDAY",),
+        ),
+        (
+            "room at P3, any day",
+            f"SELECT SECTION, {any_p3} FROM timetable WHERE ROOM = ?",
+            (probe["ROOM"],),
+            "SELECT day, section, subject FROM slots WHERE room = ? AND period = ?",
+            (probe["ROOM"], "P3"),
+        ),
+        (
+            "where a subject runs",
+            f"SELECT * FROM timetable WHERE {any_cell}",
+            ("SUB042",) * (len(DAYS) * len(PERIODS)),
+            "SELECT branch, section, room, day, period FROM slots WHERE subject = ?",
+            ("SUB042",),
+        ),
+    ]
+
+
+def timed(conn, sql, params, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        conn.execute(sql, params).fetchall()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--branches", type=int, default=100)
+    parser.add_argument("--sections", type=int, default=8, help="sections per year per branch")
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    frames = synthetic_campus(args.branches, args.sections)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build(os.path.join(tmp, "campus.db"), frames)
+        wide_rows = conn.execute("SELECT count(*) FROM timetable").fetchone()[0]
+        long_rows = conn.execute("SELECT count(*) FROM slots").fetchone()[0]
+        print(f"{args.branches} branches: {wide_rows} wide rows, {long_rows} slot rows\n")
+        print(f"{'query':<24}{'wide ms':>10}{'long ms':>10}{'speedup':>10}")
+        for name, wide_sql, wide_params, long_sql, long_params in queries(frames):
+            wide_ms = timed(conn, wide_sql, wide_params, args.runs)
+            long_ms = timed(conn, long_sql, long_params, args.runs)
+            print(f"{name:<24}{wide_ms:>10.3f}{long_ms:>10.3f}{wide_ms / long_ms:>9.1f}x")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
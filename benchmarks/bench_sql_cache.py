@@ -0,0 +1,72 @@
+"""
+Ask Question latency with and without sql_cache.SQLCache, replaying a stream
+of repeated and paraphrased questions against a local stub model with a
+fixed per-call latency (no API key needed).
+
+Run from the repository root:
+    python -m benchmarks.bench_sql_cache [--latency 0.5] [--questions 60]
+"""
+import argparse
+import random
+import time
+
+from sql_cache import SQLCache
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+SUBJECTS = ["Mathematics", "Physics", "Chemistry"]
+PHRASINGS = {
+    "day": ["What is the timetable for {day}?", "{day} timetable", "what's on {day}", "Show me the {day} schedule"],
+    "subject": ["Who is teaching {subject} on {day}?", "who teaches {subject} on {day}"],
+}
+
+
+def stub_generate(question, latency):
+    """Stand-in for generate_sql_query: sleeps, then answers from the question's words."""
+    time.sleep(latency)
+    day = next(day for day in DAYS if day.lower() in question.lower())
+    subject = next((s for s in SUBJECTS if s.lower() in question.lower()), None)
+    if subject:
+        return f"SELECT PROFESSOR FROM TIMETABLE WHERE SUBJECT='{subject}' AND DAY='{day}';"
+    return f"SELECT * FROM TIMETABLE WHERE DAY='{day}';"
+
+
+def question_stream(count, seed=3):
+    rng = random.Random(seed)
+    for _ in range(count):
+        kind = rng.choice(list(PHRASINGS))
+        yield rng.choice(PHRASINGS[kind]).format(day=rng.choice(DAYS), subject=rng.choice(SUBJECTS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per stub model call")
+    parser.add_argument("--questions", type=int, default=60)
+    args = parser.parse_args()
+
+    questions = list(question_stream(args.questions))
+
+    start = time.perf_counter()
+    for question in questions:
+        stub_generate(question, args.latency)
+    uncached = time.perf_counter() - start
+
+    cache, wrong = SQLCache(), 0
+    start = time.perf_counter()
+    for question in questions:
+        sql, _ = cache.get(question, schema="v1")
+        if sql is None:
+            sql = stub_generate(question, args.latency)
+            cache.put(question, sql, schema="v1")
+        elif sql != stub_generate(question, 0):
+            wrong += 1
+    cached = time.perf_counter() - start
+
+    print(f"{len(questions)} questions, {args.latency:.2f} s per model call")
+    print(f"  no cache     {uncached:8.2f} s")
+    print(f"  SQLCache     {cached:8.2f} s   ({uncached / cached:.1f}x)")
+    print(f"  stats        {cache.stats}")
+    print(f"  wrong SQL    {wrong}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Cost of running generated SQL through sql_guard.SQLGuard versus a plain
+pd.read_sql_query, on a large long-format TIMETABLE (default 5000 classes
+x 42 slots = 210k rows):
+  selective - a WHERE on one class: the guard's overhead (classify, plan
+              costing, read-only connection, progress handler)
+  select *  - the whole table: the plain read builds a 210k-row frame, the
+              guard stops at its row cap
+  cross join- COUNT(*) over TIMETABLE x TIMETABLE: the guard rejects it from
+              the query plan; the plain read is stopped after --budget seconds
+              (it would otherwise run for hours)
+  runaway   - a recursive CTE the plan cannot cost: the guard's deadline
+
+Run from the repository root:
+    python -m benchmarks.bench_sql_guard [--classes 5000] [--budget 5]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_timetable_validator import build
+from sql_guard import QueryRejected, SQLGuard
+
+QUERIES = {
+    "selective": "SELECT DAY, TIME, SUBJECT, ROOM FROM TIMETABLE WHERE CLASS = 'C00042'",
+    "select *": "SELECT * FROM TIMETABLE",
+    "cross join": "SELECT COUNT(*) FROM TIMETABLE a, TIMETABLE b WHERE a.ROOM < b.ROOM",
+    "runaway": "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT COUNT(*) FROM n",
+}
+
+
+def plain(db_file, sql, budget):
+    """pd.read_sql_query, stopped after budget seconds so the benchmark ends."""
+    conn = sqlite3.connect(db_file)
+    deadline = time.monotonic() + budget
+    conn.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+    start = time.perf_counter()
+    try:
+        rows = f"{len(pd.read_sql_query(sql, conn))} rows"
+    except Exception:
+        rows = f"still running after {budget:g}s"
+    finally:
+        conn.close()
+    return time.perf_counter() - start, rows
+
+
+def guarded(guard, sql):
+    start = time.perf_counter()
+    try:
+        result = guard.read(sql)
+        outcome = f"{len(result.frame)} rows" + (" (truncated)" if result.truncated else "")
+    except QueryRejected as e:
+        outcome = f"{type(e).__name__}: {str(e)[:60]}"
+    return time.perf_counter() - start, outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=5000)
+    parser.add_argument("--budget", type=float, default=5.0, help="seconds before the plain read is stopped")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "timetable.db")
+        build(db_file, args.classes).close()
+        guard = SQLGuard(db_file)
+        guard.read(QUERIES["selective"])  # row counts for plan costing, once per file change
+
+        print(f"guard: {guard.timeout:g}s budget, {guard.max_rows:,} row cap, {guard.max_scan_rows:,} planned rows")
+        for name, sql in QUERIES.items():
+            plain_s, plain_out = plain(db_file, sql, args.budget)
+            guard_s, guard_out = guarded(guard, sql)
+            print(f"  {name:<11} plain {plain_s * 1000:8.1f} ms  {plain_out:<26}"
+                  f"guarded {guard_s * 1000:8.1f} ms  {guard_out}")
+        print(f"  guard stats: {guard.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Memory and time of the bulk timetable export as the campus grows, against
+loading each branch's whole week into pandas and writing that frame.
+
+Copies the ingested branch databases into a scratch directory and scales
+them up: every section is repeated --scale times (with its faculty_sections
+rows, so faculty still joins). Then, from that directory, for each format:
+  streamed - timetable_export.export_timetables (fetchmany + chunked writer)
+  pandas   - pd.read_sql_query of the same per-branch query, then
+             to_csv / to_excel / to_parquet of the whole frame
+Each export runs in a fresh process; memory is its peak RSS (Python,
+SQLite and Arrow allocations alike) above the RSS after imports.
+
+Run from the repository root after `python database.py`:
+    python -m benchmarks.bench_timetable_export [--scale 1 20 100] [--formats csv parquet xlsx]
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+
+from database import BRANCH_CONFIG, DATABASE_DIR
+
+FORMATS = ["csv", "parquet", "xlsx"]
+
+EXPORT = """
+import json, resource, sys, time
+import pandas as pd
+from database import BRANCH_CONFIG
+from timetable_export import EXPORT_COLUMNS, export_timetables, open_branch
+
+def whole_frame(path, fmt):
+    frames = []
+    for branch in BRANCH_CONFIG:
+        conn, query = open_branch(branch)
+        frames.append(pd.read_sql_query(query, conn))
+        conn.close()
+    df = pd.concat(frames, ignore_index=True)
+    df.columns = EXPORT_COLUMNS
+    getattr(df, "to_excel" if fmt == "xlsx" else f"to_{fmt}")(path, index=False)
+    return len(df)
+
+method, fmt = sys.argv[1:]
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+path = f"{method}.{fmt}"
+rows = export_timetables(path) if method == "streamed" else whole_frame(path, fmt)
+print(json.dumps({"rows": rows, "s": time.perf_counter() - start,
+                  "mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base) / 1024}))
+"""
+
+
+def build_campus(root, scale):
+    """Copy Database/ into root and repeat every section scale times."""
+    shutil.copytree(DATABASE_DIR, os.path.join(root, DATABASE_DIR),
+                    ignore=shutil.ignore_patterns("campus.db*", "db_version"))
+    copies = [(f"-x{k}",) for k in range(1, scale)]
+    for branch, config in BRANCH_CONFIG.items():
+        for db_key, insert in [
+            ("timetable_db", "INSERT INTO slots SELECT branch, block, year, section || suffix, room, strength, "
+                             "day, period, subject FROM slots, copies"),
+            ("faculty_db", "INSERT INTO faculty_sections SELECT faculty_id, section || suffix FROM faculty_sections, copies"),
+        ]:
+            db_file = config["databases"][db_key]
+            if db_file is None:
+                continue
+            conn = sqlite3.connect(os.path.join(root, DATABASE_DIR, branch, db_file))
+            with conn:
+                conn.execute("CREATE TEMP TABLE copies (suffix TEXT)")
+                conn.executemany("INSERT INTO copies VALUES (?)", copies)
+                conn.execute(insert)
+            conn.close()
+
+
+def run(method, fmt, cwd):
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    out = subprocess.run([sys.executable, "-c", EXPORT, method, fmt], cwd=cwd, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 20, 100])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=["csv", "parquet"])
+    args = parser.parse_args()
+
+    print(f"{'scale':>6}{'format':>9}{'rows':>10}{'streamed':>20}{'whole frame':>20}")
+    for scale in args.scale:
+        with tempfile.TemporaryDirectory() as tmp:
+            build_campus(tmp, scale)
+            for fmt in args.formats:
+                streamed, whole = run("streamed", fmt, tmp), run("pandas", fmt, tmp)
+                print(f"{scale:>6}{fmt:>9}{streamed['rows']:>10}"
+                      f"{streamed['s']:>8.2f} s{streamed['mb']:>7.1f} MB{whole['s']:>10.2f} s{whole['mb']:>7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Timetable generation on synthetic campuses of growing size (default: 1, 5,
+20 and 50 branches x 4 years x 8 sections): greedy conflicts, steps and
+time until the min-conflicts search finds a clash-free timetable.
+
+Every (branch, year, subject) is staffed in groups of 1-3 sections by
+faculty teaching at most --max-load periods a week (of 42), so the
+instances are feasible; a higher load means busier faculty and a harder
+instance.
+
+Run from the repository root:
+    python -m benchmarks.bench_timetable_generator [--sizes 1 5 20 50] [--max-load 36] [--time-limit 120]
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from benchmarks.bench_room_index import with_free_periods
+from benchmarks.bench_slots_layout import synthetic_campus
+from database import room_occupancy, timetable_to_slots
+from timetable_generator import Solver, build_instance
+
+
+def capped_faculty(slots, max_load, seed=17):
+    """Staff every (branch, year, subject) in section groups of 1-3, hiring whenever nobody has room for a group."""
+    rng = random.Random(seed)
+    taught = slots[slots["subject"] != "leisure"]
+    hours = taught.groupby(["branch", "year", "subject", "section"]).size()
+    load, rows = {}, []
+    for (branch, year, subject), group in hours.groupby(level=[0, 1, 2]):
+        sections = list(group.items())
+        rng.shuffle(sections)
+        while sections:
+            size = rng.randint(1, 3)
+            chunk, sections = sections[:size], sections[size:]
+            need = sum(count for _, count in chunk)
+            free = [name for name, used in load.items() if name.startswith(branch) and used + need <= max_load]
+            name = rng.choice(free) if free else f"{branch} Faculty {len(load):05d}"
+            load[name] = load.get(name, 0) + need
+            rows.append((branch, year, subject, name, ", ".join(key[3] for key, _ in chunk)))
+    return pd.DataFrame(rows, columns=["branch", "YEAR", "Subject", "Name", "sections"])
+
+
+def synthetic_instance(branches, max_load, free_share=0.2):
+    frames = with_free_periods(synthetic_campus(branches, 8), share=free_share)
+    slots = pd.concat([timetable_to_slots(df, branch) for branch, df in frames.items()], ignore_index=True)
+    sections = pd.concat([df.assign(branch=branch) for branch, df in frames.items()], ignore_index=True)
+    faculty = capped_faculty(slots, max_load)
+    return build_instance(sections, slots, faculty, rooms=room_occupancy(slots))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 20, 50], help="branches per instance")
+    parser.add_argument("--max-load", type=int, default=36, help="most periods a week any one faculty member teaches")
+    parser.add_argument("--time-limit", type=float, default=120.0, help="seconds of local search per instance")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'branches':>8} {'lessons':>8} {'faculty':>8} {'greedy':>8} {'left':>6} {'steps':>9} {'greedy s':>9} {'total s':>8}")
+    for branches in args.sizes:
+        instance = synthetic_instance(branches, args.max_load)
+        solver = Solver(instance, seed=args.seed)
+        start = time.perf_counter()
+        solver.greedy()
+        greedy_s = time.perf_counter() - start
+        greedy_conflicts = solver.conflicts
+        solver.local_search(time_limit=args.time_limit)
+        total_s = time.perf_counter() - start
+        faculty = len({name for _, _, names, _ in instance.lessons for name in names})
+        print(f"{branches:>8} {len(instance.lessons):>8} {faculty:>8} {greedy_conflicts:>8} {solver.conflicts:>6} "
+              f"{solver.steps:>9} {greedy_s:>9.2f} {total_s:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
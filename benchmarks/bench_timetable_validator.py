@@ -0,0 +1,97 @@
+"""
+Clash checking after single-row edits on a large long-format TIMETABLE
+(default: 5000 classes x 42 slots = 210k rows): re-validating the whole
+table with GROUP BY queries versus timetable_validator replaying only the
+rows each edit touched.
+
+Run from the repository root:
+    python -m benchmarks.bench_timetable_validator [--classes 5000] [--edits 200]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from timetable_validator import RESOURCE_COLUMNS, TimetableValidator
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+TIMES = ["9:00 AM", "10:00 AM", "11:00 AM", "12:00 PM", "2:00 PM", "3:00 PM", "4:00 PM"]
+
+FULL_CHECK_SQL = "SELECT {col}, DAY, TIME FROM TIMETABLE WHERE {col} IS NOT NULL GROUP BY {col}, DAY, TIME HAVING COUNT(*) > 1"
+
+
+def build(db_file, classes, seed=5):
+    """Clash-free timetable: class c sits in room c and is taught by professor (c + slot) % classes."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE TIMETABLE (CLASS TEXT, DAY TEXT, TIME TEXT, SUBJECT TEXT, PROFESSOR TEXT, ROOM TEXT)")
+    slots = [(day, time) for day in DAYS for time in TIMES]
+    rows = (
+        (f"C{c:05d}", day, time, f"SUB{rng.randrange(300):03d}", f"Prof. {(c + s) % classes:05d}", f"Room {c:05d}")
+        for c in range(classes)
+        for s, (day, time) in enumerate(slots)
+    )
+    conn.executemany("INSERT INTO TIMETABLE VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    return conn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classes", type=int, default=5000)
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "timetable.db")
+        conn = build(db_file, args.classes)
+        count = conn.execute("SELECT COUNT(*) FROM TIMETABLE").fetchone()[0]
+        conn.close()
+        edits = [
+            f"UPDATE TIMETABLE SET ROOM = 'Room {rng.randrange(args.classes):05d}' WHERE rowid = {rng.randrange(1, count + 1)}"
+            for _ in range(args.edits)
+        ]
+
+        start = time.perf_counter()
+        validator = TimetableValidator(db_file).load()
+        load_s = time.perf_counter() - start
+
+        # Every edit runs through a watched connection; only the checks are timed
+        conn = sqlite3.connect(db_file)
+        validator.watch(conn)
+        full_runs = max(1, args.edits // 20)
+        full_s = incremental_s = repair_s = 0.0
+        clashes = repairs = 0
+        for i, sql in enumerate(edits):
+            conn.execute(sql)
+            conn.commit()
+            start = time.perf_counter()
+            found = validator.apply_changes(conn)
+            incremental_s += time.perf_counter() - start
+            start = time.perf_counter()
+            for clash in found:
+                repairs += len(validator.propose_repairs(clash))
+            repair_s += time.perf_counter() - start
+            clashes += len(found)
+            if i < full_runs:
+                start = time.perf_counter()
+                for col in RESOURCE_COLUMNS:
+                    conn.execute(FULL_CHECK_SQL.format(col=col)).fetchall()
+                full_s += time.perf_counter() - start
+        final = sum(len(conn.execute(FULL_CHECK_SQL.format(col=col)).fetchall()) for col in RESOURCE_COLUMNS)
+        conn.close()
+
+    full_ms = full_s / full_runs * 1000
+    incremental_ms = incremental_s / len(edits) * 1000
+    print(f"{count} rows, {args.edits} single-row room edits (one-off index load {load_s:.2f} s)")
+    print(f"  full GROUP BY check        {full_ms:9.3f} ms per edit")
+    print(f"  incremental check          {incremental_ms:9.3f} ms per edit ({full_ms / incremental_ms:.0f}x)")
+    print(f"  repair proposals           {repair_s / max(1, clashes) * 1000:9.3f} ms per clash ({repairs} for {clashes} clashes)")
+    print(f"  index agrees with SQL: {len(validator.clashes(list(validator.cells))) == final} ({final} clashing cells)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import pandas as pd
+
+from database import sql_rows
+
+STAGING_TABLE = "upload_staging"
+
+
+def stage_frame(df, column_mappings):
+    """
+    Rename an uploaded frame to database columns.
+
+    When several Excel columns map to the same database column the last one
+    wins, as it did when rows were applied one by one. Repeated NAMEs keep
+    their last row for the same reason; rows without a NAME are all kept.
+    """
+    staged = pd.DataFrame(index=df.index)
+    for excel_col, db_col in column_mappings.items():
+        staged[db_col] = df[excel_col]
+    if "NAME" in staged.columns:
+        named = staged["NAME"].notna()
+        staged = pd.concat([staged[named].drop_duplicates(subset="NAME", keep="last"), staged[~named]])
+    return staged
+
+
+def _quoted(columns):
+    return [f'"{col}"' for col in columns]
+
+
+def has_unique_name_index(conn, table="TIMETABLE"):
+    """True when TIMETABLE has a unique index on NAME alone, which ON CONFLICT(NAME) needs."""
+    for _, index_name, unique, *_ in conn.execute(f'PRAGMA index_list("{table}")'):
+        if unique and [row[2] for row in conn.execute(f'PRAGMA index_info("{index_name}")')] == ["NAME"]:
+            return True
+    return False
+
+
+def apply_upload(conn, staged, action, table="TIMETABLE"):
+    """
+    Apply a staged upload to the timetable with set-based statements in one transaction.
+
+    The frame is loaded into a temp table with executemany. Then:
+      remove - DELETE ... WHERE NAME IN (SELECT NAME FROM staging)
+      modify - UPDATE ... FROM staging, matched on NAME
+      add    - INSERT ... ON CONFLICT(NAME) DO UPDATE when NAME has a unique
+               index, otherwise the same UPDATE ... FROM followed by an
+               INSERT of the NAMEs not yet present
+    Returns the number of rows changed.
+    """
+    columns = list(staged.columns)
+    quoted = _quoted(columns)
+    assignments = ", ".join(f"{col} = s.{col}" for col in quoted if col != '"NAME"')
+    has_name = "NAME" in columns
+
+    if action in ("remove", "modify") and not has_name:
+        return 0  # Nothing to match existing rows on
+
+    changed = 0  # rowcount of each statement: unlike total_changes, it leaves out rows written by triggers
+    conn.execute(f"DROP TABLE IF EXISTS temp.{STAGING_TABLE}")
+    conn.execute(f"CREATE TEMP TABLE {STAGING_TABLE} ({', '.join(quoted)})")
+    try:
+        with conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            conn.executemany(
+                f"INSERT INTO temp.{STAGING_TABLE} VALUES ({', '.join('?' * len(columns))})",
+                sql_rows(staged),
+            )
+
+            if action == "remove":
+                changed += conn.execute(f'DELETE FROM "{table}" WHERE NAME IN (SELECT NAME FROM temp.{STAGING_TABLE})').rowcount
+
+            elif action == "modify":
+                if assignments:
+                    changed += conn.execute(
+                        f'UPDATE "{table}" SET {assignments} FROM temp.{STAGING_TABLE} AS s WHERE "{table}".NAME = s.NAME'
+                    ).rowcount
+
+            elif has_name and has_unique_name_index(conn, table):
+                excluded = ", ".join(f"{col} = excluded.{col}" for col in quoted if col != '"NAME"')
+                conflict = f"DO UPDATE SET {excluded}" if excluded else "DO NOTHING"
+                # "WHERE true" keeps SQLite from parsing ON CONFLICT as a join constraint
+                changed += conn.execute(
+                    f'INSERT INTO "{table}" ({", ".join(quoted)}) '
+                    f"SELECT {', '.join(quoted)} FROM temp.{STAGING_TABLE} WHERE true "
+                    f"ON CONFLICT(NAME) {conflict}"
+                ).rowcount
+
+            else:
+                if has_name and assignments:
+                    changed += conn.execute(
+                        f'UPDATE "{table}" SET {assignments} FROM temp.{STAGING_TABLE} AS s WHERE "{table}".NAME = s.NAME'
+                    ).rowcount
+                missing = (
+                    f' WHERE s.NAME IS NULL OR s.NAME NOT IN (SELECT NAME FROM "{table}" WHERE NAME IS NOT NULL)'
+                    if has_name else ""
+                )
+                changed += conn.execute(
+                    f'INSERT INTO "{table}" ({", ".join(quoted)}) '
+                    f"SELECT {', '.join('s.' + col for col in quoted)} FROM temp.{STAGING_TABLE} AS s{missing}"
+                ).rowcount
+    finally:
+        conn.execute(f"DROP TABLE IF EXISTS temp.{STAGING_TABLE}")
+    return changed
@@ -0,0 +1,60 @@
+import os
+
+from database import BRANCH_CONFIG as INGEST_CONFIG, DATABASE_DIR
+
+# Base directory for databases
+BASE_DIR = os.path.join(os.getcwd(), DATABASE_DIR)
+
+# Options offered by the viewers' sidebars
+BLOCKS = ["AB-02", "AB-03"]
+YEARS = ["E1", "E2", "E3", "E4"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+PERIODS = ["P1", "P2", "P3", "P4", "P5", "P6", "P7"]
+
+# Branches shown in the viewers: their sections and rooms; database files come from the ingest config
+VIEWER_BRANCHES = {
+    "CSE": {
+        "sections": ["CSE-01", "CSE-02", "CSE-03", "CSE-04", "CSE-05", "CSE-06"],
+        "has_room": True,
+        "rooms": [],
+    },
+    "ECE": {
+        "sections": ["ECE-01", "ECE-02", "ECE-03", "ECE-04", "ECE-05", "ECE-06"],
+        "has_room": True,
+        "rooms": [
+            "AB-2-SS1", "AB-2-SS2", "AB-2-SS3", "AB-2-SS4", "AB-2-SS5", "AB-2-SS6", "AB-2-SS7", "AB-2-SS8",
+            "AB-2-SS9", "AB-2-SS10", "AB-2-G1", "AB-2-G2", "AB-2-G3", "AB-2-G4", "AB-2-G5", "AB-2-G6",
+            "AB-2-T1", "AB-2-T2"
+        ],
+    },
+    "MECH": {
+        "sections": ["ME-01"],
+        "has_room": True,
+        "rooms": ["AB-3-F2", "AB-3-F4", "AB-3-F5", "AB-3-F6"],
+    },
+    "EEE": {
+        "sections": ["EEE-01", "EEE-02"],
+        "has_room": True,
+        "rooms": ["AB-2-T10", "AB-2-T7", "AB-2-T5", "AB-2-T6", "AB-2-T1", "AB-2-T2", "AB-2-T9"],
+    },
+}
+
+
+def _db_path(branch, key):
+    db_file = INGEST_CONFIG[branch]["databases"].get(key)
+    return os.path.join(BASE_DIR, branch, db_file) if db_file else None
+
+
+# Branch configurations shared by every viewer page
+BRANCH_CONFIG = {
+    branch: dict(
+        config,
+        timetable_db=_db_path(branch, "timetable_db"),
+        faculty_db=_db_path(branch, "faculty_db"),
+        timings_db=_db_path(branch, "timings_db"),
+    )
+    for branch, config in VIEWER_BRANCHES.items()
+}
+
+# Branches whose rooms can be browsed in the room viewer
+ROOM_BRANCHES = {branch: config for branch, config in BRANCH_CONFIG.items() if config["rooms"]}
@@ -0,0 +1,189 @@
+import difflib
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+
+# Persistent cache of header-set -> mapping, relative to the working directory (where the
+# webapp2 pages open timetable.db). Entries never expire: the key includes the database
+# columns, so a schema change just misses and stores a new mapping beside the old one
+CACHE_DB = "column_mapping_cache.db"
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS column_mappings (
+    cache_key TEXT PRIMARY KEY,
+    headers TEXT NOT NULL,
+    db_columns TEXT NOT NULL,
+    mapping TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+# Similarity (difflib ratio on normalized names) above which a header maps without asking the model
+FUZZY_CUTOFF = 0.85
+
+MAPPING_PROMPT = """
+You are matching spreadsheet column headers to database columns.
+Database columns: {db_columns}
+Spreadsheet headers: {headers}
+For every spreadsheet header pick the best matching database column. If none fits, give a
+short upper-case column name to create instead.
+Answer with a single JSON object mapping each spreadsheet header, exactly as given, to its column name.
+"""
+
+
+def normalize_header(name):
+    """Compare headers case- and punctuation-insensitively: ' Room No. ' -> 'room_no'."""
+    return re.sub(r"[^0-9a-z]+", "_", str(name).strip().lower()).strip("_")
+
+
+def cache_key(excel_columns, db_columns):
+    """Key a mapping by the normalized header tuple plus the database schema it was made against."""
+    payload = json.dumps([[normalize_header(c) for c in excel_columns], list(db_columns)])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def fuzzy_match(excel_columns, db_columns, cutoff=FUZZY_CUTOFF):
+    """
+    Map the headers that match a database column exactly or near-exactly.
+
+    Returns {excel column: db column} for the matched headers only; the rest
+    are left for the model.
+    """
+    by_normalized = {normalize_header(col): col for col in db_columns}
+    matches = {}
+    for excel_col in excel_columns:
+        key = normalize_header(excel_col)
+        if key in by_normalized:
+            matches[excel_col] = by_normalized[key]
+            continue
+        close = difflib.get_close_matches(key, list(by_normalized), n=1, cutoff=cutoff)
+        if close:
+            matches[excel_col] = by_normalized[close[0]]
+    return matches
+
+
+def parse_mapping(text, excel_columns):
+    """Pull the {header: column} object out of a model answer, tolerating code fences and chatter."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return {}
+    try:
+        answer = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(answer, dict):
+        return {}
+    # Match answer keys back to the headers the way the model may have retyped them
+    by_normalized = {normalize_header(col): col for col in excel_columns}
+    mapping = {}
+    for header, column in answer.items():
+        excel_col = by_normalized.get(normalize_header(header))
+        if excel_col is not None and isinstance(column, str) and column.strip():
+            mapping[excel_col] = column.strip()
+    return mapping
+
+
+class ColumnMapper:
+    """
+    Map uploaded Excel headers to TIMETABLE columns.
+
+    Lookups go cache -> fuzzy match -> one batched model prompt for whatever
+    is still unmatched. `model` is any callable taking a prompt string and
+    returning the reply text, so a local stub can stand in for Gemini.
+    """
+
+    def __init__(self, model, cache_path=CACHE_DB, fuzzy_cutoff=FUZZY_CUTOFF):
+        self.model = model
+        self.cache_path = cache_path
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.model_calls = 0
+        self.last_source = None  # "cache", "fuzzy" or "model"
+
+    def _connect(self):
+        conn = sqlite3.connect(self.cache_path)
+        conn.execute(CACHE_SCHEMA)
+        return conn
+
+    def cached(self, excel_columns, db_columns):
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT mapping FROM column_mappings WHERE cache_key = ?", (cache_key(excel_columns, db_columns),)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        stored = json.loads(row[0])
+        return {col: stored[normalize_header(col)] for col in excel_columns if normalize_header(col) in stored}
+
+    def store(self, excel_columns, db_columns, mapping):
+        if self.cache_path is None:
+            return
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO column_mappings VALUES (?, ?, ?, ?, ?)",
+                    (
+                        cache_key(excel_columns, db_columns),
+                        json.dumps([normalize_header(c) for c in excel_columns]),
+                        json.dumps(list(db_columns)),
+                        json.dumps({normalize_header(col): db_col for col, db_col in mapping.items()}),
+                        time.time(),
+                    ),
+                )
+        finally:
+            conn.close()
+
+    def ask_model(self, excel_columns, db_columns):
+        """Map every header in excel_columns with a single prompt."""
+        prompt = MAPPING_PROMPT.format(
+            db_columns=", ".join(db_columns),
+            headers=json.dumps([str(col) for col in excel_columns]),
+        )
+        self.model_calls += 1
+        return parse_mapping(self.model(prompt), excel_columns)
+
+    def map(self, excel_columns, db_columns):
+        """Return {excel column: db column} for every header."""
+        excel_columns, db_columns = list(excel_columns), list(db_columns)
+        mapping = self.cached(excel_columns, db_columns)
+        if mapping is not None and len(mapping) == len(excel_columns):
+            self.last_source = "cache"
+            return mapping
+
+        mapping = fuzzy_match(excel_columns, db_columns, self.fuzzy_cutoff)
+        unmatched = [col for col in excel_columns if col not in mapping]
+        self.last_source = "fuzzy"
+        if unmatched:
+            self.last_source = "model"
+            mapping.update(self.ask_model(unmatched, db_columns))
+            # A header the model skipped becomes a column of its own name
+            for col in unmatched:
+                mapping.setdefault(col, normalize_header(col).upper() or f"COLUMN_{excel_columns.index(col)}")
+
+        mapping = {col: mapping[col] for col in excel_columns}
+        self.store(excel_columns, db_columns, mapping)
+        return mapping
+
+
+def stub_model(answers=None, latency=0.0):
+    """
+    Stand-in for the Gemini call: answers mapping prompts from a fixed {header: column} dict.
+
+    Headers not in `answers` are echoed back upper-cased. `latency` seconds are
+    slept per call to mimic a network round trip.
+    """
+    answers = answers or {}
+
+    def model(prompt):
+        time.sleep(latency)
+        headers = json.loads(prompt.split("Spreadsheet headers:", 1)[1].splitlines()[0])
+        return json.dumps({header: answers.get(header, normalize_header(header).upper()) for header in headers})
+
+    return model
@@ -0,0 +1,134 @@
+import pandas as pd
+
+STATS_TABLE = "dashboard_counts"
+TRIGGER_PREFIX = "dashboard_counts"
+
+# dimension -> value a TIMETABLE row counts towards ({row} is NEW, OLD or the table alias);
+# rows where it is NULL are not counted
+DIMENSIONS = {
+    "ALL": "''",
+    "DAY": '{row}."DAY"',
+    "SUBJECT": '{row}."SUBJECT"',
+    "ROOM": '{row}."ROOM"',
+    "PROFESSOR": '{row}."PROFESSOR"',
+    "TIME": '{row}."TIME"',
+    # Classes per "TIME | DAY | ROOM" cell: cells with a class are the room-slots in use
+    "ROOM_SLOT": 'CASE WHEN {row}."ROOM" IS NOT NULL AND {row}."DAY" IS NOT NULL '
+                 'THEN {row}."TIME" || \'{sep}\' || {row}."DAY" || \'{sep}\' || {row}."ROOM" END',
+}
+SLOT_SEPARATOR = " | "
+
+# Room-slots in use per TIME: kept by the triggers as ROOM_SLOT cells go from 0 to 1 class and back
+OCCUPIED = "OCCUPIED_TIME"
+
+# What the dashboard reads; ROOM_SLOT (one row per cell) only serves OCCUPIED_TIME
+CHART_DIMENSIONS = [dimension for dimension in DIMENSIONS if dimension != "ROOM_SLOT"] + [OCCUPIED]
+
+
+def _expressions(columns):
+    # A column the table lacks counts as NULL, so the dimension is simply empty
+    missing = [col for col in ("DAY", "SUBJECT", "ROOM", "PROFESSOR", "TIME") if col not in columns]
+    expressions = {}
+    for dimension, expression in DIMENSIONS.items():
+        expression = expression.replace("{sep}", SLOT_SEPARATOR)
+        for col in missing:
+            expression = expression.replace(f'{{row}}."{col}"', "NULL")
+        expressions[dimension] = expression
+    return expressions
+
+
+def _trigger_sql(table, expressions):
+    def occupied(row, delta):
+        # Runs before the ROOM_SLOT bump: a cell at 0 is about to be used, a cell at 1 about to be freed
+        cell = expressions["ROOM_SLOT"].format(row=row)
+        return (
+            f"INSERT INTO {STATS_TABLE} (dimension, value, count) "
+            f"SELECT '{OCCUPIED}', time, {delta} FROM (SELECT {expressions['TIME'].format(row=row)} AS time, {cell} AS cell) "
+            f"WHERE cell IS NOT NULL AND COALESCE((SELECT count FROM {STATS_TABLE} "
+            f"WHERE dimension = 'ROOM_SLOT' AND value = cell), 0) = {0 if delta > 0 else 1} "
+            f"ON CONFLICT (dimension, value) DO UPDATE SET count = count + ({delta});"
+        )
+
+    def bump(row, delta):
+        return occupied(row, delta) + "".join(
+            f"INSERT INTO {STATS_TABLE} (dimension, value, count) "
+            f"SELECT '{dimension}', value, {delta} FROM (SELECT {expression.format(row=row)} AS value) "
+            f"WHERE value IS NOT NULL "
+            f"ON CONFLICT (dimension, value) DO UPDATE SET count = count + ({delta});"
+            for dimension, expression in expressions.items()
+        )
+
+    bodies = {"insert": bump("NEW", 1), "delete": bump("OLD", -1), "update": bump("OLD", -1) + bump("NEW", 1)}
+    return {
+        f"{TRIGGER_PREFIX}_{event}": (
+            f'CREATE TRIGGER {TRIGGER_PREFIX}_{event} AFTER {event.upper()} ON "{table}" BEGIN {body} END'
+        )
+        for event, body in bodies.items()
+    }
+
+
+def install_dashboard_stats(conn, table="TIMETABLE"):
+    """
+    Keep per-dimension class counts of a TIMETABLE in dashboard_counts.
+
+    The counts are built once with GROUP BY, then triggers on the table add
+    and subtract each inserted, deleted or updated row, so every later
+    change (modify page, bulk upload, any other writer) keeps them current
+    at the cost of the rows it touched. Rebuilds only when the triggers are
+    missing or were created for different columns. Returns True if it did.
+    """
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+    if not columns:
+        return False
+    expressions = _expressions(columns)
+    triggers = _trigger_sql(table, expressions)
+    existing = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'").fetchall())
+    if all(existing.get(name) == sql for name, sql in triggers.items()):
+        return False
+
+    with conn:
+        conn.execute("BEGIN")
+        for name in triggers:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(f"DROP TABLE IF EXISTS {STATS_TABLE}")
+        conn.execute(
+            f"CREATE TABLE {STATS_TABLE} (dimension TEXT NOT NULL, value TEXT NOT NULL, "
+            "count INTEGER NOT NULL, PRIMARY KEY (dimension, value)) WITHOUT ROWID"
+        )
+        for dimension, expression in expressions.items():
+            value = expression.format(row="t")
+            conn.execute(
+                f"INSERT INTO {STATS_TABLE} SELECT '{dimension}', {value}, COUNT(*) "
+                f'FROM "{table}" AS t WHERE {value} IS NOT NULL GROUP BY {value}'
+            )
+        conn.execute(
+            f"INSERT INTO {STATS_TABLE} SELECT '{OCCUPIED}', time, COUNT(*) FROM "
+            f"(SELECT DISTINCT {expressions['TIME'].format(row='t')} AS time, {expressions['ROOM_SLOT'].format(row='t')} AS cell "
+            f'FROM "{table}" AS t) WHERE cell IS NOT NULL GROUP BY time'
+        )
+        for sql in triggers.values():
+            conn.execute(sql)
+    return True
+
+
+def read_dashboard_stats(conn):
+    """{dimension: DataFrame(value, count)} of the counts the dashboard charts, zero counts dropped."""
+    placeholders = ", ".join("?" * len(CHART_DIMENSIONS))
+    counts = pd.read_sql_query(
+        f"SELECT dimension, value, count FROM {STATS_TABLE} "
+        f"WHERE dimension IN ({placeholders}) AND count > 0 ORDER BY dimension, value",
+        conn,
+        params=CHART_DIMENSIONS,
+    )
+    return {
+        dimension: counts.loc[counts["dimension"] == dimension, ["value", "count"]].reset_index(drop=True)
+        for dimension in CHART_DIMENSIONS
+    }
+
+
+def period_utilization(stats):
+    """Share of room-slots in use per period: occupied (day, room) cells / (rooms x days)."""
+    room_slots = len(stats["ROOM"]) * len(stats["DAY"])
+    utilization = stats[OCCUPIED].rename(columns={"value": "TIME", "count": "occupied"})
+    utilization["utilization"] = utilization["occupied"] / room_slots if room_slots else 0.0
+    return utilization
@@ -0,0 +1,196 @@
+import os
+import sqlite3
+import threading
+import urllib.parse
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import pandas as pd
+
+from database import BRANCH_CONFIG, CAMPUS_DB, DATABASE_DIR, DB_VERSION_FILE, read_db_version
+
+
+def branch_db_paths(branch_config=BRANCH_CONFIG, database_dir=DATABASE_DIR):
+    """List every database file declared in BRANCH_CONFIG."""
+    paths = []
+    for branch, config in branch_config.items():
+        for db_file in config["databases"].values():
+            if db_file is not None:
+                paths.append(os.path.join(database_dir, branch, db_file))
+    return paths
+
+
+def table_source(db_path, table, branch):
+    """
+    Where to read a branch table from.
+
+    When ingest ran with --consolidated, returns the campus database and the
+    per-branch compatibility view (e.g. cse_faculty); otherwise the branch's
+    own database file and table.
+    """
+    if db_path is not None and os.path.exists(CAMPUS_DB):
+        return CAMPUS_DB, f"{branch.lower()}_{table}"
+    return db_path, table
+
+
+def read_only_uri(db_path):
+    """
+    Build a read-only SQLite URI for a database file.
+
+    Not immutable=1: incremental ingest rewrites the branch databases in
+    place, and only SQLite's normal locking keeps a read from seeing a
+    half-written transaction.
+    """
+    return f"file:{urllib.parse.quote(os.path.abspath(db_path))}?mode=ro"
+
+
+class ConnectionPool:
+    """
+    Process-wide pool of read-only SQLite handles, one per database file.
+
+    Handles are opened lazily (or up front with warm()) and shared by every
+    session; each handle has its own lock so concurrent Streamlit sessions
+    serialize per database instead of reconnecting on every call. A handle
+    is reopened when its file's mtime or size changes, so a database that
+    ingest replaced (campus.db is written aside and os.replace'd) is read
+    from the new file rather than the unlinked one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handles = {}  # abs path -> [conn, lock, stamp]
+
+    @staticmethod
+    def _stamp(path):
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _handle(self, db_path):
+        path = os.path.abspath(db_path)
+        stamp = self._stamp(path)
+        with self._lock:
+            handle = self._handles.get(path)
+            if handle is not None and handle[2] != stamp:
+                # The file was re-ingested since we opened it; drop the stale handle
+                with handle[1]:
+                    handle[0].close()
+                handle = None
+            if handle is None:
+                conn = sqlite3.connect(read_only_uri(path), uri=True, check_same_thread=False)
+                handle = [conn, threading.Lock(), stamp]
+                self._handles[path] = handle
+            return handle
+
+    @contextmanager
+    def connection(self, db_path):
+        """Borrow the shared handle for a database file."""
+        conn, lock, _ = self._handle(db_path)
+        with lock:
+            yield conn
+
+    def read_sql(self, db_path, query, params=()):
+        """Run a read query on the pooled handle and return a DataFrame."""
+        with self.connection(db_path) as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def warm(self, db_paths=None):
+        """Open handles for the given files (default: every branch database) ahead of the first request."""
+        for db_path in db_paths or branch_db_paths() + [CAMPUS_DB]:
+            if os.path.exists(db_path):
+                with self.connection(db_path) as conn:
+                    # Touch the schema so it is parsed and cached on this handle
+                    conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
+        return self
+
+    def close(self):
+        with self._lock:
+            for conn, lock, _ in self._handles.values():
+                with lock:
+                    conn.close()
+            self._handles.clear()
+
+
+class QueryCache:
+    """
+    LRU cache of read query results, valid for one ingest.
+
+    Results are keyed on (database file, query, params) and tagged with the
+    version stamp database.py writes at ingest; when the stamp changes every
+    entry is dropped. Between ingests a repeated query is answered from
+    memory without touching SQLite (checking the stamp is one os.stat).
+    Bounded by entry count and by the DataFrames' memory size, evicting the
+    least recently used first. Callers get a shallow copy; with pandas
+    copy-on-write, changing it never reaches the cached frame.
+    """
+
+    def __init__(self, pool=None, max_entries=512, max_bytes=64 * 1024 * 1024, version_file=DB_VERSION_FILE):
+        self.pool = pool or ConnectionPool()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.version_file = version_file
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (DataFrame, size in bytes)
+        self._bytes = 0
+        self._version = None
+        self._version_stamp = False  # stat of the version file the version was read at
+        self._entries_version = None  # version the cached entries belong to
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def bytes(self):
+        return self._bytes
+
+    def version(self):
+        """The ingest version stamp, re-read only when the version file changes."""
+        try:
+            stat = os.stat(self.version_file)
+            stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except FileNotFoundError:
+            stamp = None
+        if stamp != self._version_stamp:
+            self._version = read_db_version(self.version_file)
+            self._version_stamp = stamp
+        return self._version
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _check_version(self, version):
+        # Called with the lock held
+        if version != self._entries_version:
+            if self._entries:
+                self.stats["invalidations"] += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._entries_version = version
+
+    def read_sql(self, db_path, query, params=()):
+        """pool.read_sql through the cache."""
+        key = (os.path.abspath(db_path), " ".join(query.split()), tuple(params))
+        version = self.version()
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0].copy(deep=False)
+            self.stats["misses"] += 1
+
+        df = self.pool.read_sql(db_path, query, params)
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            # Skip storing if an ingest landed while the query ran
+            if version == self._entries_version and size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (df, size)
+                self._bytes += size
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted
+                    self.stats["evictions"] += 1
+        return df.copy(deep=False)
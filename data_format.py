@@ -1,19 +1,19 @@
 import pandas as pd
 
+from excel_reader import read_excel_sheets
+
 # Paths to the Excel files
 file_ece = "Modified Data\ECE\ece.xlsx"
 file_eee = "Modified Data\EEE\EEE1.xlsx"
 
-# Load the Excel files
-ece_data = pd.ExcelFile(file_ece)
-eee_data = pd.ExcelFile(file_eee)
+# Load every sheet of the Excel files
+ece_data = read_excel_sheets(file_ece)
+eee_data = read_excel_sheets(file_eee)
 
 # Function to normalize and clean the data
-def format_for_database(excel_file):
+def format_for_database(sheets):
     formatted_data = {}
-    for sheet in excel_file.sheet_names:
-        df = excel_file.parse(sheet)
-        
+    for sheet, df in sheets.items():
         # Ensure column names are consistent
         df.columns = [col.strip().replace(" ", "_").lower() for col in df.columns]
         
@@ -4,6 +4,32 @@ import openpyxl
 from openpyxl.utils.cell import range_boundaries
 import numpy as np
 
+from excel_reader import rows_to_frame
+
+def demerged_frame(sheet, merged_cell_ranges=None):
+    """
+    Read a worksheet into a DataFrame with every merged range filled with its top-left value.
+
+    The sheet's values are copied into a numpy grid once and each merged
+    block is filled with a single slice assignment, so nothing is written
+    back to the workbook or to disk.
+    """
+    if merged_cell_ranges is None:
+        merged_cell_ranges = sheet.merged_cells.ranges
+    bounds = [range_boundaries(str(merge_range)) for merge_range in merged_cell_ranges]
+
+    # Grid anchored at A1, large enough for the data and every merged range
+    n_rows = max([sheet.max_row] + [max_row for _, _, _, max_row in bounds])
+    n_cols = max([sheet.max_column] + [max_col for _, _, max_col, _ in bounds])
+    grid = np.full((n_rows, n_cols), None, dtype=object)
+    for i, row in enumerate(sheet.iter_rows(min_row=1, min_col=1, max_row=n_rows, max_col=n_cols, values_only=True)):
+        grid[i, :len(row)] = row
+
+    for min_col, min_row, max_col, max_row in bounds:
+        grid[min_row - 1:max_row, min_col - 1:max_col] = grid[min_row - 1, min_col - 1]
+
+    return rows_to_frame(tuple(row) for row in grid)
+
 def preprocess_excel(file_path, output_path=None):
     """
     Comprehensive Excel sheet preprocessing function with improved merged cell handling
@@ -34,33 +60,9 @@ def preprocess_excel(file_path, output_path=None):
     merged_cell_ranges = list(sheet.merged_cells.ranges)
     print(f"Merged Cell Ranges Found: {len(merged_cell_ranges)}")
     
-    # Step 2: Demerge and fill cells - Improved method
-    for merge_range in merged_cell_ranges:
-        # Extract boundaries of the merged cell range
-        min_col, min_row, max_col, max_row = range_boundaries(str(merge_range))
-        
-        # Get the value from the top-left cell in the merged range
-        # Use data_only=True when loading workbook to get actual cell values
-        value = sheet.cell(row=min_row, column=min_col).value
-        
-        # Unmerge the cells first
-        sheet.unmerge_cells(str(merge_range))
-        
-        # Fill all cells in the merged range with this value
-        for row in range(min_row, max_row + 1):
-            for col in range(min_col, max_col + 1):
-                cell = sheet.cell(row=row, column=col)
-                cell.value = value
-    
-    # Temporary save to process with pandas
-    temp_output_path = os.path.join(os.path.dirname(file_path), 'temp_demerged.xlsx')
-    workbook.save(temp_output_path)
-    
-    # Step 3: Convert to pandas DataFrame for advanced processing
-    df = pd.read_excel(temp_output_path)
-    
-    # Remove temporary file
-    os.remove(temp_output_path)
+    # Steps 2-3: Demerge and fill cells in memory, straight into a pandas DataFrame
+    df = demerged_frame(sheet, merged_cell_ranges)
+    workbook.close()
     
     # Remove completely empty rows and columns
     df.dropna(how='all', axis=0, inplace=True)
@@ -1,113 +1,878 @@
-import os
-import pandas as pd
-from sqlalchemy import create_engine
-
-# Directory structure
-MODIFIED_DATA_DIR = "Modified Data"
-DATABASE_DIR = "Database"
-
-BRANCH_CONFIG = {
-    "CSE": {
-        "excel_files": {
-            "timetable": "CSE_only_periods.xlsx",
-            "faculty": "CSE_faculty_formatted.xlsx",
-            "timings": "period_schedule.xlsx",
-        },
-        "databases": {
-            "timetable_db": "cse_timetable.db",
-            "faculty_db": "cse_faculty.db",
-            "timings_db": "cse_timings.db",
-        },
-    },
-    "ECE": {
-        "excel_files": {
-            "timetable": "ECE_Timetable.xlsx",
-            "faculty": "formatted_ece.xlsx",
-            "timings": "period_schedule.xlsx",
-        },
-        "databases": {
-            "timetable_db": "ece_timetable.db",
-            "faculty_db": "ece_faculty.db",
-            "timings_db": "ece_timings.db",
-        },
-    },
-    "MECH": {
-        "excel_files": {
-            "timetable":"MechtimeTable.xlsx" ,
-            "faculty": "MECH.xlsx",  # Faculty data not provided
-            "timings": "period_schedule.xlsx",
-        },
-        "databases": {
-            "timetable_db": "mech_timetable.db",
-            "faculty_db": "mech_faculty.db",  # No faculty database
-            "timings_db": "mech_timings.db",
-        },
-    },
-    "EEE": {
-        "excel_files": {
-            "timetable": "EEE_only_periods.xlsx",
-            "faculty": "formatted_eee.xlsx",
-            "timings": "period_schedule.xlsx",
-        },
-        "databases": {
-            "timetable_db": "eee_timetable.db",
-            "faculty_db": "eee_faculty.db",
-            "timings_db": "eee_timings.db",
-        },
-    },
-    "CHEM": {
-        "excel_files": {
-            "timetable": "CHEMTimeTable.xlsx",
-            "faculty": None,  # No faculty data for CHEM
-            "timings": "period_schedule.xlsx",
-        },
-        "databases": {
-            "timetable_db": "chem_timetable.db",
-            "faculty_db": None,  # No faculty database
-            "timings_db": "chem_timings.db",
-        },
-    },
-}
-
-def excel_to_sqlite(excel_file, db_file, table_name):
-    """Convert an Excel file to an SQLite database."""
-    if not os.path.exists(excel_file):
-        print(f"File not found: {excel_file}")
-        return
-
-    # Read the Excel file
-    df = pd.read_excel(excel_file)
-
-    # Create a connection to the SQLite database
-    engine = create_engine(f'sqlite:///{db_file}')
-
-    # Write the DataFrame to the SQLite database
-    df.to_sql(table_name, engine, index=False, if_exists='replace')
-
-    print(f"Data from {excel_file} has been written to {db_file} in table {table_name}")
-
-def process_branch(branch, config):
-    """Process a branch by converting its Excel files into SQLite databases."""
-    excel_dir = os.path.join(MODIFIED_DATA_DIR, branch)
-    db_dir = os.path.join(DATABASE_DIR, branch)
-
-    # Create the branch database directory if it doesn't exist
-    os.makedirs(db_dir, exist_ok=True)
-
-    for db_key, db_file in config["databases"].items():
-        if db_file is None:
-            continue  # Skip if no database is specified
-
-        table_name = db_key.split("_")[0]  # e.g., 'timetable' from 'timetable_db'
-        excel_file = config["excel_files"].get(table_name)
-
-        if excel_file:
-            excel_path = os.path.join(excel_dir, excel_file)
-            db_path = os.path.join(db_dir, db_file)
-            excel_to_sqlite(excel_path, db_path, table_name)
-
-# Process each branch
-for branch, config in BRANCH_CONFIG.items():
-    process_branch(branch, config)
-
-print("All branches processed successfully!")
+import os
+import argparse
+import hashlib
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from sqlalchemy import create_engine
+
+from excel_reader import ENGINES, read_excel
+
+# Directory structure
+MODIFIED_DATA_DIR = "Modified Data"
+DATABASE_DIR = "Database"
+CAMPUS_DB = os.path.join(DATABASE_DIR, "campus.db")
+# Rewritten by every ingest that changes a database; readers key their caches on it
+DB_VERSION_FILE = os.path.join(DATABASE_DIR, "db_version")
+
+# Grid of the wide timetable layout: one DAY_Pn column per day and period
+DAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY"]
+PERIODS = ["P1", "P2", "P3", "P4", "P5", "P6", "P7"]
+
+BRANCH_CONFIG = {
+    "CSE": {
+        "excel_files": {
+            "timetable": "CSE_only_periods.xlsx",
+            "faculty": "CSE_faculty_formatted.xlsx",
+            "timings": "period_schedule.xlsx",
+        },
+        "databases": {
+            "timetable_db": "cse_timetable.db",
+            "faculty_db": "cse_faculty.db",
+            "timings_db": "cse_timings.db",
+        },
+    },
+    "ECE": {
+        "excel_files": {
+            "timetable": "ECE_Timetable.xlsx",
+            "faculty": "formatted_ece.xlsx",
+            "timings": "period_schedule.xlsx",
+        },
+        "databases": {
+            "timetable_db": "ece_timetable.db",
+            "faculty_db": "ece_faculty.db",
+            "timings_db": "ece_timings.db",
+        },
+    },
+    "MECH": {
+        "excel_files": {
+            "timetable":"MechtimeTable.xlsx" ,
+            "faculty": "MECH.xlsx",  # Faculty data not provided
+            "timings": "period_schedule.xlsx",
+        },
+        "databases": {
+            "timetable_db": "mech_timetable.db",
+            "faculty_db": "mech_faculty.db",  # No faculty database
+            "timings_db": "mech_timings.db",
+        },
+    },
+    "EEE": {
+        "excel_files": {
+            "timetable": "EEE_only_periods.xlsx",
+            "faculty": "formatted_eee.xlsx",
+            "timings": "period_schedule.xlsx",
+        },
+        "databases": {
+            "timetable_db": "eee_timetable.db",
+            "faculty_db": "eee_faculty.db",
+            "timings_db": "eee_timings.db",
+        },
+    },
+    "CHEM": {
+        "excel_files": {
+            "timetable": "CHEMTimeTable.xlsx",
+            "faculty": None,  # No faculty data for CHEM
+            "timings": "period_schedule.xlsx",
+        },
+        "databases": {
+            "timetable_db": "chem_timetable.db",
+            "faculty_db": None,  # No faculty database
+            "timings_db": "chem_timings.db",
+        },
+    },
+}
+
+# Row keys used to diff a re-ingested workbook against the rows already in the database
+TABLE_KEYS = {
+    "timetable": ["BLOCK", "YEAR", "SECTION"],
+    "faculty": ["YEAR", "subject_code", "sections"],
+    "timings": ["Period"],
+}
+
+MANIFEST_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS ingest_manifest (
+        source TEXT PRIMARY KEY,
+        table_name TEXT NOT NULL,
+        sha256 TEXT NOT NULL,
+        mtime REAL NOT NULL,
+        size INTEGER NOT NULL,
+        ingested_at TEXT NOT NULL
+    )
+"""
+
+def file_sha256(path):
+    """Content hash of a source workbook."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def record_manifest(conn, source, table_name, digest, stat):
+    conn.execute(
+        "INSERT OR REPLACE INTO ingest_manifest VALUES (?, ?, ?, ?, ?, datetime('now'))",
+        (source, table_name, digest, stat.st_mtime, stat.st_size),
+    )
+
+def table_columns(conn, table_name):
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table_name}")')]
+
+def as_stored(df):
+    """Round-trip a frame through SQLite so its values compare equal to rows read back from a database."""
+    mem = sqlite3.connect(":memory:")
+    df.to_sql("t", mem, index=False)
+    stored = pd.read_sql_query("SELECT * FROM t", mem)
+    mem.close()
+    return stored
+
+def diff_rows(old, new, keys):
+    """
+    Compare two versions of a table key group by key group.
+
+    Returns (changed, deleted): keys whose rows are new or differ, and keys
+    that no longer appear. Keys need not be unique (a faculty table can list
+    several teachers for one subject and section); a group is replaced whole.
+    """
+    key_idx = [list(old.columns).index(key) for key in keys]
+
+    def groups(df):
+        grouped = {}
+        for row in sql_rows(df):
+            grouped.setdefault(tuple(row[i] for i in key_idx), []).append(row)
+        return {key: sorted(rows, key=repr) for key, rows in grouped.items()}
+
+    old_groups, new_groups = groups(old), groups(new)
+    changed = [key for key, rows in new_groups.items() if old_groups.get(key) != rows]
+    deleted = [key for key in old_groups if key not in new_groups]
+    return changed, deleted
+
+def key_filter(keys):
+    # IS rather than = so NULL keys match too
+    return " AND ".join(f'"{key}" IS ?' for key in keys)
+
+def needs_ingest(excel_file, db_file, table_name, full=False):
+    """
+    Cheap manifest check done before a workbook is parsed.
+
+    Returns (stale, known_digest): stale is False when mtime and size match
+    the manifest; known_digest is the recorded hash to compare the file
+    against (None when the table must be rebuilt anyway).
+    """
+    conn = sqlite3.connect(db_file)
+    conn.execute(MANIFEST_SCHEMA)
+    existing = table_columns(conn, table_name)
+    entry = conn.execute(
+        "SELECT sha256, mtime, size FROM ingest_manifest WHERE source = ?", (os.path.normpath(excel_file),)
+    ).fetchone()
+    conn.close()
+
+    if full or not existing or not entry:
+        return True, None
+    stat = os.stat(excel_file)
+    if (entry[1], entry[2]) == (stat.st_mtime, stat.st_size):
+        return False, entry[0]
+    return True, entry[0]
+
+def read_source(excel_file, known_digest=None, engine=None):
+    """
+    Hash and parse a workbook. Safe to run in a worker process.
+
+    Returns (digest, df, seconds); df is None when the content hash equals
+    known_digest, i.e. the file was touched but not edited.
+    """
+    start = time.perf_counter()
+    digest = file_sha256(excel_file)
+    df = None if digest == known_digest else read_excel(excel_file, engine=engine)
+    return digest, df, time.perf_counter() - start
+
+def write_source(excel_file, db_file, table_name, digest, df, branch=None, full=False):
+    """
+    Apply a parsed workbook to its table and record it in the manifest.
+
+    The table is rewritten from scratch on the first run, when its columns
+    changed, or with full=True; otherwise the workbook is applied as a
+    row-level diff (keyed by TABLE_KEYS) in one transaction. Returns
+    "unchanged", "rewritten" or "merged".
+    """
+    source = os.path.normpath(excel_file)
+    stat = os.stat(excel_file)
+    conn = sqlite3.connect(db_file)
+
+    if df is None:
+        # Touched but identical; remember the new mtime so the next run skips hashing
+        with conn:
+            record_manifest(conn, source, table_name, digest, stat)
+        conn.close()
+        print(f"Unchanged: {excel_file}")
+        return "unchanged"
+
+    existing = table_columns(conn, table_name)
+    keys = TABLE_KEYS.get(table_name, [])
+
+    if full or not existing or not keys or set(df.columns) != set(existing):
+        conn.close()
+
+        # Create a connection to the SQLite database
+        engine = create_engine(f'sqlite:///{db_file}')
+
+        # Write the DataFrame to the SQLite database
+        df.to_sql(table_name, engine, index=False, if_exists='replace')
+        engine.dispose()
+
+        conn = sqlite3.connect(db_file)
+        with conn:
+            record_manifest(conn, source, table_name, digest, stat)
+        conn.close()
+        print(f"Data from {excel_file} has been written to {db_file} in table {table_name}")
+        if table_name == "timetable" and branch:
+            write_slots(db_file, branch)
+        if table_name == "faculty":
+            index_faculty_sections(db_file)
+        return "rewritten"
+
+    new = as_stored(df[existing])
+    old = pd.read_sql_query(f'SELECT * FROM "{table_name}"', conn)
+    changed, deleted = diff_rows(old, new, keys)
+    changed_keys = set(changed)
+    key_idx = [existing.index(key) for key in keys]
+    rows = pd.DataFrame(
+        [row for row in sql_rows(new) if tuple(row[i] for i in key_idx) in changed_keys],
+        columns=existing,
+    )
+    placeholders = ", ".join("?" * len(existing))
+    column_list = ", ".join(f'"{col}"' for col in existing)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    update_slots = table_name == "timetable" and branch and "slots" in tables
+    # Also builds the index for faculty databases ingested before it existed
+    update_sections = table_name == "faculty" and (bool(changed or deleted) or "faculty_sections" not in tables)
+
+    with conn:
+        conn.execute("BEGIN")
+        conn.executemany(f'DELETE FROM "{table_name}" WHERE {key_filter(keys)}', changed + deleted)
+        conn.executemany(f'INSERT INTO "{table_name}" ({column_list}) VALUES ({placeholders})', sql_rows(rows))
+        if update_slots and (changed or deleted):
+            # Keep the long-format copy in step, section by section
+            slot_keys = [(branch,) + key for key in changed + deleted]
+            conn.executemany(f"DELETE FROM slots WHERE branch = ? AND {key_filter(['block', 'year', 'section'])}", slot_keys)
+            if not rows.empty:
+                conn.executemany(
+                    f"INSERT INTO slots VALUES ({', '.join('?' * len(SLOT_COLUMNS))})",
+                    sql_rows(timetable_to_slots(rows, branch)),
+                )
+            write_room_occupancy(conn)
+        if update_sections:
+            write_faculty_sections(conn)
+            conn.execute(FACULTY_BY_SECTION_VIEW)
+        record_manifest(conn, source, table_name, digest, stat)
+    conn.close()
+
+    print(f"Data from {excel_file} has been merged into {db_file} in table {table_name}: "
+          f"{len(changed)} key(s) upserted, {len(deleted)} deleted")
+    return "merged"
+
+def excel_to_sqlite(excel_file, db_file, table_name, branch=None, full=False, report=None, engine=None):
+    """
+    Convert an Excel file to an SQLite database.
+
+    A manifest in the database records the hash and mtime of each source
+    workbook, so unchanged files are skipped and changed ones are merged row
+    by row (see write_source). Returns True when the table changed; appends
+    (file, status, parse seconds, write seconds) to report if given.
+    """
+    if not os.path.exists(excel_file):
+        print(f"File not found: {excel_file}")
+        return False
+
+    stale, known_digest = needs_ingest(excel_file, db_file, table_name, full)
+    if not stale:
+        print(f"Unchanged: {excel_file}")
+        if report is not None:
+            report.append((excel_file, "unchanged", 0.0, 0.0))
+        return backfill_faculty_sections(db_file, table_name)
+
+    digest, df, parse_seconds = read_source(excel_file, known_digest, engine)
+    start = time.perf_counter()
+    status = write_source(excel_file, db_file, table_name, digest, df, branch, full)
+    if report is not None:
+        report.append((excel_file, status, parse_seconds, time.perf_counter() - start))
+    return status != "unchanged"
+
+SLOT_COLUMNS = ["branch", "block", "year", "section", "room", "strength", "day", "period", "subject"]
+
+SLOTS_SCHEMA = [
+    """
+    CREATE TABLE slots (
+        branch TEXT NOT NULL,
+        block TEXT,
+        year TEXT,
+        section TEXT,
+        room TEXT,
+        strength INTEGER,
+        day TEXT NOT NULL,
+        period TEXT NOT NULL,
+        subject TEXT
+    )
+    """,
+    "CREATE INDEX idx_slots_section ON slots (branch, block, year, section, day, period)",
+    "CREATE INDEX idx_slots_room ON slots (room, period, day)",
+    "CREATE INDEX idx_slots_subject ON slots (subject, day, period)",
+]
+
+# Per-room occupancy bitmap: bit day_index * len(PERIODS) + period_index is set when any
+# section has a class in the room then (6 days x 7 periods = 42 bits in one INTEGER)
+ROOM_OCCUPANCY_COLUMNS = ["branch", "room", "block", "capacity", "occupancy"]
+
+ROOM_OCCUPANCY_SCHEMA = [
+    """
+    CREATE TABLE room_occupancy (
+        branch TEXT NOT NULL,
+        room TEXT NOT NULL,
+        block TEXT,
+        capacity INTEGER,
+        occupancy INTEGER NOT NULL,
+        PRIMARY KEY (branch, room)
+    )
+    """,
+    "CREATE INDEX idx_room_occupancy_block ON room_occupancy (block, capacity)",
+]
+
+# Subjects that leave the room free (including the spellings found in the sheets)
+FREE_SUBJECTS = {"leisure", "lesuire"}
+
+# Pseudo-faculty in the sheets (unstaffed, project and NPTEL slots), compared via match_key:
+# they teach many sections at once, so they are never a person to clash-check or give a week
+PLACEHOLDER_NAMES = {"NOFACULTY", "TBA", "NA", "PROJECTGUIDE", "NPTEL", "PROJ-1"}
+
+# One row per (faculty row, section): "CSE-01, CSE-02" in faculty.sections becomes two rows,
+# so viewers filter a section with an indexed equality instead of LIKE over the list
+FACULTY_SECTIONS_SCHEMA = [
+    "CREATE TABLE faculty_sections (faculty_id INTEGER NOT NULL, section TEXT NOT NULL)",
+    "CREATE INDEX idx_faculty_sections_section ON faculty_sections (section, faculty_id)",
+]
+
+# Faculty rows joined to each of their sections (faculty_id is the faculty rowid)
+FACULTY_BY_SECTION_VIEW = (
+    "CREATE VIEW IF NOT EXISTS faculty_by_section AS "
+    "SELECT s.section, f.* FROM faculty_sections AS s JOIN faculty AS f ON f.rowid = s.faculty_id"
+)
+
+def split_sections(value):
+    """Sections of a faculty.sections cell: "CSE-01, CSE-02" -> ["CSE-01", "CSE-02"]."""
+    return list(dict.fromkeys(section for section in str(value).replace(" ", "").split(",") if section))
+
+def write_faculty_sections(conn):
+    """Rebuild faculty_sections from the faculty table on an open connection; returns the number of rows."""
+    pairs = [
+        (faculty_id, section)
+        for faculty_id, value in conn.execute("SELECT rowid, sections FROM faculty WHERE sections IS NOT NULL")
+        for section in split_sections(value)
+    ]
+    conn.execute("DROP TABLE IF EXISTS faculty_sections")
+    for statement in FACULTY_SECTIONS_SCHEMA:
+        conn.execute(statement)
+    conn.executemany("INSERT INTO faculty_sections VALUES (?, ?)", pairs)
+    return len(pairs)
+
+def index_faculty_sections(db_file):
+    """Build faculty_sections and the faculty_by_section view in a branch faculty database."""
+    conn = sqlite3.connect(db_file)
+    with conn:
+        conn.execute("BEGIN")
+        rows = write_faculty_sections(conn)
+        conn.execute(FACULTY_BY_SECTION_VIEW)
+    conn.close()
+    print(f"Indexed {rows} faculty sections in {db_file}")
+
+def backfill_faculty_sections(db_file, table_name):
+    """Index a faculty database ingested before faculty_sections existed; True if it had to."""
+    if table_name != "faculty" or not os.path.exists(db_file):
+        return False
+    conn = sqlite3.connect(db_file)
+    try:
+        present = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'faculty_sections'").fetchone()
+    finally:
+        conn.close()
+    if present:
+        return False
+    index_faculty_sections(db_file)
+    return True
+
+# Precomputed week of every faculty member and every section: one row per (owner, period cell)
+# with room, clock times and faculty joined in, so "my week" is one indexed lookup on
+# (kind, owner) instead of a faculty query plus a slots query per section and day
+PERSONAL_TIMETABLE_COLUMNS = [
+    "kind", "owner", "branch", "year", "section", "block", "room", "day", "period", "slot",
+    "start_time", "end_time", "subject", "faculty",
+]
+
+PERSONAL_TIMETABLE_SCHEMA = [
+    """
+    CREATE TABLE personal_timetable (
+        kind TEXT NOT NULL,
+        owner TEXT NOT NULL,
+        branch TEXT NOT NULL,
+        year TEXT,
+        section TEXT,
+        block TEXT,
+        room TEXT,
+        day TEXT NOT NULL,
+        period TEXT NOT NULL,
+        slot INTEGER NOT NULL,
+        start_time TEXT,
+        end_time TEXT,
+        subject TEXT,
+        faculty TEXT
+    )
+    """,
+    "CREATE INDEX idx_personal_timetable_owner ON personal_timetable (kind, owner, slot)",
+]
+
+def match_key(value):
+    """
+    The one join key for names and labels across the faculty and timetable
+    sheets (faculty_analysis, personal_timetable, timetable_export): case and
+    spacing ignored, so "P & S" and "P&S" both give "P&S".
+    """
+    return "".join(str(value).upper().split())
+
+def faculty_owner(name):
+    """personal_timetable owner of a faculty member's week."""
+    return match_key(name)
+
+def section_owner(branch, year, section):
+    """personal_timetable owner of a section's week: "CSE/E1/CSE-01"."""
+    return "/".join(match_key(value) for value in (branch, year, section))
+
+def personal_timetable_rows(slots, faculty=None, timings=None):
+    """
+    Rows of personal_timetable for one branch.
+
+    Every teaching cell of slots (leisure dropped) is matched to the faculty
+    rows, one per section as in faculty_by_section, with the same year,
+    section and subject (compared by match_key). A section gets one row per
+    cell listing all its faculty; a faculty member one row per cell taught.
+    timings (Period, Start_Time, End_Time) supplies the clock times.
+    """
+    slots = slots.dropna(subset=["subject"])
+    slots = slots[slots["day"].isin(DAYS) & slots["period"].isin(PERIODS)]
+    slots = slots[~slots["subject"].astype(str).str.strip().str.lower().isin(FREE_SUBJECTS)].reset_index(drop=True)
+    keys = ["year_key", "section_key", "subject_key"]
+    slots = slots.assign(
+        cell=slots.index,
+        slot=slots["day"].map({day: i for i, day in enumerate(DAYS)}) * len(PERIODS)
+        + slots["period"].map({period: i for i, period in enumerate(PERIODS)}),
+        year_key=slots["year"].map(match_key),
+        section_key=slots["section"].map(match_key),
+        subject_key=slots["subject"].map(match_key),
+    )
+    if timings is not None:
+        times = timings.rename(columns={"Period": "period", "Start_Time": "start_time", "End_Time": "end_time"})
+        slots = slots.merge(times.drop_duplicates(subset="period"), on="period", how="left")
+    else:
+        slots = slots.assign(start_time=None, end_time=None)
+
+    taught = slots.iloc[0:0].assign(faculty=None)
+    if faculty is not None:
+        faculty = faculty.dropna(subset=["Name", "section"])
+        faculty = faculty[~faculty["Name"].map(match_key).isin(PLACEHOLDER_NAMES)]
+        faculty = pd.DataFrame({
+            "year_key": faculty["YEAR"].map(match_key),
+            "section_key": faculty["section"].map(match_key),
+            "subject_key": faculty["Subject"].map(match_key),
+            "faculty": faculty["Name"].map(lambda name: " ".join(str(name).split())),
+        }).drop_duplicates()
+        taught = slots.merge(faculty, on=keys)
+
+    # Plain dict rather than a groupby join: one small group per cell makes that slow
+    names = {}
+    for cell, name in zip(taught["cell"], taught["faculty"]):
+        names.setdefault(cell, []).append(name)
+    sections = slots.assign(
+        kind="section",
+        owner=[section_owner(*values) for values in zip(slots["branch"], slots["year"], slots["section"])],
+        faculty=slots["cell"].map({cell: ", ".join(sorted(group)) for cell, group in names.items()}),
+    )
+    teachers = taught.assign(kind="faculty", owner=taught["faculty"].map(faculty_owner))
+    rows = pd.concat([sections, teachers], ignore_index=True)
+    return rows.sort_values(["kind", "owner", "slot", "section"], ignore_index=True)[PERSONAL_TIMETABLE_COLUMNS]
+
+def has_table(db_path, table):
+    """True when the database file exists and holds the table (or view)."""
+    if not db_path or not os.path.exists(db_path):
+        return False
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (table,)).fetchone() is not None
+    finally:
+        conn.close()
+
+def _read_if_present(db_path, table, query):
+    # None when the database or the table is missing (e.g. CHEM has no faculty database)
+    if not has_table(db_path, table):
+        return None
+    conn = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql_query(query, conn)
+    finally:
+        conn.close()
+
+def write_personal_timetable(branch, config, database_dir=DATABASE_DIR):
+    """Rebuild personal_timetable in a branch timetable database; returns the number of rows (None without slots)."""
+    paths = {
+        key: os.path.join(database_dir, branch, db_file)
+        for key, db_file in config["databases"].items()
+        if db_file
+    }
+    slots = _read_if_present(paths.get("timetable_db"), "slots", "SELECT * FROM slots")
+    if slots is None:
+        return None
+    faculty = _read_if_present(
+        paths.get("faculty_db"), "faculty_by_section", "SELECT section, YEAR, Subject, Name FROM faculty_by_section"
+    )
+    timings = _read_if_present(paths.get("timings_db"), "timings", "SELECT Period, Start_Time, End_Time FROM timings")
+    rows = personal_timetable_rows(slots, faculty, timings)
+
+    conn = sqlite3.connect(paths["timetable_db"])
+    with conn:
+        conn.execute("BEGIN")
+        conn.execute("DROP TABLE IF EXISTS personal_timetable")
+        for statement in PERSONAL_TIMETABLE_SCHEMA:
+            conn.execute(statement)
+        conn.executemany(
+            f"INSERT INTO personal_timetable VALUES ({', '.join('?' * len(PERSONAL_TIMETABLE_COLUMNS))})",
+            sql_rows(rows),
+        )
+    conn.close()
+    print(f"Wrote {len(rows)} personal timetable rows for {branch} to {paths['timetable_db']}")
+    return len(rows)
+
+def write_personal_timetables(branch_config=BRANCH_CONFIG, rebuild=True):
+    """
+    Rebuild personal_timetable for every branch, or with rebuild=False only
+    where an earlier ingest left it out. It joins three databases of the
+    branch, so it runs after all of them are ingested. True if any was written.
+    """
+    written = False
+    for branch, config in branch_config.items():
+        db_file = config["databases"].get("timetable_db")
+        db_path = os.path.join(DATABASE_DIR, branch, db_file) if db_file else None
+        if not rebuild and has_table(db_path, "personal_timetable"):
+            continue
+        written |= write_personal_timetable(branch, config) is not None
+    return written
+
+def slot_bit(day, period):
+    """Bit of a (day, period) slot in a room_occupancy bitmap."""
+    return 1 << (DAYS.index(day) * len(PERIODS) + PERIODS.index(period))
+
+def room_occupancy(slots):
+    """Collapse slot rows into one (branch, room) row with its block, capacity (largest STRENGTH) and bitmap."""
+    slots = slots.dropna(subset=["room"])
+    slots = slots[slots["day"].isin(DAYS) & slots["period"].isin(PERIODS)]
+    busy = slots[~slots["subject"].astype(str).str.strip().str.lower().isin(FREE_SUBJECTS)]
+    busy = busy.drop_duplicates(subset=["branch", "room", "day", "period"])
+    # Slots are distinct per room, so summing their bits ORs them
+    index = (
+        busy["day"].map({day: i for i, day in enumerate(DAYS)}) * len(PERIODS)
+        + busy["period"].map({period: i for i, period in enumerate(PERIODS)})
+    )
+    bits = 2 ** index.astype("int64")
+    occupancy = busy.assign(bit=bits).groupby(["branch", "room"])["bit"].sum()
+    rooms = slots.groupby(["branch", "room"]).agg(block=("block", "first"), capacity=("strength", "max"))
+    rooms["occupancy"] = occupancy.reindex(rooms.index, fill_value=0).astype("int64")
+    return rooms.reset_index()[ROOM_OCCUPANCY_COLUMNS]
+
+def write_room_occupancy(conn):
+    """Rebuild room_occupancy from the slots table, inside the caller's transaction."""
+    slots = pd.read_sql_query("SELECT * FROM slots", conn)
+    conn.execute("DROP TABLE IF EXISTS room_occupancy")
+    for statement in ROOM_OCCUPANCY_SCHEMA:
+        conn.execute(statement)
+    rooms = room_occupancy(slots)
+    conn.executemany(
+        f"INSERT INTO room_occupancy VALUES ({', '.join('?' * len(ROOM_OCCUPANCY_COLUMNS))})", sql_rows(rooms)
+    )
+    return len(rooms)
+
+def timetable_to_slots(df, branch):
+    """Melt a wide DAY_Pn timetable into one row per (section, day, period) with a subject."""
+    # Some sheets carry stray whitespace in headers, e.g. "  FRIDAY_P1"
+    df = df.rename(columns=lambda col: str(col).strip())
+    slot_columns = [f"{day}_{period}" for day in DAYS for period in PERIODS if f"{day}_{period}" in df.columns]
+    slots = df.melt(
+        id_vars=["BLOCK", "YEAR", "SECTION", "ROOM", "STRENGTH"],
+        value_vars=slot_columns,
+        var_name="slot",
+        value_name="subject",
+    ).dropna(subset=["subject"])
+    slots[["day", "period"]] = slots["slot"].str.split("_", n=1, expand=True)
+    slots.insert(0, "branch", branch)
+    slots = slots.rename(columns=str.lower)
+    return slots[SLOT_COLUMNS]
+
+def sql_rows(df):
+    """Yield DataFrame rows as plain tuples with NaN mapped to NULL."""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+def write_slots(db_file, branch):
+    """Rebuild the long-format slots table from the wide timetable table of a branch database."""
+    conn = sqlite3.connect(db_file)
+    slots = timetable_to_slots(pd.read_sql_query("SELECT * FROM timetable", conn), branch)
+    with conn:
+        conn.execute("BEGIN")
+        conn.execute("DROP TABLE IF EXISTS slots")
+        for statement in SLOTS_SCHEMA:
+            conn.execute(statement)
+        conn.executemany(f"INSERT INTO slots VALUES ({', '.join('?' * len(SLOT_COLUMNS))})", sql_rows(slots))
+        rooms = write_room_occupancy(conn)
+    conn.close()
+    print(f"Wrote {len(slots)} slots and {rooms} room bitmaps for {branch} to {db_file}")
+
+def bump_db_version(version_file=DB_VERSION_FILE):
+    """Record that the databases changed: write a new version stamp (atomically) and return it."""
+    version = str(time.time_ns())
+    tmp_file = f"{version_file}.tmp"
+    with open(tmp_file, "w") as f:
+        f.write(version)
+    os.replace(tmp_file, version_file)
+    return version
+
+def read_db_version(version_file=DB_VERSION_FILE):
+    """The current version stamp, or None before the first versioned ingest."""
+    try:
+        with open(version_file) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def branch_jobs(branch, config):
+    """Yield (excel path, db path, table name, branch) for every workbook of a branch."""
+    excel_dir = os.path.join(MODIFIED_DATA_DIR, branch)
+    db_dir = os.path.join(DATABASE_DIR, branch)
+
+    # Create the branch database directory if it doesn't exist
+    os.makedirs(db_dir, exist_ok=True)
+
+    for db_key, db_file in config["databases"].items():
+        if db_file is None:
+            continue  # Skip if no database is specified
+
+        table_name = db_key.split("_")[0]  # e.g., 'timetable' from 'timetable_db'
+        excel_file = config["excel_files"].get(table_name)
+
+        if excel_file:
+            yield os.path.join(excel_dir, excel_file), os.path.join(db_dir, db_file), table_name, branch
+
+def process_branch(branch, config, full=False, report=None, engine=None):
+    """Process a branch by converting its Excel files into SQLite databases. Returns True if anything changed."""
+    changed = False
+    for excel_path, db_path, table_name, _ in branch_jobs(branch, config):
+        changed |= excel_to_sqlite(
+            excel_path, db_path, table_name, branch=branch, full=full, report=report, engine=engine
+        )
+    return changed
+
+def process_parallel(branch_config, jobs, full=False, report=None, engine=None):
+    """
+    Ingest every branch with workbook parsing fanned out to a process pool.
+
+    Hashing and pd.read_excel run in the workers; the SQLite writes happen
+    here, one at a time, as parsed workbooks come back.
+    """
+    changed = False
+    pending = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for branch, config in branch_config.items():
+            for excel_path, db_path, table_name, _ in branch_jobs(branch, config):
+                if not os.path.exists(excel_path):
+                    print(f"File not found: {excel_path}")
+                    continue
+                stale, known_digest = needs_ingest(excel_path, db_path, table_name, full)
+                if not stale:
+                    print(f"Unchanged: {excel_path}")
+                    if report is not None:
+                        report.append((excel_path, "unchanged", 0.0, 0.0))
+                    changed |= backfill_faculty_sections(db_path, table_name)
+                    continue
+                future = executor.submit(read_source, excel_path, known_digest, engine)
+                pending[future] = (excel_path, db_path, table_name, branch)
+
+        for future in as_completed(pending):
+            excel_path, db_path, table_name, branch = pending[future]
+            digest, df, parse_seconds = future.result()
+            start = time.perf_counter()
+            status = write_source(excel_path, db_path, table_name, digest, df, branch, full)
+            changed |= status != "unchanged"
+            if report is not None:
+                report.append((excel_path, status, parse_seconds, time.perf_counter() - start))
+    return changed
+
+def print_report(report, elapsed):
+    """Per-workbook timing table printed at the end of an ingest run."""
+    width = max([len(row[0]) for row in report] + [8]) + 2
+    print(f"\n{'workbook':<{width}}{'status':>10}{'parse s':>10}{'write s':>10}")
+    for excel_file, status, parse_seconds, write_seconds in sorted(report):
+        print(f"{excel_file:<{width}}{status:>10}{parse_seconds:>10.3f}{write_seconds:>10.3f}")
+    print(f"Total wall time: {elapsed:.3f}s")
+
+# Covering indexes of the campus database: room, section and faculty lookups never touch the base rows
+CAMPUS_INDEXES = {
+    "slots": [
+        "CREATE INDEX idx_campus_slots_room ON slots (room, day, period, branch, block, year, section, subject)",
+        "CREATE INDEX idx_campus_slots_section ON slots (branch, block, year, section, day, period, subject, room, strength)",
+        "CREATE INDEX idx_campus_slots_subject ON slots (subject, day, period, branch, section, room)",
+    ],
+    "timetable": ["CREATE INDEX idx_campus_timetable_section ON timetable (branch, BLOCK, YEAR, SECTION)"],
+    "faculty": [
+        "CREATE INDEX idx_campus_faculty_section ON faculty (branch, YEAR, sections, Subject, Name)",
+        "CREATE INDEX idx_campus_faculty_name ON faculty (Name, branch, YEAR, sections, Subject)",
+    ],
+    "timings": ["CREATE INDEX idx_campus_timings ON timings (branch, Period, Start_Time, End_Time)"],
+    "room_occupancy": ["CREATE INDEX idx_campus_room_occupancy ON room_occupancy (block, capacity, room, occupancy)"],
+    "personal_timetable": ["CREATE INDEX idx_campus_personal_timetable ON personal_timetable (kind, owner, slot)"],
+}
+
+# Tables that carry their own branch column in the branch databases too
+BRANCH_KEYED_TABLES = {"slots", "room_occupancy", "personal_timetable"}
+
+def branch_tables(branch, config):
+    """Map each table of a branch (timetable, faculty, timings and the tables derived from them) to the database file holding it."""
+    tables = {}
+    for db_key, db_file in config["databases"].items():
+        db_path = os.path.join(DATABASE_DIR, branch, db_file) if db_file else None
+        if db_path and os.path.exists(db_path):
+            table_name = db_key.split("_")[0]
+            tables[table_name] = db_path
+            if table_name == "timetable":
+                tables["slots"] = db_path
+                tables["room_occupancy"] = db_path
+                tables["personal_timetable"] = db_path
+    return tables
+
+def consolidate_campus(branch_config=BRANCH_CONFIG, campus_db=CAMPUS_DB):
+    """
+    Merge every branch database into one campus database.
+
+    Each table gains a branch column referencing a branches table, and a
+    view named after the legacy file (cse_timetable, cse_faculty, ...)
+    exposes the old per-branch schema on top of it.
+    """
+    tmp_db = campus_db + ".tmp"
+    if os.path.exists(tmp_db):
+        os.remove(tmp_db)
+
+    conn = sqlite3.connect(tmp_db)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("CREATE TABLE branches (branch TEXT PRIMARY KEY)")
+    conn.executemany("INSERT INTO branches VALUES (?)", [(branch,) for branch in branch_config])
+    conn.commit()
+    columns = {}  # table -> [(column, type)] in the campus schema
+    views = []
+
+    for branch, config in branch_config.items():
+        for table, db_path in branch_tables(branch, config).items():
+            conn.execute("ATTACH DATABASE ? AS src", (db_path,))
+            source = [(row[1], row[2]) for row in conn.execute(f"PRAGMA src.table_info({table})")]
+            # Strip header whitespace ("  FRIDAY_P1") and drop the branch column slots/room_occupancy already carry
+            source = [(name, name.strip(), col_type) for name, col_type in source if name != "branch"]
+            if table not in columns:
+                columns[table] = [(clean, col_type) for _, clean, col_type in source]
+                column_defs = ", ".join(f'"{clean}" {col_type}' for clean, col_type in columns[table])
+                conn.execute(
+                    f"CREATE TABLE {table} (branch TEXT NOT NULL REFERENCES branches (branch), {column_defs})"
+                )
+            target = ", ".join(f'"{clean}"' for _, clean, _ in source)
+            selected = ", ".join(f'"{name}"' for name, _, _ in source)
+            conn.execute(f"INSERT INTO {table} (branch, {target}) SELECT ?, {selected} FROM src.{table}", (branch,))
+            conn.commit()
+            conn.execute("DETACH DATABASE src")
+
+            # slots, room_occupancy and personal_timetable keep their branch column so queries written against them run unchanged on the view
+            view_columns = "*" if table in BRANCH_KEYED_TABLES else ", ".join(f'"{clean}"' for clean, _ in columns[table])
+            views.append(
+                f"CREATE VIEW {branch.lower()}_{table} AS SELECT {view_columns} FROM {table} WHERE branch = '{branch}'"
+            )
+            if table == "faculty":
+                faculty_columns = ", ".join(f'f."{clean}"' for clean, _ in columns[table])
+                views.append(
+                    f"CREATE VIEW {branch.lower()}_faculty_by_section AS SELECT s.section, {faculty_columns} "
+                    f"FROM faculty_sections AS s JOIN faculty AS f ON f.rowid = s.faculty_id WHERE f.branch = '{branch}'"
+                )
+
+    for table in columns:
+        for statement in CAMPUS_INDEXES[table]:
+            conn.execute(statement)
+    if "faculty" in columns:
+        # Rebuilt rather than copied: faculty_id points at the campus faculty rowids
+        write_faculty_sections(conn)
+    for statement in views:
+        conn.execute(statement)
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+    os.replace(tmp_db, campus_db)
+    print(f"Campus database written to {campus_db}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the branch Excel files into SQLite databases.")
+    parser.add_argument(
+        "--consolidated",
+        action="store_true",
+        help=f"also merge all branches into a single campus database ({CAMPUS_DB})",
+    )
+    parser.add_argument(
+        "--drop-consolidated",
+        action="store_true",
+        help=f"remove {CAMPUS_DB} so the viewers read the branch databases (ignored with --consolidated)",
+    )
+    parser.add_argument("--full", action="store_true", help="rebuild every table, ignoring the ingest manifest")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="parse workbooks in N worker processes (SQLite writes stay serialized)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["auto"] + ENGINES,
+        default=None,
+        help="Excel reader backend (default: $EXCEL_ENGINE or auto, fastest available)",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = []
+    if args.jobs > 1:
+        changed = process_parallel(BRANCH_CONFIG, args.jobs, full=args.full, report=report, engine=args.engine)
+    else:
+        # Process each branch
+        changed = False
+        for branch, config in BRANCH_CONFIG.items():
+            changed |= process_branch(branch, config, full=args.full, report=report, engine=args.engine)
+
+    # personal_timetable joins the timetable, faculty and timings databases of a branch, so it is
+    # rebuilt once they are all ingested (and built where an older ingest left it out)
+    changed |= write_personal_timetables(BRANCH_CONFIG, rebuild=changed or args.full)
+
+    if args.consolidated:
+        if changed or args.full or not os.path.exists(CAMPUS_DB):
+            consolidate_campus()
+            changed = True
+    elif os.path.exists(CAMPUS_DB):
+        # The viewers prefer the campus database; only drop it when asked, otherwise say it is behind
+        if args.drop_consolidated:
+            os.remove(CAMPUS_DB)
+            print(f"Removed {CAMPUS_DB}; the viewers now read the branch databases")
+            changed = True
+        elif changed:
+            print(f"Warning: {CAMPUS_DB} is now stale; rerun with --consolidated to rebuild it "
+                  "or --drop-consolidated to remove it")
+
+    if changed or args.full:
+        print(f"Database version is now {bump_db_version()}")
+
+    print_report(report, time.perf_counter() - start)
+    print("All branches processed successfully!")
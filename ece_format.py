@@ -1,5 +1,7 @@
 import pandas as pd
 
+from excel_reader import read_excel
+
 def uppercase_first_column(filepath):
     """
     Reads a Excel file, converts the first column to uppercase, and saves the modified file.
@@ -8,7 +10,7 @@ def uppercase_first_column(filepath):
         filepath: Path to the Excel file.
     """
     try:
-        df = pd.read_excel(filepath)  # Read the CSV file into a pandas DataFrame
+        df = read_excel(filepath)  # Read the CSV file into a pandas DataFrame
 
         #Check if the DataFrame is empty
         if df.empty:
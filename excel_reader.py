@@ -0,0 +1,145 @@
+import importlib.util
+import os
+
+import pandas as pd
+
+# Engines tried by read_excel(engine="auto"), fastest first:
+#   calamine        - Rust reader behind pandas' engine="calamine" (needs python-calamine, pandas >= 2.2)
+#   openpyxl_stream - openpyxl in read_only mode, rows streamed straight into a DataFrame (.xlsx only)
+#   pandas          - plain pd.read_excel with pandas' default engine for the file type
+ENGINES = ["calamine", "openpyxl_stream", "pandas"]
+
+# Default engine, overridable per process (e.g. EXCEL_ENGINE=pandas to rule the fast paths out)
+DEFAULT_ENGINE = os.getenv("EXCEL_ENGINE", "auto")
+
+STREAMABLE_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+def available_engines():
+    """Engines whose dependencies are importable in this environment."""
+    engines = []
+    if importlib.util.find_spec("python_calamine") is not None:
+        engines.append("calamine")
+    if importlib.util.find_spec("openpyxl") is not None:
+        engines.append("openpyxl_stream")
+    engines.append("pandas")
+    return engines
+
+
+def _unique_headers(header):
+    """Name header cells the way pd.read_excel does: blanks become 'Unnamed: i', repeats get '.n' suffixes."""
+    names, seen = [], {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _cell(value):
+    # pandas' openpyxl reader turns integral floats (3.0) into ints; match it
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def rows_to_frame(rows):
+    """
+    Build a DataFrame from worksheet value rows (first row = header) the way pd.read_excel would.
+
+    Interior blank rows are kept and trailing ones dropped; sheets often
+    declare a dimension of a million rows, so blank runs are counted rather
+    than stored.
+    """
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+
+    body, blank_run = [], 0
+    for row in rows:
+        if row.count(None) == len(row):
+            blank_run += 1
+            continue
+        body.extend([()] * blank_run)
+        blank_run = 0
+        body.append(row)
+
+    # Trim trailing columns blank in the header and every row
+    width = max([len(header)] + [len(row) for row in body])
+    header = tuple(header) + (None,) * (width - len(header))
+    body = [tuple(_cell(value) for value in row) + (None,) * (width - len(row)) for row in body]
+    while width and header[width - 1] is None and all(row[width - 1] is None for row in body):
+        width -= 1
+    df = pd.DataFrame([row[:width] for row in body], columns=_unique_headers(header[:width]))
+    return df.infer_objects()
+
+
+def _stream_sheet(worksheet):
+    return rows_to_frame(worksheet.iter_rows(values_only=True))
+
+
+def _read_openpyxl_stream(path, sheet_name):
+    if not str(path).lower().endswith(STREAMABLE_EXTENSIONS):
+        raise ValueError(f"openpyxl_stream only reads {', '.join(STREAMABLE_EXTENSIONS)} files")
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet_name is None:
+            return {ws.title: _stream_sheet(ws) for ws in workbook.worksheets}
+        worksheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        return _stream_sheet(worksheet)
+    finally:
+        workbook.close()
+
+
+def _read_calamine(path, sheet_name):
+    return pd.read_excel(path, sheet_name=sheet_name, engine="calamine")
+
+
+def _read_pandas(path, sheet_name):
+    return pd.read_excel(path, sheet_name=sheet_name)
+
+
+READERS = {
+    "calamine": _read_calamine,
+    "openpyxl_stream": _read_openpyxl_stream,
+    "pandas": _read_pandas,
+}
+
+
+def read_excel(path, engine=None, sheet_name=0):
+    """
+    Read a workbook sheet into a DataFrame (sheet_name=None for a dict of all sheets).
+
+    engine="auto" tries the available engines fastest first; a named engine
+    is tried on its own. Either way, plain pd.read_excel is the last resort
+    when an engine is missing or cannot read the file.
+    """
+    engine = engine or DEFAULT_ENGINE
+    if engine == "auto":
+        candidates = available_engines()
+    elif engine in READERS:
+        candidates = [engine] if engine == "pandas" else [engine, "pandas"]
+    else:
+        raise ValueError(f"Unknown Excel engine {engine!r}; expected 'auto' or one of {ENGINES}")
+
+    for name in candidates[:-1]:
+        try:
+            return READERS[name](path, sheet_name)
+        except (ImportError, ValueError, OSError, KeyError, IndexError) as e:
+            # FileNotFoundError is an OSError, but falling back cannot help with it
+            if isinstance(e, FileNotFoundError):
+                raise
+            continue
+    return READERS[candidates[-1]](path, sheet_name)
+
+
+def read_excel_sheets(path, engine=None):
+    """Read every sheet of a workbook into a {sheet name: DataFrame} dict."""
+    return read_excel(path, engine=engine, sheet_name=None)
@@ -0,0 +1,208 @@
+"""
+Faculty clash, load and streak report over the faculty and timetable databases.
+
+Every faculty row (YEAR, Subject, Name, comma-separated sections) is
+expanded to one row per section and joined against every period cell of
+the timetable (the slots table), so each faculty member gets the list of
+(day, period) slots they teach. From that:
+
+  clashes - a faculty member in two different rooms (or sections, when the
+            room is unknown) in the same day and period
+  load    - periods taught per week, days taught, sections and subjects
+  streaks - back-to-back periods on one day, longest first
+
+Run from the repository root:
+    python faculty_analysis.py [--streak 3] [--out reports/]
+"""
+import argparse
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from data_access import read_only_uri
+from database import BRANCH_CONFIG, CAMPUS_DB, DATABASE_DIR, FREE_SUBJECTS, PERIODS, PLACEHOLDER_NAMES, match_key
+
+STREAK_THRESHOLD = 3
+
+
+def _read(db_path, query):
+    conn = sqlite3.connect(read_only_uri(db_path), uri=True)
+    try:
+        return pd.read_sql_query(query, conn)
+    finally:
+        conn.close()
+
+
+def load_tables(branch_config=BRANCH_CONFIG, database_dir=DATABASE_DIR):
+    """(faculty, slots) for every branch, from the campus database when it exists."""
+    if os.path.exists(CAMPUS_DB):
+        faculty = _read(CAMPUS_DB, "SELECT branch, YEAR, Subject, Name, sections FROM faculty")
+        slots = _read(CAMPUS_DB, "SELECT branch, year, section, room, day, period, subject FROM slots")
+        return faculty, slots
+
+    faculty, slots = [], []
+    for branch, config in branch_config.items():
+        databases = config["databases"]
+        if databases.get("faculty_db"):
+            path = os.path.join(database_dir, branch, databases["faculty_db"])
+            if os.path.exists(path):
+                faculty.append(_read(path, "SELECT YEAR, Subject, Name, sections FROM faculty").assign(branch=branch))
+        if databases.get("timetable_db"):
+            path = os.path.join(database_dir, branch, databases["timetable_db"])
+            if os.path.exists(path):
+                slots.append(_read(path, "SELECT branch, year, section, room, day, period, subject FROM slots"))
+    return pd.concat(faculty, ignore_index=True), pd.concat(slots, ignore_index=True)
+
+
+def _per_distinct(values, transform):
+    # Columns repeat a few distinct values many times: transform those once and map back
+    codes, uniques = pd.factorize(values.astype(str))
+    mapped = [transform(value) for value in uniques]
+    return pd.Series([mapped[code] for code in codes], index=values.index, dtype=object)
+
+
+def _key(values):
+    # database.match_key over a column: "P & S" and "P&S" are one subject, "MR.B.PRASAD" and "Mr. B. Prasad" one person
+    return _per_distinct(values, match_key)
+
+
+def display_names(names):
+    """
+    One spelling per faculty member, aligned to names: of the names sharing
+    a match_key (database.faculty_owner), the most common one with its
+    spacing collapsed, ties going to the first in sort order.
+    """
+    codes, uniques = pd.factorize(names.astype(str))
+    counts = {}  # (key, spelling) -> rows
+    for value, rows in zip(uniques, np.bincount(codes, minlength=len(uniques))):
+        spelling = (match_key(value), " ".join(value.split()))
+        counts[spelling] = counts.get(spelling, 0) + rows
+    chosen = {}
+    for (key, name), rows in sorted(counts.items(), key=lambda item: (-item[1], item[0][1])):
+        chosen.setdefault(key, name)
+    mapped = [chosen[match_key(value)] for value in uniques]
+    return pd.Series([mapped[code] for code in codes], index=names.index, dtype=object)
+
+
+def expand_sections(faculty):
+    """One row per (faculty, section): 'CSE-01, CSE-02' becomes two rows."""
+    faculty = faculty.dropna(subset=["Name", "sections"])
+    faculty = faculty.assign(section=_per_distinct(faculty["sections"], lambda value: value.replace(" ", "").split(",")))
+    faculty = faculty.explode("section")
+    return faculty[faculty["section"] != ""]
+
+
+def faculty_slots(faculty, slots):
+    """
+    Join expanded faculty rows to every timetable cell they teach: one row
+    per (faculty, section, day, period), faculty being display_names(Name).
+    """
+    faculty = expand_sections(faculty)
+    faculty = faculty[~_key(faculty["Name"]).isin(PLACEHOLDER_NAMES)]
+    faculty = faculty.assign(
+        # Grouping on the display name is grouping on the key: there is exactly one per key
+        faculty=display_names(faculty["Name"]),
+        year_key=_key(faculty["YEAR"]),
+        section_key=_key(faculty["section"]),
+        subject_key=_key(faculty["Subject"]),
+    )
+    slots = slots.dropna(subset=["subject"])
+    slots = slots[~slots["subject"].astype(str).str.strip().str.lower().isin(FREE_SUBJECTS)]
+    slots = slots.assign(
+        year_key=_key(slots["year"]), section_key=_key(slots["section"]), subject_key=_key(slots["subject"])
+    )
+    taught = faculty[["branch", "faculty", "year_key", "section_key", "subject_key", "Subject"]].merge(
+        slots[["branch", "year_key", "section_key", "subject_key", "section", "room", "day", "period"]],
+        on=["branch", "year_key", "section_key", "subject_key"],
+    )
+    taught["period_index"] = taught["period"].map({period: i for i, period in enumerate(PERIODS)})
+    return taught[["faculty", "branch", "section", "Subject", "room", "day", "period", "period_index"]]
+
+
+def find_clashes(taught):
+    """Slots where one faculty member is due in more than one place."""
+    keys = ["faculty", "day", "period"]
+    place = taught["room"].astype(object).where(taught["room"].notna(), taught["branch"] + "/" + taught["section"])
+    taught = taught.assign(place=place, Subject=taught["Subject"].astype(str))
+    places = taught.groupby(keys)["place"].transform("nunique")
+    clashes = taught[places > 1]
+    clashes = clashes.assign(clash=clashes.groupby(keys, sort=True).ngroup())
+    report = clashes.drop_duplicates(subset="clash").sort_values("clash")[keys].reset_index(drop=True)
+    if report.empty:
+        return report.assign(places=[], sections=[], subjects=[])
+
+    for column, label in [("place", "places"), ("section", "sections"), ("Subject", "subjects")]:
+        # Distinct values per clash, joined in one pass over the sorted rows
+        # (a per-group pandas agg is far slower for this many small groups)
+        distinct = clashes.drop_duplicates(subset=["clash", column]).sort_values(["clash", column])
+        ids = distinct["clash"].to_numpy()
+        values = distinct[column].to_numpy(dtype=object)
+        bounds = np.flatnonzero(np.diff(ids)) + 1
+        report[label] = [", ".join(group) for group in np.split(values, bounds)]
+    return report
+
+
+def faculty_load(taught):
+    """Weekly load per faculty member, heaviest first."""
+    slots = taught.drop_duplicates(subset=["faculty", "day", "period"])
+    load = slots.groupby("faculty").agg(periods_per_week=("period", "size"), days=("day", "nunique"))
+    load["sections"] = taught.groupby("faculty")["section"].nunique()
+    load["subjects"] = taught.groupby("faculty")["Subject"].nunique()
+    load["max_per_day"] = slots.groupby(["faculty", "day"]).size().groupby("faculty").max()
+    return load.reset_index().sort_values(["periods_per_week", "faculty"], ascending=[False, True], ignore_index=True)
+
+
+def find_streaks(taught, threshold=STREAK_THRESHOLD):
+    """Runs of at least `threshold` back-to-back periods on one day, longest first."""
+    slots = (
+        taught.dropna(subset=["period_index"])
+        .drop_duplicates(subset=["faculty", "day", "period_index"])
+        .sort_values(["faculty", "day", "period_index"])
+    )
+    # A new run starts whenever the faculty/day changes or the period is not the previous one + 1
+    new_run = (
+        (slots["faculty"] != slots["faculty"].shift())
+        | (slots["day"] != slots["day"].shift())
+        | (slots["period_index"] != slots["period_index"].shift() + 1)
+    )
+    slots = slots.assign(run=new_run.cumsum())
+    runs = slots.groupby("run").agg(
+        faculty=("faculty", "first"),
+        day=("day", "first"),
+        first_period=("period", "first"),
+        last_period=("period", "last"),
+        length=("period", "size"),
+    )
+    runs = runs[runs["length"] >= threshold]
+    return runs.sort_values(["length", "faculty", "day"], ascending=[False, True, True], ignore_index=True)
+
+
+def analyse(faculty, slots, streak_threshold=STREAK_THRESHOLD):
+    """Run the whole report: {"clashes": df, "load": df, "streaks": df}."""
+    taught = faculty_slots(faculty, slots)
+    return {
+        "clashes": find_clashes(taught),
+        "load": faculty_load(taught),
+        "streaks": find_streaks(taught, streak_threshold),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streak", type=int, default=STREAK_THRESHOLD, help="shortest back-to-back run to report")
+    parser.add_argument("--out", metavar="DIR", help="also write clashes.csv, load.csv and streaks.csv here")
+    args = parser.parse_args()
+
+    report = analyse(*load_tables(), streak_threshold=args.streak)
+    for name, df in report.items():
+        print(f"\n{name} ({len(df)} rows)")
+        print(df.head(15).to_string(index=False) if not df.empty else "none")
+        if args.out:
+            os.makedirs(args.out, exist_ok=True)
+            df.to_csv(os.path.join(args.out, f"{name}.csv"), index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Local stand-in for the model API, for exercising llm_client under injected
+latency and errors without an API key.
+
+Speaks the protocol llm_client.HTTPBackend expects: POST a JSON
+{"prompt": ...}, get back one {"text": chunk} JSON object per line and a
+final {"done": true}.
+
+    python fake_llm_server.py --port 8765 --latency 0.5 --error-rate 0.2
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+
+
+def echo_responder(prompt):
+    """Default reply: the last line of the prompt, upper-cased."""
+    return prompt.strip().splitlines()[-1].upper() if prompt.strip() else ""
+
+
+class FakeLLMServer:
+    """
+    Tiny asyncio HTTP server streaming a responder's reply word by word.
+
+    latency     - seconds before the first chunk
+    chunk_delay - seconds between chunks
+    error_rate  - share of requests answered with 503
+    stall_rate  - share of requests that never answer (until the client gives up)
+    drop_rate   - share of requests whose connection is cut after the first chunk
+    """
+
+    def __init__(self, responder=echo_responder, latency=0.0, chunk_delay=0.0,
+                 error_rate=0.0, stall_rate=0.0, drop_rate=0.0, seed=None):
+        self.responder = responder
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+        self.stats = {"requests": 0, "errors": 0, "stalls": 0, "drops": 0, "active": 0, "max_active": 0}
+        self.port = None
+        self._server = None
+        self._loop = None
+
+    async def _handle(self, reader, writer):
+        self.stats["requests"] += 1
+        self.stats["active"] += 1
+        self.stats["max_active"] = max(self.stats["max_active"], self.stats["active"])
+        try:
+            await reader.readline()  # request line
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode().partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            prompt = json.loads(await reader.readexactly(length))["prompt"] if length else ""
+
+            roll = self.random.random()
+            if roll < self.error_rate:
+                self.stats["errors"] += 1
+                writer.write(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                return
+            if roll < self.error_rate + self.stall_rate:
+                self.stats["stalls"] += 1
+                await reader.read()  # until the client hangs up
+                return
+            drop = roll < self.error_rate + self.stall_rate + self.drop_rate
+
+            await asyncio.sleep(self.latency)
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nConnection: close\r\n\r\n")
+            words = self.responder(prompt).split(" ")
+            for i, word in enumerate(words):
+                if i:
+                    await asyncio.sleep(self.chunk_delay)
+                writer.write((json.dumps({"text": word if i == 0 else " " + word}) + "\n").encode())
+                await writer.drain()
+                if drop:
+                    self.stats["drops"] += 1
+                    writer.transport.abort()
+                    return
+            writer.write(b'{"done": true}\n')
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.stats["active"] -= 1
+            if not writer.is_closing():
+                writer.close()
+
+    async def serve(self, host="127.0.0.1", port=0):
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}/generate"
+
+    def start(self, host="127.0.0.1", port=0):
+        """Serve from a background thread; returns the URL."""
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.serve(host, port))
+            started.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=run, name="fake-llm-server", daemon=True).start()
+        started.wait()
+        return self.url
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--chunk-delay", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(
+        latency=args.latency, chunk_delay=args.chunk_delay, error_rate=args.error_rate,
+        stall_rate=args.stall_rate, drop_rate=args.drop_rate,
+    )
+
+    async def run():
+        await server.serve(port=args.port)
+        print(f"Fake LLM server on {server.url}")
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+
+DEFAULT_TIMEOUT = 30.0       # seconds for a whole call, retries included
+DEFAULT_RETRIES = 3          # extra attempts after the first
+DEFAULT_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+BACKOFF_BASE = 0.5           # first retry waits up to this long; doubles per attempt (full jitter)
+BACKOFF_CAP = 8.0
+
+
+class LLMError(Exception):
+    """The model could not produce an answer."""
+
+
+class LLMTimeoutError(LLMError):
+    """The call ran past its deadline."""
+
+
+class RetryableError(LLMError):
+    """A transient failure (rate limit, 5xx, dropped connection) worth another attempt."""
+
+
+class GeminiBackend:
+    """Streams text chunks from a google.generativeai model."""
+
+    def __init__(self, model_name="gemini-pro"):
+        import google.generativeai as genai
+
+        self.model = genai.GenerativeModel(model_name)
+
+    async def stream(self, prompt):
+        try:
+            response = await self.model.generate_content_async([prompt], stream=True)
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            # google.api_core marks rate limits and outages with these names; anything else is final
+            if type(e).__name__ in ("ResourceExhausted", "ServiceUnavailable", "InternalServerError", "DeadlineExceeded"):
+                raise RetryableError(str(e)) from e
+            raise LLMError(str(e)) from e
+
+
+class HTTPBackend:
+    """
+    Streams text chunks from a newline-delimited JSON endpoint, e.g. fake_llm_server.
+
+    POST {"prompt": ...}; the response body is one {"text": chunk} object per
+    line, then {"done": true}. 429 and 5xx responses and connections that end
+    before "done" are retryable.
+    """
+
+    def __init__(self, url):
+        self.url = urllib.parse.urlsplit(url)
+
+    async def stream(self, prompt):
+        body = json.dumps({"prompt": prompt}).encode()
+        try:
+            reader, writer = await asyncio.open_connection(self.url.hostname, self.url.port or 80)
+        except OSError as e:
+            raise RetryableError(f"connect failed: {e}") from e
+        try:
+            writer.write(
+                f"POST {self.url.path or '/'} HTTP/1.1\r\nHost: {self.url.netloc}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line:
+                raise RetryableError("connection closed before a response")
+            status = int(status_line.split()[1])
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # headers
+            if status == 429 or status >= 500:
+                raise RetryableError(f"HTTP {status}")
+            if status != 200:
+                raise LLMError(f"HTTP {status}: {(await reader.read()).decode(errors='replace')}")
+            async for line in reader:
+                if line.strip():
+                    message = json.loads(line)
+                    if message.get("done"):
+                        return
+                    yield message["text"]
+            raise RetryableError("connection closed mid-reply")
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            raise RetryableError(str(e)) from e
+        finally:
+            writer.close()
+
+
+class AsyncLLMClient:
+    """
+    Deadline-, retry- and concurrency-aware wrapper around a streaming backend.
+
+    Every call shares one event loop on a background thread, so the
+    semaphore caps concurrent model calls across all Streamlit sessions in
+    the process. A call retries RetryableError (and attempts that stall for
+    `stall_timeout` seconds) with full-jitter exponential backoff until its deadline. A stream() that has
+    already handed out chunks is not retried, since the text is already on
+    screen; generate() discards the partial reply and retries. Every failure,
+    whatever the backend raised, reaches the caller as LLMError.
+
+    generate() returns the full reply; stream() yields chunks as they arrive
+    (for st.write_stream). Both are synchronous; agenerate()/astream() are
+    the coroutine versions.
+    """
+
+    def __init__(self, backend, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 max_concurrency=DEFAULT_CONCURRENCY, stall_timeout=None,
+                 backoff_base=BACKOFF_BASE, backoff_cap=BACKOFF_CAP):
+        self.backend = backend
+        self.timeout = timeout
+        self.stall_timeout = stall_timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_concurrency = max_concurrency
+        self.stats = {"calls": 0, "attempts": 0, "retries": 0, "timeouts": 0, "failures": 0}
+        self._semaphore = None
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    async def _attempts(self, prompt, timeout, restartable):
+        """Yield (attempt number, chunk); a restartable call may retry after partial output."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        self.stats["calls"] += 1
+        attempt = 0
+        async with self._semaphore:
+            while True:
+                self.stats["attempts"] += 1
+                streamed = False
+                chunks = self.backend.stream(prompt).__aiter__()
+                try:
+                    while True:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise asyncio.TimeoutError
+                        # A stalled attempt is abandoned (and retried) before it eats the whole deadline
+                        wait = min(remaining, self.stall_timeout) if self.stall_timeout else remaining
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), wait)
+                        except StopAsyncIteration:
+                            return
+                        except asyncio.TimeoutError:
+                            if wait < remaining:
+                                raise RetryableError(f"no data for {wait:.1f}s")
+                            raise
+                        streamed = True
+                        yield attempt, chunk
+                except asyncio.TimeoutError as e:
+                    self.stats["timeouts"] += 1
+                    raise LLMTimeoutError(f"no complete answer within {timeout:.1f}s") from e
+                except RetryableError as e:
+                    backoff = self._backoff(attempt)
+                    if streamed and not restartable:
+                        self.stats["failures"] += 1
+                        raise LLMError(f"reply interrupted: {e}") from e
+                    if attempt >= self.retries:
+                        self.stats["failures"] += 1
+                        raise LLMError(f"gave up after {attempt + 1} attempts: {e}") from e
+                    if time.monotonic() + backoff >= deadline:
+                        self.stats["timeouts"] += 1
+                        raise LLMTimeoutError(f"no complete answer within {timeout:.1f}s") from e
+                    attempt += 1
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(backoff)
+                except LLMError:
+                    self.stats["failures"] += 1
+                    raise
+                except Exception as e:
+                    # Callers catch LLMError alone, so a backend bug or bad reply must not escape as anything else
+                    self.stats["failures"] += 1
+                    raise LLMError(f"{type(e).__name__}: {e}") from e
+                finally:
+                    await chunks.aclose()
+
+    async def astream(self, prompt, timeout=None):
+        """Yield reply chunks; raises LLMTimeoutError past the deadline, LLMError when retries run out."""
+        async for _, chunk in self._attempts(prompt, timeout, restartable=False):
+            yield chunk
+
+    async def agenerate(self, prompt, timeout=None):
+        """Return the whole reply; nothing has been shown yet, so a reply cut off midway is retried too."""
+        chunks, current = [], 0
+        async for attempt, chunk in self._attempts(prompt, timeout, restartable=True):
+            if attempt != current:
+                chunks, current = [], attempt
+            chunks.append(chunk)
+        return "".join(chunks)
+
+    def _event_loop(self):
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="llm-client", daemon=True).start()
+            return self._loop
+
+    def generate(self, prompt, timeout=None):
+        """Blocking call from a normal (Streamlit) thread."""
+        return asyncio.run_coroutine_threadsafe(self.agenerate(prompt, timeout), self._event_loop()).result()
+
+    def stream(self, prompt, timeout=None):
+        """Blocking generator of chunks from a normal thread; exceptions surface at the chunk that failed."""
+        loop = self._event_loop()
+        agen = self.astream(prompt, timeout)
+        try:
+            while True:
+                try:
+                    yield asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+                except StopAsyncIteration:
+                    return
+        finally:
+            # An abandoned stream must still release its semaphore slot
+            asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()
+
+    def close(self):
+        with self._loop_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
@@ -0,0 +1,54 @@
+import streamlit as st
+from campus_config import BRANCH_CONFIG, YEARS
+from personal_timetable import GRID_FIELDS, ICAL_WEEKS, next_monday, to_ical, week_grid
+from viewer_data import export_to_csv, get_personal_timetables
+
+# Streamlit App
+st.title("My Timetable")
+
+timetables = get_personal_timetables()
+
+# Sidebar: whose week
+st.sidebar.header("Whose Timetable")
+kind = st.sidebar.radio("Timetable of", ["faculty", "section"], format_func=str.title)
+if kind == "faculty":
+    names = timetables.faculty_names()
+    if not names:
+        st.warning("No personal timetables found. Run database.py to ingest the timetables first.")
+        st.stop()
+    owner = st.sidebar.selectbox("Faculty", names)
+    week = timetables.faculty_week(owner)
+else:
+    branch = st.sidebar.selectbox("Branch", list(BRANCH_CONFIG))
+    year = st.sidebar.selectbox("Year", YEARS)
+    section = st.sidebar.selectbox("Section", BRANCH_CONFIG[branch]["sections"])
+    owner = f"{branch} {year} {section}"
+    week = timetables.section_week(branch, year, section)
+
+if week.empty:
+    st.warning(f"No classes found for {owner}.")
+    st.stop()
+
+# The week at a glance, then every class with its timings
+st.write(f"### {owner}: {len(week)} classes a week")
+st.dataframe(week_grid(week, GRID_FIELDS[kind]).rename(index=str.title))
+st.dataframe(week, hide_index=True)
+
+# Calendar export: each class repeats weekly from the first teaching day
+st.sidebar.markdown("---")
+st.sidebar.subheader("Calendar Export")
+start = st.sidebar.date_input("Term starts", value=next_monday())
+weeks = st.sidebar.number_input("Weeks", min_value=1, max_value=52, value=ICAL_WEEKS)
+file_name = owner.lower().replace(" ", "_").replace(".", "")
+st.sidebar.download_button(
+    label="Download Calendar (.ics)",
+    data=to_ical(week, start, int(weeks), name=owner).encode("utf-8"),
+    file_name=f"{file_name}.ics",
+    mime="text/calendar",
+)
+st.download_button(
+    label="Download Timetable as CSV",
+    data=export_to_csv(week),
+    file_name=f"{file_name}.csv",
+    mime="text/csv",
+)
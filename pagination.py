@@ -0,0 +1,91 @@
+from collections import namedtuple
+
+import pandas as pd
+
+from data_access import ConnectionPool
+
+PAGE_SIZES = [25, 50, 100, 250, 500]
+DEFAULT_PAGE_SIZE = 50
+
+# One page of rows; after is the cursor to pass for the next page, has_more whether there is one
+Page = namedtuple("Page", "frame after has_more")
+
+
+def _quote(name):
+    return name if name == "rowid" else '"' + name.replace('"', '""') + '"'
+
+
+class KeysetPager:
+    """
+    Pages through a table in key order without OFFSET.
+
+    Each page is "WHERE (keys) > (last keys of the previous page) ORDER BY
+    keys LIMIT size + 1", so any page costs an index seek plus size rows
+    however deep into the table it is, and only that page is read into
+    memory. rowid is always the last key, which makes the order total; extra
+    key_columns (sorted first) should be NOT NULL and indexed together with
+    rowid to keep the seek cheap.
+    """
+
+    def __init__(self, db_path, table, key_columns=(), columns="*", where="", params=(), pool=None):
+        self.db_path = db_path
+        self.table = table
+        self.keys = [_quote(column) for column in key_columns] + ["rowid"]
+        self.columns = columns
+        self.where = where
+        self.params = tuple(params)
+        self.pool = pool or ConnectionPool()
+
+    def page(self, after=None, size=DEFAULT_PAGE_SIZE):
+        """The size rows following cursor after (None: the first page)."""
+        key_list = ", ".join(self.keys)
+        conditions, params = [], list(self.params)
+        if self.where:
+            conditions.append(f"({self.where})")
+        if after is not None:
+            conditions.append(f"({key_list}) > ({', '.join('?' * len(self.keys))})")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = (
+            f"SELECT {key_list}, {self.columns} FROM {_quote(self.table)} {where} "
+            f"ORDER BY {key_list} LIMIT ?"
+        )
+        with self.pool.connection(self.db_path) as conn:
+            cursor = conn.execute(query, params + [size + 1])
+            rows = cursor.fetchall()
+            names = [column[0] for column in cursor.description]
+
+        has_more = len(rows) > size
+        rows = rows[:size]
+        n_keys = len(self.keys)
+        frame = pd.DataFrame.from_records([row[n_keys:] for row in rows], columns=names[n_keys:])
+        return Page(frame, tuple(rows[-1][:n_keys]) if rows else after, has_more)
+
+    def estimate_rows(self):
+        """
+        Rough row count without a full COUNT(*): the rowid span, two index
+        lookups. Exact for a table that was only appended to, an upper bound
+        after deletes, and for the whole table even when where is set.
+        """
+        with self.pool.connection(self.db_path) as conn:
+            # Separate subqueries: min() and max() together in one SELECT would scan the table
+            low, high = conn.execute(
+                f"SELECT (SELECT min(rowid) FROM {_quote(self.table)}), (SELECT max(rowid) FROM {_quote(self.table)})"
+            ).fetchone()
+        return 0 if low is None else high - low + 1
+
+
+class FramePager:
+    """The KeysetPager interface over a result already in memory (the cursor is a row position)."""
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    def page(self, after=None, size=DEFAULT_PAGE_SIZE):
+        start = after or 0
+        end = start + size
+        return Page(self.frame.iloc[start:end], end, end < len(self.frame))
+
+    def estimate_rows(self):
+        return len(self.frame)
+
@@ -0,0 +1,203 @@
+"""
+"My week" for a faculty member or a section, read from the
+personal_timetable table that ingest builds (database.write_personal_timetables),
+and its iCalendar export.
+
+A week is one query on the (kind, owner) index: against the campus
+database when it exists, otherwise against each branch timetable database
+(only the section's own branch for a section week). Rows already carry the
+room, period timings and faculty, so nothing else is looked up.
+
+Run from the repository root:
+    python personal_timetable.py --faculty "Dr. D. V. Nagarjana Devi" [--ical week.ics] [--start 2026-07-06]
+    python personal_timetable.py --section CSE E3 CSE-02
+"""
+import argparse
+import datetime
+import hashlib
+import os
+
+import pandas as pd
+
+from data_access import ConnectionPool
+from database import BRANCH_CONFIG, CAMPUS_DB, DATABASE_DIR, DAYS, PERIODS, faculty_owner, section_owner
+
+WEEK_COLUMNS = [
+    "branch", "year", "section", "block", "room", "day", "period", "start_time", "end_time", "subject", "faculty",
+]
+
+# Grid cell contents of each kind of week: a faculty member needs the section, a section the faculty
+GRID_FIELDS = {"faculty": ("subject", "section", "room"), "section": ("subject", "room", "faculty")}
+
+# Teaching weeks a calendar export repeats each class for
+ICAL_WEEKS = 16
+
+# Clock formats found in the period timings sheets ("9:15 AM")
+CLOCK_FORMATS = ["%I:%M %p", "%H:%M", "%I:%M%p"]
+
+
+class PersonalTimetables:
+    """
+    Personal week lookups over personal_timetable.
+
+    reader is anything with read_sql(db_path, query, params): a
+    ConnectionPool (the default) or the viewers' QueryCache.
+    """
+
+    def __init__(self, reader=None):
+        self.reader = reader or ConnectionPool()
+
+    def _sources(self, branch=None):
+        if os.path.exists(CAMPUS_DB):
+            return [CAMPUS_DB]
+        paths = []
+        for name in [branch] if branch else BRANCH_CONFIG:
+            db_file = BRANCH_CONFIG[name]["databases"].get("timetable_db")
+            path = os.path.join(DATABASE_DIR, name, db_file) if db_file else None
+            if path and os.path.exists(path):
+                paths.append(path)
+        return paths
+
+    def week(self, kind, owner, branch=None):
+        """Every row of one owner ("faculty" or "section" kind), in day and period order."""
+        query = (
+            f"SELECT {', '.join(WEEK_COLUMNS)}, slot FROM personal_timetable "
+            "WHERE kind = ? AND owner = ? ORDER BY slot, section"
+        )
+        frames = [self.reader.read_sql(db_path, query, (kind, owner)) for db_path in self._sources(branch)]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=WEEK_COLUMNS)
+        week = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        return week.sort_values(["slot", "section"], ignore_index=True)[WEEK_COLUMNS]
+
+    def faculty_week(self, name):
+        """The classes a faculty member teaches, across branches; the name is matched ignoring case and spacing."""
+        return self.week("faculty", faculty_owner(name))
+
+    def section_week(self, branch, year, section):
+        """The classes of one section, with their faculty."""
+        return self.week("section", section_owner(branch, year, section), branch)
+
+    def faculty_names(self):
+        """Every faculty member with a personal timetable, for pickers."""
+        query = "SELECT DISTINCT faculty FROM personal_timetable WHERE kind = 'faculty'"
+        names = set()
+        for db_path in self._sources():
+            names.update(self.reader.read_sql(db_path, query)["faculty"].dropna())
+        return sorted(names)
+
+
+def week_grid(week, fields=("subject", "section", "room")):
+    """Days (rows) x periods (columns); each cell lists the given fields of the classes then."""
+    cells = week[list(fields)].astype(object)
+    cells = cells.where(cells.notna(), None)
+    labels = [", ".join(str(value) for value in values if value) for values in cells.itertuples(index=False, name=None)]
+    grid = week.assign(label=labels).groupby(["day", "period"])["label"].agg(" / ".join).unstack()
+    return grid.reindex(index=DAYS, columns=PERIODS).fillna("")
+
+
+def _clock(value):
+    for fmt in CLOCK_FORMATS:
+        try:
+            return datetime.datetime.strptime(str(value).strip(), fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def _escape(text):
+    # TEXT value escaping of RFC 5545 (3.3.11)
+    return str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _fold(line):
+    # Content lines longer than 75 octets continue on lines starting with a space (RFC 5545 3.1)
+    data = line.encode("utf-8")
+    parts = []
+    while len(data) > (75 if not parts else 74):
+        cut = 75 if not parts else 74
+        while data[cut] & 0xC0 == 0x80:  # never split a UTF-8 sequence
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+    parts.append(data.decode("utf-8"))
+    return "\r\n ".join(parts)
+
+
+def next_monday(today=None):
+    """The coming Monday (today when it is one): the default first week of an export."""
+    today = today or datetime.date.today()
+    return today + datetime.timedelta(days=-today.weekday() % 7)
+
+
+def to_ical(week, start=None, weeks=ICAL_WEEKS, name="Timetable"):
+    """
+    iCalendar text of a week: one event per class on the first matching
+    weekday on or after start (default next_monday()), repeating weekly for
+    weeks weeks. Times are local (floating). Classes without period timings
+    are left out.
+    """
+    start = start or next_monday()
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Timetable Management//Personal Timetable//EN",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ]
+    for row in week.itertuples(index=False):
+        begin, end = _clock(row.start_time), _clock(row.end_time)
+        if begin is None or end is None or row.day not in DAYS:
+            continue
+        date = start + datetime.timedelta(days=(DAYS.index(row.day) - start.weekday()) % 7)
+        # Stable across exports of the same term, so re-importing updates events instead of duplicating them
+        uid = hashlib.sha1("|".join(map(str, row + (start,))).encode("utf-8")).hexdigest()
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{uid}@timetable",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{datetime.datetime.combine(date, begin):%Y%m%dT%H%M%S}",
+            f"DTEND:{datetime.datetime.combine(date, end):%Y%m%dT%H%M%S}",
+            f"RRULE:FREQ=WEEKLY;COUNT={weeks}",
+            f"SUMMARY:{_escape(f'{row.subject} ({row.section})')}",
+        ]
+        if pd.notna(row.room):
+            lines.append(f"LOCATION:{_escape(row.room)}")
+        details = [f"{row.branch} {row.year} {row.section}, period {row.period}"]
+        if pd.notna(row.faculty):
+            details.append(f"Faculty: {row.faculty}")
+        lines += [f"DESCRIPTION:{_escape(chr(10).join(details))}", "END:VEVENT"]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_fold(line) for line in lines) + "\r\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    owner = parser.add_mutually_exclusive_group(required=True)
+    owner.add_argument("--faculty", metavar="NAME", help="a faculty member's week")
+    owner.add_argument("--section", nargs=3, metavar=("BRANCH", "YEAR", "SECTION"), help="a section's week")
+    parser.add_argument("--ical", metavar="FILE", help="also write the week as an iCalendar file")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, help="first day of the term (default: next Monday)")
+    parser.add_argument("--weeks", type=int, default=ICAL_WEEKS, help="weeks each class repeats for in the calendar")
+    args = parser.parse_args()
+
+    timetables = PersonalTimetables()
+    if args.faculty:
+        kind, week, name = "faculty", timetables.faculty_week(args.faculty), args.faculty
+    else:
+        kind, week, name = "section", timetables.section_week(*args.section), " ".join(args.section)
+    if week.empty:
+        print(f"No classes found for {name}")
+        return
+    print(f"{name}: {len(week)} classes a week\n")
+    print(week_grid(week, GRID_FIELDS[kind]).to_string())
+    if args.ical:
+        with open(args.ical, "w", encoding="utf-8", newline="") as f:
+            f.write(to_ical(week, args.start, args.weeks, name))
+        print(f"\nWrote {args.ical}")
+
+
+if __name__ == "__main__":
+    main()
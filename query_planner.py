@@ -0,0 +1,126 @@
+import os
+import re
+import sqlite3
+import threading
+
+# Columns whose values make up the planner's vocabulary, in match priority order
+VOCABULARY_COLUMNS = ["DAY", "SUBJECT", "PROFESSOR", "ROOM", "CLASS"]
+DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Words that ask for something the templates cannot express; those questions go to the model
+UNSUPPORTED = re.compile(
+    r"\b(how many|count|number of|not|except|without|free|empty|available|between|before|after|"
+    r"most|least|more|less|average|total|first|last|earliest|latest|add|remove|delete|update|change)\b"
+)
+
+# What the question asks for -> columns to select; checked in order, default is the whole row
+PROJECTIONS = [
+    (re.compile(r"\b(who|professor|faculty|teacher|lecturer|teaches|teaching|taught)\b"), ["PROFESSOR"]),
+    (re.compile(r"\b(where|which room|what room|room number)\b"), ["ROOM"]),
+    (re.compile(r"\b(when|what time|which day|what day|timings?)\b"), ["DAY", "TIME"]),
+    (re.compile(r"\b(which subject|what subject|subjects)\b"), ["SUBJECT"]),
+]
+
+
+def normalize(text):
+    return " ".join(re.findall(r"[0-9a-z]+", str(text).lower()))
+
+
+class QueryPlan:
+    """Parameterized SQL the rules planned for a question, and the intent (template) that matched."""
+
+    def __init__(self, sql, params=(), intent=None):
+        self.sql = sql
+        self.params = tuple(params)
+        self.intent = intent
+
+    def __repr__(self):
+        return f"QueryPlan({self.intent}, {self.sql!r}, {self.params!r})"
+
+
+class QueryPlanner:
+    """
+    Answer common timetable questions without the model.
+
+    The vocabulary (days, subjects, professors, rooms, classes) is read from
+    the TIMETABLE table and reloaded when the database file changes. A
+    question is planned when it names at least one known value and nothing
+    the templates cannot express; every named value becomes an equality
+    filter and the question words pick the columns ("who" -> PROFESSOR,
+    "where" -> ROOM, "when" -> DAY, TIME). Anything else returns None so the
+    caller can fall back to the model.
+    """
+
+    def __init__(self, db_path, table="TIMETABLE"):
+        self.db_path = db_path
+        self.table = table
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._columns = []
+        self._phrases = []  # (normalized phrase, column, stored value), longest first
+
+    def _load_vocabulary(self):
+        if not os.path.exists(self.db_path):
+            self._stamp, self._columns, self._phrases = None, [], []
+            return
+        stat = os.stat(self.db_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+        conn = sqlite3.connect(self.db_path)
+        try:
+            columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{self.table}")')]
+            phrases = []
+            for column in VOCABULARY_COLUMNS:
+                if column not in columns:
+                    continue
+                for (value,) in conn.execute(f'SELECT DISTINCT "{column}" FROM "{self.table}" WHERE "{column}" IS NOT NULL'):
+                    phrase = normalize(value)
+                    # Bare numbers ("1", "101") are too ambiguous to treat as a value on their own
+                    if phrase and not phrase.isdigit():
+                        phrases.append((phrase, column, value))
+        finally:
+            conn.close()
+        phrases.sort(key=lambda item: (-len(item[0]), VOCABULARY_COLUMNS.index(item[1])))
+        self._stamp, self._columns, self._phrases = stamp, columns, phrases
+
+    def entities(self, question):
+        """{column: stored value} for the known values named in the question, longest match first."""
+        text = f" {normalize(question)} "
+        found = {}
+        for phrase, column, value in self._phrases:
+            needle = f" {phrase} "
+            if needle in text and column not in found:
+                found[column] = value
+                text = text.replace(needle, " ")
+        return found, text
+
+    def plan(self, question):
+        """Return a QueryPlan for the question, or None when no template fits."""
+        with self._lock:
+            self._load_vocabulary()
+            if not self._phrases:
+                return None
+            if UNSUPPORTED.search(normalize(question)):
+                return None
+            found, rest = self.entities(question)
+            columns = self._columns
+        if not found:
+            return None
+        # A day the table has never seen is still a day; let the model handle it instead of guessing
+        if any(f" {day} " in rest for day in DAY_NAMES):
+            return None
+
+        select = ["*"]
+        for pattern, wanted in PROJECTIONS:
+            if pattern.search(rest) and all(col in columns for col in wanted):
+                # Asking for a column the question already pins down (e.g. "who" with a professor) means the row
+                if not any(col in found for col in wanted):
+                    select = wanted
+                break
+
+        where = " AND ".join(f"{column} = ?" for column in found)
+        distinct = "DISTINCT " if select != ["*"] else ""
+        sql = f"SELECT {distinct}{', '.join(select)} FROM {self.table} WHERE {where}"
+        intent = f"{'+'.join(select).lower()} by {'+'.join(found).lower()}"
+        return QueryPlan(sql, found.values(), intent)
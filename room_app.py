@@ -1,40 +1,23 @@
 import os
 import streamlit as st
-import pandas as pd
-import sqlite3
-
-# Base directory for databases
-BASE_DIR = os.path.join(os.getcwd(), "Database")
-
-# Branch configurations with room details
-BRANCH_CONFIG = {
-    
-    "ECE": {
-        "rooms": [
-            "AB-2-SS1", "AB-2-SS2", "AB-2-SS3", "AB-2-SS4", "AB-2-SS5", "AB-2-SS6", "AB-2-SS7", "AB-2-SS8",
-            "AB-2-SS9", "AB-2-SS10", "AB-2-G1", "AB-2-G2", "AB-2-G3", "AB-2-G4", "AB-2-G5", "AB-2-G6",
-            "AB-2-T1", "AB-2-T2"
-        ],
-        "timetable_db": os.path.join(BASE_DIR, "ECE", "ece_timetable.db"),
-        "faculty_db": os.path.join(BASE_DIR, "ECE", "ece_faculty.db"),
-        "timings_db": os.path.join(BASE_DIR, "ECE", "ece_timings.db"),
-    },
-    "EEE": {
-        "rooms": ["AB-2-T10", "AB-2-T7", "AB-2-T5", "AB-2-T6", "AB-2-T1", "AB-2-T2","AB-2-T9"],
-        "timetable_db": os.path.join(BASE_DIR, "EEE", "eee_timetable.db"),
-        "faculty_db": os.path.join(BASE_DIR, "EEE", "eee_faculty.db"),
-        "timings_db": os.path.join(BASE_DIR, "EEE", "eee_timings.db"),
-    },
-    "MECH": {
-        "rooms": ["AB-3-F2", "AB-3-F4", "AB-3-F5", "AB-3-F6"],
-        "timetable_db": os.path.join(BASE_DIR, "MECH", "mech_timetable.db"),
-        "faculty_db": os.path.join(BASE_DIR, "MECH", "mech_faculty.db"),
-        "timings_db": os.path.join(BASE_DIR, "MECH", "mech_timings.db"),
-    },
-}
+from campus_config import BLOCKS, DAYS, PERIODS, ROOM_BRANCHES as BRANCH_CONFIG
+from data_access import CAMPUS_DB, table_source
+from room_index import period_range
+from viewer_data import export_to_csv, get_period_timings, get_room_index, read_sql
 
 # Helper function to get branch by room
 def get_branch_by_room(room):
+    if os.path.exists(CAMPUS_DB):
+        # Consolidated campus database: one covering-index lookup instead of scanning room lists
+        # Rooms shared by branches resolve to the first in BRANCH_CONFIG order, as the room lists below do
+        placeholders = ",".join(["?"] * len(BRANCH_CONFIG))
+        order = " ".join(f"WHEN ? THEN {i}" for i in range(len(BRANCH_CONFIG)))
+        query = (
+            f"SELECT branch FROM slots WHERE room = ? AND branch IN ({placeholders}) "
+            f"ORDER BY CASE branch {order} END LIMIT 1"
+        )
+        df = read_sql(CAMPUS_DB, query, [room] + list(BRANCH_CONFIG) * 2)
+        return df["branch"].iloc[0] if not df.empty else None
     for branch, config in BRANCH_CONFIG.items():
         if room in config["rooms"]:
             return branch
@@ -42,60 +25,42 @@ def get_branch_by_room(room):
 
 # Function to retrieve timetable data with section information
 def get_timetable_data(branch, block, room, day, periods):
-    db_path = BRANCH_CONFIG[branch]["timetable_db"]
-    conn = sqlite3.connect(db_path)
-
-    # Construct the dynamic column names for the specific day and periods
-    selected_periods = [f"{day.upper()}_{period}" for period in periods]
-    selected_columns = ', '.join(selected_periods)
-
+    db_path, table = table_source(BRANCH_CONFIG[branch]["timetable_db"], "slots", branch)
+    placeholders = ",".join(["?"] * len(periods))
     query = f"""
-        SELECT BLOCK, YEAR, SECTION, ROOM, STRENGTH, {selected_columns}
-        FROM TIMETABLE
-        WHERE BLOCK = ? AND ROOM = ?
+        SELECT block AS BLOCK, year AS YEAR, section AS SECTION, room AS ROOM, strength AS STRENGTH,
+               period AS Period, subject AS Subject
+        FROM {table}
+        WHERE room = ? AND block = ? AND day = ? AND period IN ({placeholders})
+        ORDER BY period
     """
-    params = (block, room)
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
+    params = [room, block, day.upper()] + list(periods)
+    df = read_sql(db_path, query, params)
     return df
 
 # Function to retrieve faculty details with section filtering
 def get_faculty_details(branch, subjects, year='', section=''):
-    faculty_db = BRANCH_CONFIG[branch]["faculty_db"]
-    conn = sqlite3.connect(faculty_db)
+    # Section filters go through the exploded faculty_by_section view (one row per section)
+    source = "faculty_by_section" if year and section else "faculty"
+    faculty_db, table = table_source(BRANCH_CONFIG[branch]["faculty_db"], source, branch)
     placeholders = ",".join(["?"] * len(subjects))
 
     query = f"""
         SELECT Subject, Name AS Faculty_Name
-        FROM faculty
+        FROM {table}
         WHERE Subject IN ({placeholders})
     """
 
     # If year and section are provided, add them to the query
     if year and section:
-        query += " AND Year = ? AND sections = ?"
+        query += " AND Year = ? AND section = ?"
         params = subjects + [year, section]
     else:
         params = subjects
 
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
+    df = read_sql(faculty_db, query, params)
     return df
 
-# Function to retrieve period timings
-def get_period_timings(branch, periods):
-    db_path = BRANCH_CONFIG[branch]["timings_db"]
-    conn = sqlite3.connect(db_path)
-    placeholders = ",".join(["?"] * len(periods))
-    query = f"SELECT Period, Start_Time, End_Time FROM timings WHERE Period IN ({placeholders})"
-    df = pd.read_sql_query(query, conn, params=periods)
-    conn.close()
-    return df
-
-# Function to export results to CSV
-def export_to_csv(dataframe, filename="timetable_results.csv"):
-    return dataframe.to_csv(index=False).encode('utf-8')
-
 # Streamlit app configuration
 st.set_page_config(
     page_title="Room Timetable Viewer",
@@ -107,7 +72,7 @@ st.title("Integrated Timetable Viewer")
 
 # Sidebar inputs
 st.sidebar.title("Select Input Options")
-block = st.sidebar.selectbox("Select Block", ["AB-02", "AB-03"])
+block = st.sidebar.selectbox("Select Block", BLOCKS)
 
 # Get all rooms across branches for selected block
 all_rooms = [
@@ -119,8 +84,8 @@ else:
     room = st.sidebar.selectbox("Select Room", all_rooms)
 
     # Day and period selection
-    day = st.sidebar.selectbox("Select Day", ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"])
-    periods = st.sidebar.multiselect("Select Period(s)", ["P1", "P2", "P3", "P4", "P5", "P6", "P7"])
+    day = st.sidebar.selectbox("Select Day", DAYS)
+    periods = st.sidebar.multiselect("Select Period(s)", PERIODS)
 
     # Button to fetch results
     if st.sidebar.button("Get Timetable"):
@@ -144,10 +109,8 @@ else:
                     year = timetable_df['YEAR'].iloc[0]
                     section = timetable_df['SECTION'].iloc[0]
 
-                    # Flatten periods into a list of subjects
-                    selected_periods = [f"{day.upper()}_{period}" for period in periods]
-                    subject_list = timetable_df[selected_periods].values.flatten()
-                    subject_list = [sub for sub in subject_list if pd.notna(sub)]
+                    # Subjects taught in the room during the selected periods
+                    subject_list = timetable_df["Subject"].tolist()
 
                     # Get faculty details
                     faculty_df = get_faculty_details(branch, subject_list, year, section)
@@ -156,10 +119,7 @@ else:
                     timings_df = get_period_timings(branch, periods)
 
                     # Merge results
-                    final_df = pd.DataFrame({
-                        "Period": periods,
-                        "Subject": subject_list
-                    }).merge(faculty_df, how="left", left_on="Subject", right_on="Subject")
+                    final_df = timetable_df[["Period", "Subject"]].merge(faculty_df, how="left", left_on="Subject", right_on="Subject")
                     
                     final_df = final_df.merge(timings_df, how="left", left_on="Period", right_on="Period")
 
@@ -178,3 +138,19 @@ else:
                         file_name="room_timetable_results.csv",
                         mime="text/csv",
                     )
+
+# Free room search over the occupancy bitmaps built at ingest
+st.sidebar.markdown("---")
+st.sidebar.subheader("Find Free Rooms")
+free_day = st.sidebar.selectbox("Day", DAYS, key="free_day")
+first_period, last_period = st.sidebar.select_slider("Period range", options=PERIODS, value=("P1", "P2"))
+min_capacity = st.sidebar.number_input("Minimum capacity", min_value=0, value=0, step=10)
+
+if st.sidebar.button("Find Free Rooms"):
+    free_periods = period_range(first_period, last_period)
+    free_df = get_room_index().refresh().find_free_rooms(free_day, free_periods, block=block, min_capacity=min_capacity)
+    if free_df.empty:
+        st.warning("No free rooms for the selected inputs.")
+    else:
+        st.write(f"### Free rooms in {block} on {free_day}, {first_period}-{last_period}")
+        st.dataframe(free_df.rename(columns={"room": "Room", "block": "Block", "capacity": "Capacity", "branches": "Branches"}))
@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_access import read_only_uri
+from database import BRANCH_CONFIG, CAMPUS_DB, DATABASE_DIR, DAYS, PERIODS, slot_bit
+
+
+def timetable_db_paths(branch_config=BRANCH_CONFIG, database_dir=DATABASE_DIR):
+    """Timetable database of every branch (the files holding room_occupancy)."""
+    return [
+        os.path.join(database_dir, branch, config["databases"]["timetable_db"])
+        for branch, config in branch_config.items()
+        if config["databases"].get("timetable_db")
+    ]
+
+
+def period_range(first, last):
+    """Periods from first to last inclusive: period_range("P2", "P4") -> ["P2", "P3", "P4"]."""
+    start, end = sorted((PERIODS.index(first), PERIODS.index(last)))
+    return PERIODS[start:end + 1]
+
+
+def slots_mask(day, periods):
+    """Bitmap of the given periods on one day."""
+    mask = 0
+    for period in periods:
+        mask |= slot_bit(day.upper(), period)
+    return mask
+
+
+class RoomIndex:
+    """
+    Campus-wide free-room lookups over the room_occupancy bitmaps built at ingest.
+
+    Rooms from every branch are held as NumPy arrays (one uint64 bitmap per
+    room, OR-ed across branches that share it), so a query is one AND over
+    the array plus the block and capacity filters. Reads the campus database
+    when it exists, otherwise every branch timetable database, and reloads
+    when any of those files change.
+    """
+
+    def __init__(self, db_paths=None):
+        self.db_paths = db_paths
+        self._lock = threading.Lock()
+        self._stamp = None
+        self.rooms = pd.DataFrame(columns=["room", "block", "capacity", "branches"])
+        self._occupancy = np.zeros(0, dtype=np.uint64)
+        self._capacity = np.zeros(0)
+        self._block = np.zeros(0, dtype=object)
+        self._names = np.zeros(0, dtype=object)
+
+    def _sources(self):
+        if self.db_paths is not None:
+            return self.db_paths
+        if os.path.exists(CAMPUS_DB):
+            return [CAMPUS_DB]
+        return timetable_db_paths()
+
+    def _read(self, sources):
+        frames = []
+        for db_path in sources:
+            conn = sqlite3.connect(read_only_uri(db_path), uri=True)
+            try:
+                if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'room_occupancy'").fetchone():
+                    frames.append(pd.read_sql_query("SELECT branch, room, block, capacity, occupancy FROM room_occupancy", conn))
+            finally:
+                conn.close()
+        if not frames:
+            return pd.DataFrame(columns=["branch", "room", "block", "capacity", "occupancy"])
+        return pd.concat(frames, ignore_index=True)
+
+    def refresh(self):
+        """Reload the bitmaps if any source database changed since the last load."""
+        sources = [path for path in self._sources() if os.path.exists(path)]
+        stamp = tuple((path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in sources)
+        with self._lock:
+            if stamp == self._stamp:
+                return self
+            rows = self._read(sources)
+            rows["occupancy"] = rows["occupancy"].astype("uint64")
+            rooms = rows.groupby("room", sort=True).agg(
+                block=("block", "first"),
+                capacity=("capacity", "max"),
+                occupancy=("occupancy", lambda bitmaps: np.bitwise_or.reduce(bitmaps.to_numpy())),
+                branches=("branch", lambda branches: ", ".join(sorted(set(branches)))),
+            ).reset_index()
+            self._occupancy = rooms["occupancy"].to_numpy(dtype=np.uint64)
+            self._capacity = rooms["capacity"].fillna(0).to_numpy(dtype=float)
+            self._block = rooms["block"].to_numpy(dtype=object)
+            self._names = rooms["room"].to_numpy(dtype=object)
+            self.rooms = rooms.drop(columns="occupancy")
+            self._stamp = stamp
+        return self
+
+    def is_free(self, room, day, periods):
+        """True when the room has no class in any of the periods on that day."""
+        matches = np.flatnonzero(self._names == room)
+        if not len(matches):
+            return True
+        return not int(self._occupancy[matches[0]]) & slots_mask(day, periods)
+
+    def free_mask(self, day, periods, block=None, min_capacity=0):
+        """Boolean array over self.rooms: free for all the periods on that day, in the block, big enough."""
+        keep = (self._occupancy & np.uint64(slots_mask(day, periods))) == 0
+        if min_capacity:
+            keep &= self._capacity >= min_capacity
+        if block:
+            keep &= self._block == block
+        return keep
+
+    def free_rooms(self, day, periods, block=None, min_capacity=0):
+        """Names of the free rooms; the hot path, no DataFrame involved."""
+        return self._names[self.free_mask(day, periods, block, min_capacity)].tolist()
+
+    def find_free_rooms(self, day, periods, block=None, min_capacity=0):
+        """Free rooms with their block, capacity and owning branches, as a DataFrame."""
+        return self.rooms[self.free_mask(day, periods, block, min_capacity)].reset_index(drop=True)
+
+    def free_slots(self, room):
+        """[(day, period)] when a room is free all week."""
+        matches = np.flatnonzero(self._names == room)
+        occupancy = int(self._occupancy[matches[0]]) if len(matches) else 0
+        return [(day, period) for day in DAYS for period in PERIODS if not occupancy & slot_bit(day, period)]
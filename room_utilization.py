@@ -0,0 +1,226 @@
+"""
+Room utilization report over the slots tables of every branch.
+
+All timetable cells with a room are packed once into a dense
+rooms x days x periods grid (classes and seated STRENGTH per room-slot),
+and every figure is a NumPy reduction over that grid:
+
+  rooms   - per room: busy and idle slots, occupancy rate, seat utilization
+            (seated STRENGTH over capacity, averaged over the busy slots)
+            and slots booked by more than one class
+  blocks  - the same rolled up per block
+  periods - occupancy rate and average idle rooms per period
+  idle    - idle rooms per day and period (the heatmap)
+
+Capacity is the largest STRENGTH seen in a room, as in room_occupancy,
+unless a CSV of room,capacity is given.
+
+Run from the repository root:
+    python room_utilization.py [--block AB-02] [--capacities rooms.csv] [--out reports/]
+"""
+import argparse
+import os
+import sqlite3
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from data_access import read_only_uri
+from database import CAMPUS_DB, DAYS, FREE_SUBJECTS, PERIODS
+from room_index import timetable_db_paths
+
+SLOTS_PER_WEEK = len(DAYS) * len(PERIODS)
+
+# Block of rooms whose slots carry no block, so every room has one to group, filter and sort by
+UNASSIGNED_BLOCK = "Unassigned"
+
+# rooms, blocks and capacity run over the rooms; classes and seats are rooms x days x periods
+RoomGrid = namedtuple("RoomGrid", "rooms blocks capacity classes seats")
+
+
+def slot_sources():
+    """The campus database when it exists, otherwise every branch timetable database."""
+    if os.path.exists(CAMPUS_DB):
+        return [CAMPUS_DB]
+    return [path for path in timetable_db_paths() if os.path.exists(path)]
+
+
+def sources_stamp(sources=None):
+    """Changes whenever ingest rewrites one of the source databases."""
+    sources = slot_sources() if sources is None else sources
+    return tuple((path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in sources if os.path.exists(path))
+
+
+def load_slots(sources=None):
+    """Every timetable cell that has a room, from all branches."""
+    frames = []
+    for db_path in slot_sources() if sources is None else sources:
+        conn = sqlite3.connect(read_only_uri(db_path), uri=True)
+        try:
+            frames.append(pd.read_sql_query(
+                "SELECT block, room, strength, day, period, subject FROM slots WHERE room IS NOT NULL", conn
+            ))
+        finally:
+            conn.close()
+    if not frames:
+        return pd.DataFrame(columns=["block", "room", "strength", "day", "period", "subject"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_capacities(csv_file):
+    """{room: capacity} from a CSV with room and capacity columns."""
+    df = pd.read_csv(csv_file)
+    df.columns = [col.strip().lower() for col in df.columns]
+    return dict(zip(df["room"].astype(str).str.strip(), pd.to_numeric(df["capacity"], errors="coerce")))
+
+
+def _lookup(values, transform):
+    # Columns repeat a few distinct values many times: transform those once and index back
+    codes, uniques = pd.factorize(values)
+    mapped = np.array([transform(value) for value in uniques] + [transform(None)])
+    return mapped[codes]
+
+
+def build_grid(slots, capacities=None):
+    """Pack slot rows into a RoomGrid; leisure cells count towards capacity but not as classes."""
+    slots = slots.dropna(subset=["room"])
+    day_index = {day: i for i, day in enumerate(DAYS)}
+    period_index = {period: i for i, period in enumerate(PERIODS)}
+    day = _lookup(slots["day"], lambda value: day_index.get(str(value).upper(), -1))
+    period = _lookup(slots["period"], lambda value: period_index.get(value, -1))
+    valid = (day >= 0) & (period >= 0)
+    room_codes, rooms = pd.factorize(slots["room"].to_numpy()[valid], sort=True)
+    day, period = day[valid], period[valid]
+    strength = pd.to_numeric(slots["strength"], errors="coerce").fillna(0).to_numpy(dtype=float)[valid]
+    n_rooms = len(rooms)
+
+    # First block seen for each room, as room_occupancy keeps it
+    first = np.unique(room_codes, return_index=True)[1]
+    blocks = slots["block"].to_numpy(dtype=object)[valid][first]
+    blocks = np.where(pd.isna(blocks), UNASSIGNED_BLOCK, blocks).astype(object)
+
+    capacity = np.zeros(n_rooms)
+    np.maximum.at(capacity, room_codes, strength)
+    if capacities:
+        given = pd.Series(rooms).map(capacities).to_numpy(dtype=float)
+        capacity = np.where(np.isnan(given), capacity, given)
+
+    busy = _lookup(slots["subject"], lambda value: str(value).strip().lower() not in FREE_SUBJECTS)[valid]
+    cell = (room_codes * len(DAYS) + day) * len(PERIODS) + period
+    size = n_rooms * SLOTS_PER_WEEK
+    shape = (n_rooms, len(DAYS), len(PERIODS))
+    classes = np.bincount(cell[busy], minlength=size).reshape(shape)
+    seats = np.bincount(cell[busy], weights=strength[busy], minlength=size).reshape(shape)
+    return RoomGrid(np.asarray(rooms, dtype=object), blocks, capacity, classes, seats)
+
+
+def select(grid, block=None):
+    """The grid limited to the rooms of one block (all rooms when block is None)."""
+    if block is None:
+        return grid
+    keep = grid.blocks == block
+    return RoomGrid(*(values[keep] for values in grid))
+
+
+def _ratio(numerator, denominator):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def room_report(grid):
+    """Per room figures, least used first."""
+    busy = grid.classes > 0
+    busy_slots = busy.sum(axis=(1, 2))
+    report = pd.DataFrame({
+        "room": grid.rooms,
+        "block": grid.blocks,
+        "capacity": grid.capacity,
+        "busy_slots": busy_slots,
+        "idle_slots": SLOTS_PER_WEEK - busy_slots,
+        "occupancy": busy_slots / SLOTS_PER_WEEK,
+        "seat_utilization": _ratio(grid.seats.sum(axis=(1, 2)), grid.capacity * busy_slots),
+        "double_booked": (grid.classes > 1).sum(axis=(1, 2)),
+    })
+    return report.sort_values(["occupancy", "room"], ignore_index=True)
+
+
+def block_report(grid):
+    """Per block totals over its rooms."""
+    codes, blocks = pd.factorize(grid.blocks, sort=True)
+    busy_slots = (grid.classes > 0).sum(axis=(1, 2))
+    rooms = np.bincount(codes, minlength=len(blocks))
+    busy = np.bincount(codes, weights=busy_slots, minlength=len(blocks))
+    seats = np.bincount(codes, weights=grid.seats.sum(axis=(1, 2)), minlength=len(blocks))
+    offered = np.bincount(codes, weights=grid.capacity * busy_slots, minlength=len(blocks))
+    return pd.DataFrame({
+        "block": blocks,
+        "rooms": rooms,
+        "busy_slots": busy.astype(int),
+        "idle_slots": (rooms * SLOTS_PER_WEEK - busy).astype(int),
+        "occupancy": _ratio(busy, rooms * SLOTS_PER_WEEK),
+        "seat_utilization": _ratio(seats, offered),
+    })
+
+
+def period_report(grid):
+    """Per period occupancy rate and seat utilization, and rooms idle in it on an average day."""
+    busy = grid.classes > 0
+    busy_rooms = busy.sum(axis=(0, 1))
+    offered = (busy * grid.capacity[:, None, None]).sum(axis=(0, 1))
+    return pd.DataFrame({
+        "period": PERIODS,
+        "occupancy": _ratio(busy_rooms, len(grid.rooms) * len(DAYS)),
+        "seat_utilization": _ratio(grid.seats.sum(axis=(0, 1)), offered),
+        "idle_rooms": len(grid.rooms) - busy_rooms / len(DAYS),
+    })
+
+
+def idle_heatmap(grid):
+    """Idle rooms per day (rows) and period (columns)."""
+    idle = (grid.classes == 0).sum(axis=0)
+    return pd.DataFrame(idle, index=pd.Index(DAYS, name="day"), columns=PERIODS)
+
+
+def overall(grid):
+    """Headline figures over every room of the grid."""
+    busy = grid.classes > 0
+    busy_slots = busy.sum()
+    return {
+        "rooms": len(grid.rooms),
+        "occupancy": float(_ratio(busy_slots, len(grid.rooms) * SLOTS_PER_WEEK)),
+        "seat_utilization": float(_ratio(grid.seats.sum(), (busy.sum(axis=(1, 2)) * grid.capacity).sum())),
+        "idle_slots": int(busy.size - busy_slots),
+    }
+
+
+def analyse(grid, block=None):
+    """Run the whole report: {"rooms": df, "blocks": df, "periods": df, "idle": df}."""
+    grid = select(grid, block)
+    return {
+        "rooms": room_report(grid),
+        "blocks": block_report(grid),
+        "periods": period_report(grid),
+        "idle": idle_heatmap(grid),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--block", help="only the rooms of this block")
+    parser.add_argument("--capacities", metavar="CSV", help="room,capacity file overriding the largest STRENGTH")
+    parser.add_argument("--out", metavar="DIR", help="also write rooms.csv, blocks.csv, periods.csv and idle.csv here")
+    args = parser.parse_args()
+
+    capacities = load_capacities(args.capacities) if args.capacities else None
+    report = analyse(build_grid(load_slots(), capacities), block=args.block)
+    for name, df in report.items():
+        print(f"\n{name} ({len(df)} rows)")
+        print(df.head(15).to_string(index=name == "idle", float_format="{:.2f}".format) if not df.empty else "none")
+        if args.out:
+            os.makedirs(args.out, exist_ok=True)
+            df.to_csv(os.path.join(args.out, f"{name}.csv"), index=name == "idle")
+
+
+if __name__ == "__main__":
+    main()
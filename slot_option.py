@@ -1,61 +1,26 @@
 #slot_option.py
 
-import os
 import streamlit as st
 import pandas as pd
-import sqlite3
-
-# Base directory for databases
-BASE_DIR = os.path.join(os.getcwd(), "Database")
-
-# Branch configurations
-BRANCH_CONFIG = {
-    "CSE": {
-        "sections": ["CSE-01", "CSE-02", "CSE-03", "CSE-04", "CSE-05", "CSE-06"],
-        "has_room": True,
-        "timetable_db": os.path.join(BASE_DIR, "CSE", "cse_timetable.db"),
-        "faculty_db": os.path.join(BASE_DIR, "CSE", "cse_faculty.db"),
-        "timings_db": os.path.join(BASE_DIR, "CSE", "cse_timings.db"),
-    },
-    "ECE": {
-        "sections": ["ECE-01", "ECE-02", "ECE-03", "ECE-04", "ECE-05", "ECE-06"],
-        "has_room": True,
-        "timetable_db": os.path.join(BASE_DIR, "ECE", "ece_timetable.db"),
-        "faculty_db": os.path.join(BASE_DIR, "ECE", "ece_faculty.db"),
-        "timings_db": os.path.join(BASE_DIR, "ECE", "ece_timings.db"),
-    },
-    "MECH": {
-        "sections": ["ME-01"],
-        "has_room": True,
-        "timetable_db": os.path.join(BASE_DIR, "MECH", "mech_timetable.db"),
-        "faculty_db": os.path.join(BASE_DIR, "MECH", "mech_faculty.db"),
-        "timings_db": os.path.join(BASE_DIR, "MECH", "mech_timings.db"),
-    },
-    "EEE": {
-        "sections": ["EEE-01", "EEE-02"],
-        "has_room": True,
-        "timetable_db": os.path.join(BASE_DIR, "EEE", "eee_timetable.db"),
-        "faculty_db": os.path.join(BASE_DIR, "EEE", "eee_faculty.db"),
-        "timings_db": os.path.join(BASE_DIR, "EEE", "eee_timings.db"),
-    },
-}
+from campus_config import BLOCKS, BRANCH_CONFIG, DAYS, PERIODS, YEARS
+from data_access import table_source
+from viewer_data import export_to_csv, get_period_timings, read_sql
 
 # Function to retrieve timetable data
 def get_timetable_data(branch, block, year, section, day, periods):
-    db_path = BRANCH_CONFIG[branch]["timetable_db"]
-    conn = sqlite3.connect(db_path)
+    db_path, table = table_source(BRANCH_CONFIG[branch]["timetable_db"], "slots", branch)
     has_room = BRANCH_CONFIG[branch]["has_room"]
 
-    room_field = "ROOM, " if has_room else ""
-    selected_periods = ", ".join([f"{day.upper()}_{period}" for period in periods])
+    room_field = "room AS ROOM, " if has_room else ""
+    placeholders = ",".join(["?"] * len(periods))
     query = f"""
-        SELECT {room_field}STRENGTH, {selected_periods}
-        FROM TIMETABLE
-        WHERE BLOCK = ? AND YEAR = ? AND SECTION = ?
+        SELECT {room_field}strength AS STRENGTH, period AS Period, subject AS Subject
+        FROM {table}
+        WHERE branch = ? AND block = ? AND year = ? AND section = ? AND day = ? AND period IN ({placeholders})
+        ORDER BY period
     """
-    params = (block, year, section)
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
+    params = [branch, block, year, section, day.upper()] + list(periods)
+    df = read_sql(db_path, query, params)
     return df
 
 # Function to retrieve faculty details
@@ -64,32 +29,17 @@ def get_faculty_details(branch, subjects, year, section):
     if faculty_db is None:
         return pd.DataFrame()  # No faculty details for branches without a faculty DB
 
-    conn = sqlite3.connect(faculty_db)
+    faculty_db, table = table_source(faculty_db, "faculty_by_section", branch)
     placeholders = ",".join(["?"] * len(subjects))
     query = f"""
         SELECT Year, sections, Subject, Name AS Faculty_Name
-        FROM faculty
-        WHERE Subject IN ({placeholders}) AND Year = ? AND sections = ?
+        FROM {table}
+        WHERE Subject IN ({placeholders}) AND Year = ? AND section = ?
     """
     params = subjects + [year, section]
-    df = pd.read_sql_query(query, conn, params=params)
-    conn.close()
+    df = read_sql(faculty_db, query, params)
     return df
 
-# Function to retrieve period timings
-def get_period_timings(branch, periods):
-    db_path = BRANCH_CONFIG[branch]["timings_db"]
-    conn = sqlite3.connect(db_path)
-    placeholders = ",".join(["?"] * len(periods))
-    query = f"SELECT Period, Start_Time, End_Time FROM timings WHERE Period IN ({placeholders})"
-    df = pd.read_sql_query(query, conn, params=periods)
-    conn.close()
-    return df
-
-# Function to export results to CSV
-def export_to_csv(dataframe, filename="timetable_results.csv"):
-    return dataframe.to_csv(index=False).encode('utf-8')
-
 # Streamlit app configuration
 st.set_page_config(
     page_title="Integrated Timetable Viewer",
@@ -101,12 +51,12 @@ st.title("Integrated Timetable Viewer")
 
 # Sidebar for input
 st.sidebar.title("Filter Options")
-block = st.sidebar.selectbox("Select Block", ["AB-02", "AB-03"])
+block = st.sidebar.selectbox("Select Block", BLOCKS)
 branch = st.sidebar.selectbox("Select Branch", list(BRANCH_CONFIG.keys()))
-year = st.sidebar.selectbox("Select Year", ["E1", "E2", "E3", "E4"])
+year = st.sidebar.selectbox("Select Year", YEARS)
 section = st.sidebar.selectbox("Select Section", BRANCH_CONFIG[branch]["sections"])
-day = st.sidebar.selectbox("Select Day", ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"])
-periods = st.sidebar.multiselect("Select Period(s)", ["P1", "P2", "P3", "P4", "P5", "P6", "P7"])
+day = st.sidebar.selectbox("Select Day", DAYS)
+periods = st.sidebar.multiselect("Select Period(s)", PERIODS)
 
 # Button to fetch results
 if st.sidebar.button("Get Timetable"):
@@ -121,10 +71,8 @@ if st.sidebar.button("Get Timetable"):
         else:
             st.write(f"### Timetable for {branch} - {block}, {year}, {section} on {day}")
             
-            # Flatten periods into a list of subjects
-            selected_periods = [f"{day.upper()}_{period}" for period in periods]
-            subject_list = timetable_df[selected_periods].values.flatten()
-            subject_list = [sub for sub in subject_list if pd.notna(sub)]
+            # Subjects taught in the selected periods
+            subject_list = timetable_df["Subject"].tolist()
 
             # Get faculty details
             faculty_df = get_faculty_details(branch, subject_list, year, section)
@@ -133,10 +81,7 @@ if st.sidebar.button("Get Timetable"):
             timings_df = get_period_timings(branch, periods)
 
             # Merge results
-            final_df = pd.DataFrame({
-                "Period": periods,
-                "Subject": subject_list
-            }).merge(faculty_df, how="left", left_on="Subject", right_on="Subject")
+            final_df = timetable_df[["Period", "Subject"]].merge(faculty_df, how="left", left_on="Subject", right_on="Subject")
             
             final_df = final_df.merge(timings_df, how="left", left_on="Period", right_on="Period")
 
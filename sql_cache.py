@@ -0,0 +1,179 @@
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+
+# Words that carry no meaning for which SQL a timetable question needs
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "what", "whats", "which", "who", "whos", "show", "me",
+    "give", "list", "tell", "get", "find", "please", "on", "for", "of", "in", "at", "to", "do", "does",
+    "we", "i", "my", "our", "have", "has", "there", "all", "any", "timetable", "schedule", "classes", "s",
+}
+
+# Words that flip or narrow what a question asks for without adding a literal to the SQL:
+# a question with one of these is only ever served from the exact tier
+NEGATIONS = {"not", "no", "non", "never", "unused", "free", "empty", "vacant", "except", "without", "other", "than"}
+
+# Content words a paraphrase may add or drop without changing the SQL it needs
+HARMLESS_WORDS = {"used", "scheduled", "held", "happening", "taking", "place", "details", "information", "info", "about"}
+
+SIMILARITY_THRESHOLD = 0.85
+DEFAULT_TTL = 24 * 60 * 60
+MAX_ENTRIES = 512
+
+
+def normalize_question(question):
+    """Lower-case, drop punctuation and collapse whitespace: the exact-tier key."""
+    return " ".join(re.findall(r"[0-9a-z]+", question.lower().replace("'", "")))
+
+
+def content_tokens(question):
+    """The normalized question without filler words, in order."""
+    return [token for token in normalize_question(question).split() if token not in STOPWORDS]
+
+
+def stem(word):
+    """Crude suffix strip so "teaches"/"teaching" and "room"/"rooms" compare equal."""
+    for suffix in ("ing", "es", "ed", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def same_request(tokens, other):
+    """
+    True when two questions' content words differ only by word endings and
+    HARMLESS_WORDS, and neither negates: "rooms used on Monday" never
+    matches "rooms not used on Monday" or "unused rooms on Monday".
+    """
+    words, other_words = set(tokens), set(other)
+    if words & NEGATIONS or other_words & NEGATIONS:
+        return False
+    stems = {stem(word) for word in words - HARMLESS_WORDS}
+    other_stems = {stem(word) for word in other_words - HARMLESS_WORDS}
+    return stems == other_stems
+
+
+def trigrams(tokens):
+    grams = Counter()
+    for token in tokens:
+        padded = f" {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def cosine(a, b):
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b[gram] for gram, count in a.items() if gram in b)
+    return dot / (math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values())))
+
+
+def sql_literals(sql):
+    """String and number literals in a query, lower-cased: WHERE DAY='Monday' -> ['monday']."""
+    literals = re.findall(r"'((?:[^']|'')*)'", sql) + re.findall(r"(?<![\w.])(\d+(?:\.\d+)?)(?![\w.])", sql)
+    return [normalize_question(literal) for literal in literals]
+
+
+def schema_fingerprint(db_path):
+    """Hash of the database's CREATE statements; changes whenever a table or column does."""
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY type, name").fetchall()
+    finally:
+        conn.close()
+    return hashlib.sha256(repr(rows).encode()).hexdigest()
+
+
+class SQLCache:
+    """
+    Two-tier cache of question -> validated SQL for the Ask Question page.
+
+    Tier 1 is an LRU keyed by the normalized question. Tier 2 compares the
+    question's content words (character trigram cosine) with every cached
+    question and reuses the closest SQL above `threshold`, provided every
+    literal in that SQL ('Monday', 'Room 101', ...) also appears in the new
+    question, so "Monday timetable" can reuse "what's on Monday" but never
+    serves Monday's query for Tuesday. The two questions must also ask for
+    the same thing (same_request): their content words may differ only in
+    endings and HARMLESS_WORDS, and a negated question is never matched.
+
+    Entries expire after `ttl` seconds and the whole cache is dropped when the
+    schema fingerprint passed to get()/put() changes. Only put() SQL that ran
+    successfully.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES, clock=time.monotonic):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.schema = None
+        self.stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0, "invalidations": 0}
+        self._entries = OrderedDict()  # normalized question -> (sql, trigrams, stored at)
+        self._lock = threading.Lock()
+
+    def _check_schema(self, schema):
+        if schema is not None and schema != self.schema:
+            if self._entries:
+                self.stats["invalidations"] += 1
+            self._entries.clear()
+            self.schema = schema
+
+    def _expire(self):
+        cutoff = self.clock() - self.ttl
+        for key in [key for key, (_, _, stored) in self._entries.items() if stored < cutoff]:
+            del self._entries[key]
+
+    def get(self, question, schema=None):
+        """Return (sql, tier) with tier "exact" or "similar", or (None, None) on a miss."""
+        key = normalize_question(question)
+        with self._lock:
+            self._check_schema(schema)
+            self._expire()
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["exact_hits"] += 1
+                return entry[0], "exact"
+
+            tokens = content_tokens(question)
+            grams, words = trigrams(tokens), f" {' '.join(tokens)} "
+            best, best_score = None, self.threshold
+            for cached_key, (sql, cached_grams, _) in self._entries.items():
+                score = cosine(grams, cached_grams)
+                if (
+                    score >= best_score
+                    and all(f" {literal} " in words for literal in sql_literals(sql))
+                    and same_request(tokens, [token for token in cached_key.split() if token not in STOPWORDS])
+                ):
+                    best, best_score = cached_key, score
+            if best is not None:
+                self._entries.move_to_end(best)
+                self.stats["similar_hits"] += 1
+                return self._entries[best][0], "similar"
+
+            self.stats["misses"] += 1
+            return None, None
+
+    def put(self, question, sql, schema=None):
+        key = normalize_question(question)
+        with self._lock:
+            self._check_schema(schema)
+            self._entries[key] = (sql, trigrams(content_tokens(question)), self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
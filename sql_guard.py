@@ -0,0 +1,299 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+import pandas as pd
+
+from data_access import read_only_uri
+
+DEFAULT_TIMEOUT = 2.0           # seconds of SQLite work per statement
+DEFAULT_MAX_ROWS = 10_000       # rows fetched into the result frame
+DEFAULT_MAX_SCAN_ROWS = 5_000_000  # estimated rows visited, from EXPLAIN QUERY PLAN
+DEFAULT_CONCURRENCY = int(os.getenv("SQL_CONCURRENCY", "4"))
+PROGRESS_STEPS = 1000           # VM instructions between deadline checks
+WRITE_TABLES = ("TIMETABLE",)
+
+READ_KEYWORDS = {"SELECT", "WITH", "VALUES"}
+WRITE_KEYWORDS = {"INSERT", "UPDATE", "DELETE", "REPLACE"}
+
+# Everything a read may do; anything else (writes, ATTACH, PRAGMA, DDL, ...) is denied at prepare time
+READ_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+WRITE_ACTIONS = {sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE, sqlite3.SQLITE_DELETE}
+
+TOKEN = re.compile(
+    r"""
+    (?P<space>\s+)
+    | (?P<comment>--[^\n]*|/\*.*?(?:\*/|$))
+    | (?P<string>'(?:[^']|'')*'?)
+    | (?P<ident>"(?:[^"]|"")*"?|`[^`]*`?|\[[^\]]*\]?)
+    | (?P<word>\w+)
+    | (?P<op>.)
+    """,
+    re.S | re.X,
+)
+
+GuardedResult = namedtuple("GuardedResult", "frame truncated estimated_rows sql seconds")
+
+
+class QueryRejected(Exception):
+    """The statement is not allowed, or would cost too much, to run."""
+
+
+class QueryTimeout(QueryRejected):
+    """The statement ran past its time budget and was interrupted."""
+
+
+def tokenize(sql):
+    """(kind, text, paren depth) for each token of sql, whitespace and comments dropped."""
+    tokens, depth = [], 0
+    for match in TOKEN.finditer(sql):
+        kind, text = match.lastgroup, match.group()
+        if kind in ("space", "comment"):
+            continue
+        if text == ")":
+            depth -= 1
+        tokens.append((kind, text, depth))
+        if text == "(":
+            depth += 1
+    return tokens
+
+
+def classify(sql):
+    """
+    ("read" | "write", statement) for a single SELECT/WITH/VALUES or
+    INSERT/UPDATE/DELETE/REPLACE statement, trailing semicolons dropped.
+    Raises QueryRejected for anything else or for several statements.
+    """
+    tokens = tokenize(sql)
+    while tokens and tokens[-1][1] == ";":
+        tokens.pop()
+    if not tokens:
+        raise QueryRejected("Empty query")
+    if any(text == ";" for _, text, _ in tokens):
+        raise QueryRejected("Only one statement can run at a time")
+
+    keyword = tokens[0][1].upper()
+    if keyword in READ_KEYWORDS:
+        kind = "read"
+    elif keyword in WRITE_KEYWORDS:
+        kind = "write"
+        top_level = {text.upper() for token_kind, text, depth in tokens if token_kind == "word" and depth == 0}
+        if keyword in ("UPDATE", "DELETE") and "WHERE" not in top_level:
+            raise QueryRejected(f"{keyword} without a WHERE clause would change every row")
+    else:
+        raise QueryRejected(f"{keyword} statements are not allowed; only SELECT, INSERT, UPDATE and DELETE run here")
+
+    statement = sql.strip()
+    while statement.endswith(";"):
+        statement = statement[:-1].rstrip()
+    return kind, statement
+
+
+def has_top_level_limit(sql):
+    return any(kind == "word" and depth == 0 and text.upper() == "LIMIT" for kind, text, depth in tokenize(sql))
+
+
+def plan_cost(plan, table_rows, default_rows):
+    """
+    Rough count of rows a query visits, from its EXPLAIN QUERY PLAN rows
+    (id, parent, notused, detail): loops under one parent are nested, so
+    their row counts multiply (a full SCAN costs the table's rows, an index
+    SEARCH one); subqueries and CTEs add their own cost.
+    """
+    children = defaultdict(list)
+    for node, parent, _, detail in plan:
+        children[parent].append((node, detail))
+
+    def cost(parent):
+        loops, extra = 1, 0
+        for node, detail in children[parent]:
+            if detail.startswith("SCAN "):
+                name = detail.split()[1]
+                if name != "CONSTANT":
+                    loops *= max(table_rows.get(name.upper(), default_rows), 1)
+            extra += cost(node)
+        return loops + extra
+
+    return cost(0)
+
+
+class SQLGuard:
+    """
+    Runs model-generated SQL against one database with limits, so a bad
+    query costs its own session a rejection instead of stalling the server.
+
+    Reads go through a read-only connection whose authorizer only allows
+    SELECT work. Before running, EXPLAIN QUERY PLAN is costed against the
+    tables' row counts and the statement is rejected over max_scan_rows
+    (cross joins, scans of huge tables). Reads without a LIMIT are rewritten
+    to stop one row past max_rows, and rows are fetched in batches up to
+    that cap. A progress handler interrupts anything still running after
+    timeout seconds, and at most max_concurrent statements run at once.
+    """
+
+    def __init__(self, db_path, timeout=DEFAULT_TIMEOUT, max_rows=DEFAULT_MAX_ROWS,
+                 max_scan_rows=DEFAULT_MAX_SCAN_ROWS, max_concurrent=DEFAULT_CONCURRENCY, write_tables=WRITE_TABLES):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.max_rows = max_rows
+        self.max_scan_rows = max_scan_rows
+        self.write_tables = {table.upper() for table in write_tables}
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._row_counts = {}  # table -> rows, for the file stamp below
+        self._stamp = None
+        self.stats = {"reads": 0, "writes": 0, "rejected": 0, "timeouts": 0, "truncated": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def table_rows(self, conn):
+        """Row count of every table, recounted only when the database file changes."""
+        try:
+            st = os.stat(self.db_path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        with self._lock:
+            if stamp is not None and stamp == self._stamp:
+                return self._row_counts
+        counts = {}
+        for (table,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+            quoted = '"' + table.replace('"', '""') + '"'
+            try:
+                # max(rowid) is an index lookup; close enough to COUNT(*) for costing
+                rows = conn.execute(f"SELECT max(rowid) FROM {quoted}").fetchone()[0]
+            except sqlite3.OperationalError:
+                rows = conn.execute(f"SELECT COUNT(*) FROM {quoted}").fetchone()[0]
+            counts[table.upper()] = rows or 0
+        with self._lock:
+            self._row_counts, self._stamp = counts, stamp
+        return counts
+
+    def estimate(self, conn, sql, params=()):
+        """Rows the statement would visit according to its query plan; QueryRejected over max_scan_rows."""
+        rows = self.table_rows(conn)
+        try:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        except sqlite3.DatabaseError as e:
+            raise QueryRejected(f"Query rejected: {e}") from e
+        estimated = plan_cost(plan, rows, max(rows.values(), default=0))
+        if estimated > self.max_scan_rows:
+            raise QueryRejected(
+                f"Query would visit about {estimated:,} rows (limit {self.max_scan_rows:,}); "
+                "narrow it with a WHERE clause or a join condition"
+            )
+        return estimated
+
+    def _authorizer(self, allowed, write_tables=()):
+        def authorize(action, arg1, arg2, db_name, trigger):
+            if action in allowed or trigger is not None:
+                # Triggers the caller installed (e.g. the validator's change log) run as usual
+                return sqlite3.SQLITE_OK
+            if action in WRITE_ACTIONS and arg1 and arg1.upper() in write_tables:
+                return sqlite3.SQLITE_OK
+            return sqlite3.SQLITE_DENY
+        return authorize
+
+    def _deadline(self, conn):
+        deadline = time.monotonic() + self.timeout
+        conn.set_progress_handler(lambda: time.monotonic() > deadline, PROGRESS_STEPS)
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            self._count("rejected")
+            raise QueryRejected("Too many queries are running; try again in a moment")
+
+    def _failure(self, e):
+        # The progress handler aborting shows up as "interrupted"; anything else is the statement's own error
+        if "interrupt" in str(e):
+            self._count("timeouts")
+            return QueryTimeout(f"Query took longer than {self.timeout:g}s and was stopped")
+        self._count("rejected")
+        return QueryRejected(f"Query rejected: {e}")
+
+    def read(self, sql, params=()):
+        """Run a read and return a GuardedResult with at most max_rows rows."""
+        kind, statement = self._classify(sql)
+        if kind != "read":
+            self._count("rejected")
+            raise QueryRejected("Only SELECT queries can run here")
+        if not has_top_level_limit(statement):
+            statement = f"{statement}\nLIMIT {self.max_rows + 1}"
+
+        self._acquire()
+        started = time.perf_counter()
+        conn = sqlite3.connect(read_only_uri(self.db_path), uri=True, check_same_thread=False)
+        try:
+            estimated = self._checked_estimate(conn, statement, params)
+            conn.set_authorizer(self._authorizer(READ_ACTIONS))
+            self._deadline(conn)
+            try:
+                cursor = conn.execute(statement, params)
+                rows = []
+                while len(rows) <= self.max_rows:
+                    batch = cursor.fetchmany(min(1000, self.max_rows + 1 - len(rows)))
+                    if not batch:
+                        break
+                    rows.extend(batch)
+            except sqlite3.DatabaseError as e:
+                raise self._failure(e) from e
+            columns = [column[0] for column in cursor.description]
+        finally:
+            conn.close()
+            self._slots.release()
+
+        truncated = len(rows) > self.max_rows
+        if truncated:
+            rows = rows[:self.max_rows]
+            self._count("truncated")
+        self._count("reads")
+        frame = pd.DataFrame.from_records(rows, columns=columns)
+        return GuardedResult(frame, truncated, estimated, statement, time.perf_counter() - started)
+
+    def write(self, conn, sql, params=()):
+        """
+        Run an INSERT/UPDATE/DELETE on the caller's read-write connection
+        (so its triggers, e.g. the validator's change log, see it) and commit;
+        only write_tables may change. Returns the number of rows changed.
+        """
+        kind, statement = self._classify(sql)
+        if kind != "write":
+            self._count("rejected")
+            raise QueryRejected("Only INSERT, UPDATE and DELETE statements can modify the timetable")
+
+        self._acquire()
+        try:
+            self._checked_estimate(conn, statement, params)
+            conn.set_authorizer(self._authorizer(WRITE_ACTIONS | READ_ACTIONS | {sqlite3.SQLITE_TRANSACTION}, self.write_tables))
+            self._deadline(conn)
+            try:
+                changed = conn.execute(statement, params).rowcount
+                conn.commit()
+            except sqlite3.DatabaseError as e:
+                conn.rollback()
+                raise self._failure(e) from e
+        finally:
+            conn.set_authorizer(None)
+            conn.set_progress_handler(None, 0)
+            self._slots.release()
+        self._count("writes")
+        return changed
+
+    def _classify(self, sql):
+        try:
+            return classify(sql)
+        except QueryRejected:
+            self._count("rejected")
+            raise
+
+    def _checked_estimate(self, conn, sql, params):
+        try:
+            return self.estimate(conn, sql, params)
+        except QueryRejected:
+            self._count("rejected")
+            raise
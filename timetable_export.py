@@ -0,0 +1,325 @@
+"""
+Bulk timetable export: every section, room or faculty timetable of a branch
+(or the whole campus) for the full week, to CSV, XLSX or Parquet.
+
+Each branch is one SQL query: the slots table joined to its faculty (through
+the faculty_by_section index, matching year, section and subject by
+database.match_key as personal_timetable does) and period timings, with the other databases
+ATTACHed read-only (or the campus views after --consolidated ingest). Rows
+are fetched chunk by chunk with fetchmany and handed straight to a
+streaming writer (csv, openpyxl's write-only workbook, a pyarrow
+ParquetWriter), so memory stays flat however large the campus gets.
+
+One row per (slot, faculty member), ordered for the chosen view:
+  section - block, year, section, day, period (every slot, free ones too)
+  room    - room, day, period (slots with a room)
+  faculty - faculty name, day, period (slots with a known faculty member)
+Rows are ordered within each branch; branches follow each other.
+
+Run from the repository root:
+    python timetable_export.py --out exports/week.xlsx [--branches CSE ECE] [--by room]
+    python timetable_export.py --check [--branches CSE ECE]
+"""
+import argparse
+import csv
+import io
+import os
+import sqlite3
+import time
+
+from data_access import read_only_uri, table_source
+from database import BRANCH_CONFIG, DATABASE_DIR, DAYS, PLACEHOLDER_NAMES, faculty_owner, match_key
+
+EXPORT_COLUMNS = [
+    "branch", "block", "year", "section", "room", "strength", "day", "period",
+    "start_time", "end_time", "subject", "faculty",
+]
+
+FORMATS = ("csv", "xlsx", "parquet")
+VIEWS = ("section", "room", "faculty")
+CHUNK_SIZE = 5000
+
+# Rows on one worksheet before the XLSX writer starts the next (Excel's limit, less the header)
+XLSX_SHEET_ROWS = 1_048_575
+
+DAY_ORDER = "CASE s.day " + " ".join(f"WHEN '{day}' THEN {i}" for i, day in enumerate(DAYS)) + " END"
+
+ORDER_BY = {
+    "section": f"s.block, s.year, s.section, {DAY_ORDER}, s.period",
+    "room": f"s.room, {DAY_ORDER}, s.period, s.section",
+    "faculty": f"faculty, {DAY_ORDER}, s.period, s.section",
+}
+
+FILTERS = {
+    "section": "",
+    "room": "WHERE s.room IS NOT NULL",
+    "faculty": "WHERE f.Name IS NOT NULL",
+}
+
+
+def branch_sources(branch):
+    """(db_path, table) of the slots, faculty_by_section and timings tables of a branch; None where missing."""
+    databases = BRANCH_CONFIG[branch]["databases"]
+    sources = {}
+    for key, table in [("timetable_db", "slots"), ("faculty_db", "faculty_by_section"), ("timings_db", "timings")]:
+        db_file = databases.get(key)
+        db_path = os.path.join(DATABASE_DIR, branch, db_file) if db_file else None
+        if db_path is None or not os.path.exists(db_path):
+            sources[table] = None
+        else:
+            sources[table] = table_source(db_path, table, branch)
+    return sources
+
+
+def _sql_match_key(value):
+    return None if value is None else match_key(value)
+
+
+def _faculty_keys(conn, table):
+    # The sheets spell the same year, section and subject differently ("P & S", "p&s"), so the
+    # faculty rows are keyed by match_key once into an indexed temp table the slots join against
+    rows = conn.execute(
+        f"SELECT YEAR, section, Subject, Name FROM {table} WHERE Name IS NOT NULL AND section IS NOT NULL"
+    )
+    keys = {
+        (_sql_match_key(year), match_key(section), _sql_match_key(subject), " ".join(str(name).split()))
+        for year, section, subject, name in rows
+        if match_key(name) not in PLACEHOLDER_NAMES
+    }
+    conn.execute("CREATE TEMP TABLE faculty_keys (year_key TEXT, section_key TEXT, subject_key TEXT, Name TEXT)")
+    conn.executemany("INSERT INTO temp.faculty_keys VALUES (?, ?, ?, ?)", sorted(keys))
+    conn.execute("CREATE INDEX temp.idx_faculty_keys ON faculty_keys (year_key, section_key, subject_key)")
+
+
+def open_branch(branch, by="section"):
+    """Open a read-only connection with the branch's databases attached; returns (conn, query)."""
+    sources = branch_sources(branch)
+    if sources["slots"] is None:
+        raise FileNotFoundError(f"No timetable database for {branch}; run database.py first")
+    if by == "faculty" and sources["faculty_by_section"] is None:
+        raise FileNotFoundError(f"No faculty database for {branch}")
+
+    main_path, slots_table = sources["slots"]
+    conn = sqlite3.connect(read_only_uri(main_path), uri=True)
+    conn.create_function("match_key", 1, _sql_match_key, deterministic=True)
+    tables = {"slots": slots_table}
+    for table in ("faculty_by_section", "timings"):
+        if sources[table] is None:
+            continue
+        db_path, name = sources[table]
+        if os.path.abspath(db_path) == os.path.abspath(main_path):
+            tables[table] = name  # campus database: every view is in the one file
+        else:
+            conn.execute(f"ATTACH DATABASE ? AS {table}_db", (read_only_uri(db_path),))
+            tables[table] = f"{table}_db.{name}"
+
+    joins = []
+    faculty = "NULL"
+    if "faculty_by_section" in tables:
+        _faculty_keys(conn, tables["faculty_by_section"])
+        faculty = "f.Name"
+        joins.append(
+            "LEFT JOIN temp.faculty_keys AS f ON f.year_key = match_key(s.year) "
+            "AND f.section_key = match_key(s.section) AND f.subject_key = match_key(s.subject)"
+        )
+    timings = "NULL, NULL"
+    if "timings" in tables:
+        timings = "t.Start_Time, t.End_Time"
+        joins.append(f"LEFT JOIN {tables['timings']} AS t ON t.Period = s.period")
+
+    query = f"""
+        SELECT s.branch, s.block, s.year, s.section, s.room, s.strength, s.day, s.period,
+               {timings}, s.subject, {faculty} AS faculty
+        FROM {tables['slots']} AS s
+        {' '.join(joins)}
+        {FILTERS[by]}
+        ORDER BY {ORDER_BY[by]}
+    """
+    return conn, query
+
+
+def iter_chunks(branch, by="section", chunk_size=CHUNK_SIZE):
+    """Yield the export rows of one branch (tuples in EXPORT_COLUMNS order), chunk_size rows at a time."""
+    conn, query = open_branch(branch, by)
+    try:
+        cursor = conn.execute(query)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        conn.close()
+
+
+def faculty_coverage(branch):
+    """
+    The classes each faculty member gets in the by="faculty" export of a
+    branch, against their personal_timetable week: returns (exported,
+    materialized), sets of (owner, year, section, day, period, subject)
+    that should be equal.
+    """
+    exported = {
+        (faculty_owner(row[11]), row[2], row[3], row[6], row[7], row[10])
+        for rows in iter_chunks(branch, "faculty")
+        for row in rows
+    }
+    db_path, table = table_source(branch_sources(branch)["slots"][0], "personal_timetable", branch)
+    conn = sqlite3.connect(read_only_uri(db_path), uri=True)
+    try:
+        materialized = set(conn.execute(
+            f"SELECT owner, year, section, day, period, subject FROM {table} WHERE kind = 'faculty'"
+        ))
+    finally:
+        conn.close()
+    return exported, materialized
+
+
+class CsvWriter:
+    """Stream rows to a CSV file."""
+
+    def __init__(self, out):
+        if isinstance(out, str):
+            self.file = open(out, "w", newline="", encoding="utf-8")
+        else:
+            self.file = io.TextIOWrapper(out, newline="", encoding="utf-8", write_through=True)
+        self.owned = isinstance(out, str)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        if self.owned:
+            self.file.close()
+        else:
+            self.file.detach()  # leave the caller's buffer open
+
+
+class XlsxWriter:
+    """Stream rows to an XLSX workbook (openpyxl write-only mode), starting a new sheet at Excel's row limit."""
+
+    def __init__(self, out):
+        from openpyxl import Workbook
+
+        self.out = out
+        self.workbook = Workbook(write_only=True)
+        self.sheets = 0
+        self._new_sheet()
+
+    def _new_sheet(self):
+        self.sheets += 1
+        self.sheet = self.workbook.create_sheet("timetable" if self.sheets == 1 else f"timetable_{self.sheets}")
+        self.sheet.append(EXPORT_COLUMNS)
+        self.rows = 0
+
+    def write(self, rows):
+        for row in rows:
+            if self.rows == XLSX_SHEET_ROWS:
+                self._new_sheet()
+            self.sheet.append(row)
+            self.rows += 1
+
+    def close(self):
+        self.workbook.save(self.out)
+
+
+class ParquetWriter:
+    """Stream rows to a Parquet file, one row group per chunk."""
+
+    def __init__(self, out):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema(
+            [(column, pa.int64() if column == "strength" else pa.string()) for column in EXPORT_COLUMNS]
+        )
+        self.writer = pq.ParquetWriter(out, self.schema)
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        self.writer.write_table(self.pa.Table.from_arrays(
+            [self.pa.array(column, type=field.type) for column, field in zip(columns, self.schema)],
+            schema=self.schema,
+        ))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "xlsx": XlsxWriter, "parquet": ParquetWriter}
+
+
+def export_format(path):
+    """Output format implied by a file name's extension."""
+    fmt = os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Cannot tell the export format from {path!r}; use .csv, .xlsx or .parquet")
+    return fmt
+
+
+def export_timetables(out, branches=None, by="section", fmt=None, chunk_size=CHUNK_SIZE):
+    """
+    Write the full-week timetables of the given branches (default: every
+    branch with a timetable database, and a faculty one for by="faculty")
+    to out, a path or a binary file object (fmt is then required). Returns
+    the number of rows written.
+    """
+    fmt = fmt or export_format(out)
+    if branches is None:
+        needed = ["slots", "faculty_by_section"] if by == "faculty" else ["slots"]
+        branches = [
+            branch for branch in BRANCH_CONFIG
+            if all(branch_sources(branch)[table] is not None for table in needed)
+        ]
+    writer = WRITERS[fmt](out)
+    written = 0
+    try:
+        for branch in branches:
+            for rows in iter_chunks(branch, by, chunk_size):
+                writer.write(rows)
+                written += len(rows)
+    finally:
+        writer.close()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", help="output file: .csv, .xlsx or .parquet")
+    parser.add_argument("--branches", nargs="+", choices=list(BRANCH_CONFIG), help="default: every branch")
+    parser.add_argument("--by", choices=VIEWS, default="section", help="which timetables, i.e. the row order")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the --out extension")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows fetched and written at a time")
+    parser.add_argument(
+        "--check", action="store_true", help="compare each branch's faculty export with personal_timetable instead"
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        branches = args.branches or [
+            branch for branch in BRANCH_CONFIG if branch_sources(branch)["faculty_by_section"] is not None
+        ]
+        mismatched = False
+        for branch in branches:
+            exported, materialized = faculty_coverage(branch)
+            status = "matches" if exported == materialized else "DIFFERS from"
+            print(f"{branch}: {len(exported)} faculty classes exported, {status} personal_timetable "
+                  f"({len(materialized)} classes; {len(exported - materialized)} only exported, "
+                  f"{len(materialized - exported)} only in personal_timetable)")
+            mismatched |= exported != materialized
+        raise SystemExit(1 if mismatched else 0)
+    if not args.out:
+        parser.error("--out is required unless --check is given")
+
+    if os.path.dirname(args.out):
+        os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    start = time.perf_counter()
+    rows = export_timetables(args.out, args.branches, args.by, args.format, args.chunk_size)
+    print(f"Exported {rows} rows ({args.by} timetables) to {args.out} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""
+Generate clash-free timetables in the ingested `timetable` schema.
+
+An instance is built from the databases:
+  sections - BLOCK, YEAR, SECTION, ROOM, STRENGTH rows of each branch timetable
+  lessons  - one per weekly period of each (section, subject), with the
+             weekly hours taken from the current timetable
+  faculty  - the faculty DB rows teaching that subject to that section
+  rooms    - room_occupancy (room, block, capacity); sections keep their
+             room when it has the seats and the free periods, otherwise
+             move to the least-booked room that does (own block first)
+  periods  - the Period column of the timings DB
+
+Every lesson gets a (day, period) slot such that no section, faculty member
+or room is used twice in the same slot (labs book no room: the sheets do
+not say which lab). A greedy pass places lessons most
+constrained first; min-conflicts local search with incremental conflict
+counts (and a short tabu list) then repairs whatever is left.
+
+Run from the repository root:
+    python timetable_generator.py [--branches CSE ECE] [--out Generated] [--seed 0] [--time-limit 60]
+"""
+import argparse
+import os
+import random
+import re
+import sqlite3
+import time
+
+import pandas as pd
+
+from data_access import read_only_uri
+from database import BRANCH_CONFIG, DATABASE_DIR, DAYS, FREE_SUBJECTS, PERIODS, faculty_owner, match_key, write_slots
+from faculty_analysis import PLACEHOLDER_NAMES, _key, display_names, expand_sections
+
+SECTION_COLUMNS = ["BLOCK", "YEAR", "SECTION", "ROOM", "STRENGTH"]
+FILLER = "leisure"  # what the sheets put in an empty period
+# Labs run in the lab, not the section's room: "CN Lab", "ENG LAB", "SE L"
+LAB_PATTERN = re.compile(r"\blab\b|\sL$", re.IGNORECASE)
+TABU_TENURE = 10
+RANDOM_WALK = 0.02
+
+
+class Instance:
+    """
+    Sections, rooms, lessons and the slot grid of a generation problem.
+
+    lessons is a list of (section index, subject, faculty names, in home
+    room); each lesson is one period. Faculty names are display spellings
+    (faculty_analysis.display_names), one per person. sections is a DataFrame with SECTION_COLUMNS plus
+    branch.
+    """
+
+    def __init__(self, sections, lessons, periods=PERIODS, days=DAYS, rooms=None):
+        self.sections = sections.reset_index(drop=True)
+        self.lessons = lessons
+        self.periods = list(periods)
+        self.days = list(days)
+        self.rooms = rooms
+        self.slots = [(day, period) for day in self.days for period in self.periods]
+
+    def __repr__(self):
+        return f"Instance({len(self.sections)} sections, {len(self.lessons)} lessons, {len(self.slots)} slots)"
+
+
+def _read(db_path, query):
+    conn = sqlite3.connect(read_only_uri(db_path), uri=True)
+    try:
+        return pd.read_sql_query(query, conn)
+    finally:
+        conn.close()
+
+
+def assign_rooms(sections, rooms, hours, n_slots):
+    """
+    Give every section a room with enough seats and enough free periods.
+
+    A section keeps its room when it fits and the room's weekly periods are
+    not used up by sections placed before it (biggest first); otherwise it
+    gets the least-booked fitting room of its block, then of any block.
+    """
+    sections = sections.copy()
+    if rooms is None or rooms.empty:
+        return sections
+    capacity = dict(zip(rooms["room"], rooms["capacity"].fillna(0)))
+    blocks = dict(zip(rooms["room"], rooms["block"]))
+    booked = dict.fromkeys(capacity, 0)
+    for i in sorted(sections.index, key=lambda i: -hours.get(i, 0)):
+        need, strength, block = hours.get(i, 0), sections.at[i, "STRENGTH"] or 0, sections.at[i, "BLOCK"]
+        fits = [room for room in capacity if capacity[room] >= strength and booked[room] + need <= n_slots]
+        current = sections.at[i, "ROOM"]
+        if current in fits:
+            room = current
+        elif fits:
+            room = min(fits, key=lambda room: (blocks[room] != block, booked[room], room))
+        else:
+            continue  # nothing fits; keep what the sheet says and let the solver report the clash
+        booked[room] += need
+        sections.at[i, "ROOM"] = room
+    return sections
+
+
+def load_instance(branches=None, branch_config=BRANCH_CONFIG, database_dir=DATABASE_DIR):
+    """Build an Instance for the given branches (default: all) from their databases."""
+    branches = branches or list(branch_config)
+    sections, slots, faculty, rooms, periods = [], [], [], [], None
+    for branch in branches:
+        databases = branch_config[branch]["databases"]
+        timetable_db = os.path.join(database_dir, branch, databases["timetable_db"])
+        sections.append(_read(timetable_db, f"SELECT {', '.join(SECTION_COLUMNS)} FROM timetable").assign(branch=branch))
+        slots.append(_read(timetable_db, "SELECT branch, block, year, section, subject FROM slots"))
+        rooms.append(_read(timetable_db, "SELECT room, block, capacity FROM room_occupancy"))
+        if databases.get("faculty_db"):
+            faculty_db = os.path.join(database_dir, branch, databases["faculty_db"])
+            if os.path.exists(faculty_db):
+                faculty.append(_read(faculty_db, "SELECT YEAR, Subject, Name, sections FROM faculty").assign(branch=branch))
+        if periods is None and databases.get("timings_db"):
+            timings = _read(os.path.join(database_dir, branch, databases["timings_db"]), "SELECT Period FROM timings")
+            periods = [period for period in timings["Period"].astype(str).str.strip() if period in PERIODS]
+
+    sections = pd.concat(sections, ignore_index=True)
+    rooms = pd.concat(rooms, ignore_index=True).groupby("room", as_index=False).agg(
+        block=("block", "first"), capacity=("capacity", "max")
+    )
+    slots = pd.concat(slots, ignore_index=True)
+    faculty = pd.concat(faculty, ignore_index=True) if faculty else pd.DataFrame(
+        columns=["branch", "YEAR", "Subject", "Name", "sections"]
+    )
+    return build_instance(sections, slots, faculty, periods or PERIODS, rooms=rooms)
+
+
+def build_instance(sections, slots, faculty, periods=PERIODS, rooms=None):
+    """
+    Turn section rows, slot rows (for weekly hours) and faculty rows into an Instance.
+
+    Weekly hours of a (section, subject) are the number of its non-leisure
+    slot rows; its faculty are the faculty rows naming that subject and
+    section (placeholders such as "NO FACULTY" left out; spellings of one
+    person, "MR.B.PRASAD" and "Mr. B. Prasad", are one name). Lab lessons do not
+    book the section's room. Rooms are then reassigned with assign_rooms
+    (counting only the periods spent in the room) when room rows are given.
+    """
+    sections = sections.reset_index(drop=True)
+    section_index = {
+        key: i for i, key in enumerate(zip(sections["branch"], sections["BLOCK"], sections["YEAR"], sections["SECTION"]))
+    }
+    taught = slots.dropna(subset=["subject"])
+    taught = taught[~taught["subject"].astype(str).str.strip().str.lower().isin(FREE_SUBJECTS)]
+    hours = taught.groupby(["branch", "block", "year", "section", "subject"]).size()
+
+    staff = {}
+    if not faculty.empty:
+        expanded = expand_sections(faculty)
+        expanded = expanded[~_key(expanded["Name"]).isin(PLACEHOLDER_NAMES)]
+        expanded = expanded.assign(
+            year_key=_key(expanded["YEAR"]), section_key=_key(expanded["section"]), subject_key=_key(expanded["Subject"]),
+            name=display_names(expanded["Name"]),
+        )
+        for branch, year, section, subject, name in zip(
+            expanded["branch"], expanded["year_key"], expanded["section_key"], expanded["subject_key"], expanded["name"]
+        ):
+            staff.setdefault((branch, year, section, subject), set()).add(name)
+
+    lessons = []
+    for (branch, block, year, section, subject), count in hours.items():
+        i = section_index.get((branch, block, year, section))
+        if i is None:
+            continue
+        key = (branch, match_key(year), match_key(section), match_key(subject))
+        names = tuple(sorted(staff.get(key, ())))
+        in_room = not LAB_PATTERN.search(str(subject).strip())
+        lessons.extend([(i, subject, names, in_room)] * int(count))
+
+    instance = Instance(sections, lessons, periods, rooms=rooms)
+    section_hours = {}
+    for i, _, _, in_room in lessons:
+        section_hours[i] = section_hours.get(i, 0) + in_room
+    instance.sections = assign_rooms(sections, rooms, section_hours, len(instance.slots))
+    return instance
+
+
+class Solver:
+    """
+    Slot assignment by greedy construction plus min-conflicts local search.
+
+    Each lesson uses a set of resources (its section, its room, its faculty,
+    keyed by database.faculty_owner as personal_timetable is);
+    occupancy counts per (resource, slot) are updated on every move, so a
+    move costs O(resources of the lesson), and the set of conflicted lessons
+    is maintained alongside. conflicts is the number of extra bookings:
+    the sum over (resource, slot) of max(0, count - 1).
+    """
+
+    def __init__(self, instance, seed=0):
+        self.instance = instance
+        self.random = random.Random(seed)
+        self.n_slots = len(instance.slots)
+        resource_ids = {}
+
+        def rid(key):
+            return resource_ids.setdefault(key, len(resource_ids))
+
+        sections = instance.sections
+        # Resources per lesson: section, room (when the section has one) and faculty
+        section_keys = list(zip(sections["branch"], sections["BLOCK"], sections["YEAR"], sections["SECTION"]))
+        section_rooms = list(sections["ROOM"])
+        self.resources = [
+            tuple(
+                [rid(("section", section_keys[section]))]
+                + ([rid(("room", section_rooms[section]))] if in_room and isinstance(section_rooms[section], str) else [])
+                + [rid(("faculty", owner)) for owner in dict.fromkeys(map(faculty_owner, names))]
+            )
+            for section, _, names, in_room in instance.lessons
+        ]
+        self.n_resources = len(resource_ids)
+        self.occupancy = [0] * (self.n_resources * self.n_slots)
+        self.at = {}  # resource * n_slots + slot -> set of lessons
+        self.assignment = [-1] * len(instance.lessons)
+        self.conflicts = 0
+        self.conflicted = set()
+        self.tabu = {}
+        self.steps = 0
+
+    def _cell(self, resource, slot):
+        return resource * self.n_slots + slot
+
+    def cost(self, lesson, slot):
+        """Extra bookings the lesson would create (or keeps) at slot."""
+        current = self.assignment[lesson] == slot
+        return sum(self.occupancy[self._cell(r, slot)] - current for r in self.resources[lesson])
+
+    def _place(self, lesson, slot):
+        for r in self.resources[lesson]:
+            cell = self._cell(r, slot)
+            count = self.occupancy[cell]
+            if count >= 1:
+                self.conflicts += 1
+            self.occupancy[cell] = count + 1
+            lessons = self.at.setdefault(cell, set())
+            lessons.add(lesson)
+            if count >= 1:
+                self.conflicted.update(lessons)
+        self.assignment[lesson] = slot
+
+    def _remove(self, lesson):
+        slot = self.assignment[lesson]
+        touched = set()
+        for r in self.resources[lesson]:
+            cell = self._cell(r, slot)
+            count = self.occupancy[cell] - 1
+            self.occupancy[cell] = count
+            if count >= 1:
+                self.conflicts -= 1
+            lessons = self.at[cell]
+            lessons.discard(lesson)
+            touched.update(lessons)
+        self.assignment[lesson] = -1
+        self.conflicted.discard(lesson)
+        # Neighbours may have been freed by this lesson leaving
+        for other in touched:
+            if not self._is_conflicted(other):
+                self.conflicted.discard(other)
+
+    def _is_conflicted(self, lesson):
+        slot = self.assignment[lesson]
+        return slot >= 0 and any(self.occupancy[self._cell(r, slot)] > 1 for r in self.resources[lesson])
+
+    def move(self, lesson, slot):
+        if self.assignment[lesson] >= 0:
+            self._remove(lesson)
+        self._place(lesson, slot)
+
+    def greedy(self):
+        """Place lessons most constrained first (busiest resources), each at its cheapest slot."""
+        load = [0] * self.n_resources
+        for resources in self.resources:
+            for r in resources:
+                load[r] += 1
+        order = sorted(range(len(self.resources)), key=lambda i: -max(load[r] for r in self.resources[i]))
+        slots = list(range(self.n_slots))
+        for lesson in order:
+            self.random.shuffle(slots)
+            self._place(lesson, min(slots, key=lambda slot: self.cost(lesson, slot)))
+
+    def local_search(self, max_steps=None, time_limit=None):
+        """Min-conflicts repair until no conflicts, max_steps or time_limit seconds."""
+        deadline = time.perf_counter() + time_limit if time_limit else None
+        slots = range(self.n_slots)
+        while self.conflicts and (max_steps is None or self.steps < max_steps):
+            if deadline and not self.steps % 256 and time.perf_counter() > deadline:
+                break
+            self.steps += 1
+            lesson = self.random.choice(tuple(self.conflicted))
+            current = self.assignment[lesson]
+            if self.random.random() < RANDOM_WALK:
+                best = self.random.randrange(self.n_slots)
+            else:
+                best, best_cost = current, None
+                for slot in slots:
+                    if slot != current and self.tabu.get((lesson, slot), 0) > self.steps:
+                        continue
+                    cost = self.cost(lesson, slot) + self.random.random() * 0.5  # random tie-breaking
+                    if best_cost is None or cost < best_cost:
+                        best, best_cost = slot, cost
+            if best != current:
+                self.tabu[(lesson, current)] = self.steps + TABU_TENURE
+                self.move(lesson, best)
+        return self.conflicts
+
+    def solve(self, max_steps=None, time_limit=None):
+        """Greedy then local search; returns remaining conflicts (0 = feasible)."""
+        self.greedy()
+        return self.local_search(max_steps, time_limit)
+
+    def timetable(self):
+        """The solution as wide timetable rows (SECTION_COLUMNS + DAY_Pn) plus branch."""
+        instance = self.instance
+        grid = [{} for _ in range(len(instance.sections))]
+        for lesson, slot in enumerate(self.assignment):
+            section, subject, _, _ = instance.lessons[lesson]
+            day, period = instance.slots[slot]
+            grid[section][f"{day}_{period}"] = subject
+        columns = [f"{day}_{period}" for day in DAYS for period in PERIODS]
+        cells = pd.DataFrame(grid, columns=columns).fillna(FILLER)
+        return pd.concat([instance.sections[SECTION_COLUMNS + ["branch"]], cells], axis=1)
+
+
+def write_timetables(timetable, out_dir, branch_config=BRANCH_CONFIG):
+    """Write one <branch>/<timetable_db> per branch in the ingest schema (timetable + slots + room_occupancy)."""
+    written = []
+    for branch, rows in timetable.groupby("branch"):
+        db_dir = os.path.join(out_dir, branch)
+        os.makedirs(db_dir, exist_ok=True)
+        db_file = os.path.join(db_dir, branch_config[branch]["databases"]["timetable_db"])
+        conn = sqlite3.connect(db_file)
+        with conn:
+            rows.drop(columns="branch").to_sql("timetable", conn, index=False, if_exists="replace")
+        conn.close()
+        write_slots(db_file, branch)
+        written.append(db_file)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--branches", nargs="+", choices=list(BRANCH_CONFIG), help="default: every branch")
+    parser.add_argument("--out", default="Generated", help="directory for the generated databases")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=60.0, help="seconds of local search")
+    args = parser.parse_args()
+
+    instance = load_instance(args.branches)
+    print(instance)
+    solver = Solver(instance, seed=args.seed)
+    start = time.perf_counter()
+    solver.greedy()
+    print(f"Greedy: {solver.conflicts} conflicts in {time.perf_counter() - start:.2f}s")
+    solver.local_search(time_limit=args.time_limit)
+    print(f"Local search: {solver.conflicts} conflicts after {solver.steps} steps, {time.perf_counter() - start:.2f}s total")
+    for db_file in write_timetables(solver.timetable(), args.out):
+        print(f"Wrote {db_file}")
+    if solver.conflicts:
+        print("Warning: no clash-free timetable found within the time limit; the output still has clashes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import functools
+import gc
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+
+from database import PLACEHOLDER_NAMES, match_key
+
+# Columns that must not be double-booked in one (DAY, TIME) slot
+RESOURCE_COLUMNS = ["CLASS", "PROFESSOR", "ROOM"]
+SLOT_COLUMNS = ["DAY", "TIME"]
+CHANGE_TABLE = "timetable_changes"
+MAX_REPAIRS = 3
+
+Clash = namedtuple("Clash", "column value day time rows")
+Repair = namedtuple("Repair", "row column old new sql")
+
+
+@functools.lru_cache(maxsize=65536)
+def _norm(value):
+    # "Room 101" and "room  101" are the same room; NULL/blank books nothing
+    if value is None:
+        return None
+    value = " ".join(str(value).upper().split())
+    return value or None
+
+
+@functools.lru_cache(maxsize=65536)
+def _resource_key(col, value):
+    # Pseudo-faculty ("PROJECT GUIDE", "NPTEL") stand for many people, so they never clash
+    key = _norm(value)
+    if col == "PROFESSOR" and key is not None and match_key(key) in PLACEHOLDER_NAMES:
+        return None
+    return key
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _stamp(db_path):
+    try:
+        stat = os.stat(db_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def install_change_log(conn, table="TIMETABLE"):
+    """
+    Log every row a statement on this connection touches into temp.timetable_changes.
+
+    Temp triggers record the rowid of deleted rows and the slot and resource
+    values of inserted ones (an UPDATE logs both), so the validator can
+    follow any SQL, hand-written or generated, without re-reading the table.
+    Returns False when the table does not exist.
+    """
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+    if not columns:
+        return False
+    logged = SLOT_COLUMNS + RESOURCE_COLUMNS
+    new_values = ", ".join(f'NEW."{col}"' if col in columns else "NULL" for col in logged)
+    conn.execute(
+        f"CREATE TEMP TABLE IF NOT EXISTS {CHANGE_TABLE} "
+        f"(seq INTEGER PRIMARY KEY, row INTEGER, present INTEGER, {', '.join(logged)})"
+    )
+    deleted = f"INSERT INTO {CHANGE_TABLE} (row, present) VALUES (OLD.rowid, 0);"
+    inserted = f"INSERT INTO {CHANGE_TABLE} (row, present, {', '.join(logged)}) VALUES (NEW.rowid, 1, {new_values});"
+    for event, body in [("INSERT", inserted), ("DELETE", deleted), ("UPDATE", deleted + inserted)]:
+        conn.execute(
+            f'CREATE TEMP TRIGGER IF NOT EXISTS timetable_log_{event.lower()} AFTER {event} ON main."{table}" '
+            f"BEGIN {body} END"
+        )
+    return True
+
+
+class TimetableValidator:
+    """
+    In-memory room/professor/class occupancy of one TIMETABLE, kept in step edit by edit.
+
+    The table is read once; after that every statement run on a watched
+    connection is replayed from the change log, so the cost of an edit is
+    the number of rows it touched. Only the (resource, slot) cells those
+    rows left or entered are checked for clashes, and each clash comes with
+    single-row repairs: another free room at the same time, or another slot
+    where the class, professor and room are all free.
+    """
+
+    def __init__(self, db_path, table="TIMETABLE"):
+        self.db_path = db_path
+        self.table = table
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._schema_version = None
+        self.rows = {}  # rowid -> (slot, resource keys, (day, time) and resource values as stored)
+        self.cells = {}  # (column, value, slot) -> set of rowids
+        self.slots = {}  # slot -> its spelling in the table, e.g. ("Monday", "10:00 AM")
+        self.values = {col: {} for col in RESOURCE_COLUMNS}  # column -> value -> row count
+        self.names = {col: {} for col in RESOURCE_COLUMNS}  # column -> value -> its spelling in the table
+        self.changed = set()  # rows written by the last replayed edit
+
+    def _add(self, row, day, time, resources):
+        # resources: values of RESOURCE_COLUMNS in order, as stored
+        slot = (_norm(day), _norm(time))
+        keys = tuple(_resource_key(col, value) for col, value in zip(RESOURCE_COLUMNS, resources))
+        self.rows[row] = (slot, keys, (day, time), resources)
+        touched = []
+        if None in slot:
+            return touched  # not scheduled anywhere, so it cannot clash
+        self.slots.setdefault(slot, (day, time))
+        for col, value, stored in zip(RESOURCE_COLUMNS, keys, resources):
+            if value is None:
+                continue
+            self.values[col][value] = self.values[col].get(value, 0) + 1
+            self.names[col].setdefault(value, stored)
+            cell = (col, value, slot)
+            rows = self.cells.get(cell)
+            if rows is None:
+                self.cells[cell] = {row}
+            else:
+                rows.add(row)
+            touched.append(cell)
+        return touched
+
+    def _remove(self, row):
+        if row not in self.rows:
+            return []
+        slot, keys, _, _ = self.rows.pop(row)
+        touched = []
+        if None in slot:
+            return touched
+        for col, value in zip(RESOURCE_COLUMNS, keys):
+            if value is None:
+                continue
+            self.values[col][value] -= 1
+            cell = (col, value, slot)
+            self.cells[cell].discard(row)
+            touched.append(cell)
+        return touched
+
+    def load(self, conn=None):
+        """Rebuild the index from the whole table (once, or after an outside change)."""
+        own = conn is None
+        conn = conn or sqlite3.connect(self.db_path)
+        try:
+            self.rows, self.cells, self.slots, self.changed = {}, {}, {}, set()
+            self.values = {col: {} for col in RESOURCE_COLUMNS}
+            self.names = {col: {} for col in RESOURCE_COLUMNS}
+            columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{self.table}")')]
+            if columns:
+                select = ", ".join(f'"{col}"' if col in columns else "NULL" for col in SLOT_COLUMNS + RESOURCE_COLUMNS)
+                # Millions of small tuples and sets, none of them cyclic: the collector would only rescan them
+                collecting = gc.isenabled()
+                gc.disable()
+                try:
+                    for row, day, time, *resources in conn.execute(f'SELECT rowid, {select} FROM "{self.table}"'):
+                        self._add(row, day, time, tuple(resources))
+                finally:
+                    if collecting:
+                        gc.enable()
+            self._schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        finally:
+            if own:
+                conn.close()
+        self._stamp = _stamp(self.db_path)
+        return self
+
+    def watch(self, conn):
+        """Install the change log on a connection about to modify the table, reloading first if the file moved on."""
+        with self._lock:
+            if self._stamp is None or self._stamp != _stamp(self.db_path):
+                self.load(conn)
+        return install_change_log(conn, self.table)
+
+    def apply_changes(self, conn):
+        """
+        Replay the committed change log of a watched connection and clear it.
+
+        Returns the clashes in the cells the changes touched. A schema change
+        (the table dropped, recreated or altered) falls back to a full reload
+        and a check of every cell.
+        """
+        with self._lock:
+            if conn.execute(f"SELECT 1 FROM sqlite_temp_master WHERE name = '{CHANGE_TABLE}'").fetchone() is None:
+                return []
+            changes = conn.execute(
+                f"SELECT row, present, {', '.join(SLOT_COLUMNS + RESOURCE_COLUMNS)} FROM temp.{CHANGE_TABLE} ORDER BY seq"
+            ).fetchall()
+            conn.execute(f"DELETE FROM temp.{CHANGE_TABLE}")
+            conn.commit()
+            if conn.execute("PRAGMA schema_version").fetchone()[0] != self._schema_version:
+                self.load(conn)
+                return self.clashes(list(self.cells))
+
+            touched = set()
+            self.changed = set()
+            for row, present, day, time, *resources in changes:
+                touched.update(self._remove(row))
+                if present:
+                    touched.update(self._add(row, day, time, tuple(resources)))
+                    self.changed.add(row)
+            self._stamp = _stamp(self.db_path)
+            return self.clashes(touched)
+
+    def clashes(self, cells):
+        """Clashes among the given (column, value, slot) cells."""
+        found = []
+        for cell in cells:
+            rows = self.cells.get(cell)
+            if rows and len(rows) > 1:
+                col, value, slot = cell
+                day, time = self.rows[min(rows)][2]
+                found.append(Clash(col, value, day, time, sorted(rows)))
+        return sorted(found)
+
+    def _free(self, col, value, slot, ignore):
+        rows = self.cells.get((col, value, slot))
+        return not rows or rows == {ignore}
+
+    def propose_repairs(self, clash, limit=MAX_REPAIRS):
+        """
+        Single-row moves that clear a clash, cheapest first.
+
+        Rows changed by the last edit are moved before older ones. For a room
+        clash, a room already in use elsewhere in the timetable that is free
+        in this slot; for any clash, another (DAY, TIME) slot where the row's
+        class, professor and room are all free.
+        """
+        rows = sorted(clash.rows, key=lambda row: (row not in self.changed, -row))
+        repairs = []
+        for row in rows:
+            slot, keys, stored_slot, stored = self.rows[row]
+            if clash.column == "ROOM":
+                room_index = RESOURCE_COLUMNS.index("ROOM")
+                for room, count in self.values["ROOM"].items():
+                    if count and room != keys[room_index] and self._free("ROOM", room, slot, row):
+                        repairs.append(self._repair(row, "ROOM", stored[room_index], self.names["ROOM"][room]))
+                        break
+            for other in self.slots:
+                if other == slot:
+                    continue
+                if all(key is None or self._free(col, key, other, row) for col, key in zip(RESOURCE_COLUMNS, keys)):
+                    repairs.append(self._repair(row, "DAY, TIME", stored_slot, self.slots[other]))
+                    break
+            if len(repairs) >= limit:
+                break
+        return repairs[:limit]
+
+    def _repair(self, row, column, old, new):
+        if column == "ROOM":
+            sql = f"UPDATE {self.table} SET ROOM = {_literal(new)} WHERE rowid = {row}"
+        else:
+            sql = f"UPDATE {self.table} SET DAY = {_literal(new[0])}, TIME = {_literal(new[1])} WHERE rowid = {row}"
+        return Repair(row, column, old, new, sql)
@@ -1,28 +1,27 @@
 import streamlit as st
 import pandas as pd
-import sqlite3
+from campus_config import BRANCH_CONFIG
+from viewer_data import read_sql
 
 # Database configuration
-db_file = 'timings.db'  # SQLite database file
+db_file = BRANCH_CONFIG["CSE"]["timings_db"]  # SQLite database file (shared campus config)
 table_name = 'timings'  # Table name in the database
 
 # Function to retrieve unique periods from the database
-def get_periods(conn):
+def get_periods():
     """
-    Retrieves a list of unique periods from the database.
+    Retrieves a list of unique periods from the database (through the shared result cache).
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT DISTINCT Period FROM {table_name}")
-        periods = cursor.fetchall()
-        periods = [str(row[0]) for row in periods if row[0] is not None]  # Convert to string and filter None
+        periods = read_sql(db_file, f"SELECT DISTINCT Period FROM {table_name}")["Period"]
+        periods = [str(period) for period in periods if period is not None]  # Convert to string and filter None
         return sorted(set(periods))  # Return sorted, unique periods
     except Exception as e:
         st.error(f"Error retrieving periods: {e}")
         return []
 
 # Function to retrieve timetable based on selected period
-def get_timetable(conn, period=None):
+def get_timetable(period=None):
     """
     Retrieves timetable data filtered by period.
     """
@@ -36,7 +35,7 @@ def get_timetable(conn, period=None):
 
     # Execute the query and return results as a DataFrame
     try:
-        df = pd.read_sql_query(query, conn, params=params)
+        df = read_sql(db_file, query, params)
         return df
     except Exception as e:
         st.error(f"Error retrieving timetable: {e}")
@@ -54,13 +53,6 @@ st.set_page_config(
 def main():
     st.title("CSE Timetable Viewer")  # App title
 
-    # Connect to SQLite database
-    try:
-        conn = sqlite3.connect(db_file)
-    except Exception as e:
-        st.error(f"Error connecting to database: {e}")
-        return
-
     # Sidebar for filter options
     st.sidebar.title("Filter Timetable")
 
@@ -68,12 +60,11 @@ def main():
     branch = st.sidebar.selectbox("Select Branch", ["CSE"])  # Branch filter (static)
 
     # Retrieve periods from the database
-    periods = get_periods(conn)
+    periods = get_periods()
 
     # Check if periods were successfully retrieved
     if not periods:
         st.error("Unable to retrieve data from the database. Please check the database connection and table contents.")
-        conn.close()
         return
 
     # Sidebar dropdown menu for periods
@@ -85,7 +76,7 @@ def main():
     # Fetch and display timetable when the button is clicked
     if st.sidebar.button("Get Timetable"):
         try:
-            timetable_df = get_timetable(conn, period)  # Retrieve timetable
+            timetable_df = get_timetable(period)  # Retrieve timetable
 
             if not timetable_df.empty:
                 # Display filters applied
@@ -107,9 +98,6 @@ def main():
         except Exception as e:
             st.error(f"An error occurred: {e}")  # Error message
 
-    # Close database connection
-    conn.close()
-
 # Run the app
 if __name__ == "__main__":
     main()
@@ -0,0 +1,68 @@
+import altair as alt
+import streamlit as st
+from room_utilization import analyse, overall, select
+from viewer_data import export_to_csv, get_room_grid
+
+# Function to format a 0-1 rate column as a percentage bar
+def rate_column(label):
+    return st.column_config.ProgressColumn(label, format="percent", min_value=0, max_value=1)
+
+# Function to draw the idle-room heatmap (days down, periods across)
+def idle_chart(idle):
+    cells = idle.rename(index=str.title).reset_index().melt(id_vars="day", var_name="period", value_name="idle_rooms")
+    return alt.Chart(cells).mark_rect().encode(
+        x=alt.X("period:O", title="Period"),
+        y=alt.Y("day:O", title="Day", sort=list(cells["day"].unique())),
+        color=alt.Color("idle_rooms:Q", title="Idle rooms", scale=alt.Scale(scheme="greens")),
+        tooltip=["day", "period", "idle_rooms"],
+    )
+
+# Streamlit App
+st.title("Room Utilization")
+
+grid = get_room_grid()
+if not len(grid.rooms):
+    st.warning("No room timetables found. Run database.py to ingest the timetables first.")
+    st.stop()
+
+# Sidebar: block filter
+st.sidebar.header("Filter")
+block = st.sidebar.selectbox("Block", ["All blocks"] + sorted(set(grid.blocks)))
+block = None if block == "All blocks" else block
+report = analyse(grid, block=block)
+rooms = report["rooms"]
+
+# Headline figures over the selected rooms
+totals = overall(select(grid, block))
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Rooms", totals["rooms"])
+col2.metric("Occupancy", f"{totals['occupancy']:.0%}")
+col3.metric("Seat utilization", f"{totals['seat_utilization']:.0%}")
+col4.metric("Idle room-slots per week", totals["idle_slots"])
+
+if block is None:
+    st.write("### By block")
+    st.dataframe(
+        report["blocks"],
+        hide_index=True,
+        column_config={"occupancy": rate_column("Occupancy"), "seat_utilization": rate_column("Seat utilization")},
+    )
+
+st.write("### By period")
+st.bar_chart(report["periods"], x="period", y="occupancy")
+
+st.write("### Idle rooms per slot")
+st.altair_chart(idle_chart(report["idle"]))
+
+st.write("### By room (least used first)")
+st.dataframe(
+    rooms,
+    hide_index=True,
+    column_config={"occupancy": rate_column("Occupancy"), "seat_utilization": rate_column("Seat utilization")},
+)
+st.download_button(
+    label="Download Room Utilization as CSV",
+    data=export_to_csv(rooms),
+    file_name="room_utilization.csv",
+    mime="text/csv",
+)
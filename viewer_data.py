@@ -0,0 +1,65 @@
+import io
+
+import streamlit as st
+
+from campus_config import BRANCH_CONFIG
+from data_access import ConnectionPool, QueryCache, table_source
+from personal_timetable import PersonalTimetables
+from room_index import RoomIndex
+from room_utilization import build_grid, load_slots, sources_stamp
+from timetable_export import export_timetables
+
+# Defined once here (not in each page) so every page of the app shares one
+# cache entry: st.cache_resource keys on the function's module and name.
+
+# Shared read-only connection pool, reused across sessions, reruns and pages
+@st.cache_resource
+def get_pool():
+    return ConnectionPool().warm()
+
+# Query results shared by every page, kept until the next ingest bumps the database version
+@st.cache_resource
+def get_query_cache():
+    return QueryCache(get_pool())
+
+# Function to run a read query through the result cache
+def read_sql(db_path, query, params=()):
+    return get_query_cache().read_sql(db_path, query, params)
+
+# Campus-wide room occupancy bitmaps, reloaded when ingest rewrites the databases
+@st.cache_resource
+def get_room_index():
+    return RoomIndex()
+
+# Personal week lookups, answered through the shared result cache
+@st.cache_resource
+def get_personal_timetables():
+    return PersonalTimetables(get_query_cache())
+
+# Rooms x days x periods utilization grid, built once per version of the source databases
+@st.cache_resource(max_entries=1)
+def _room_grid(stamp):
+    return build_grid(load_slots([path for path, _, _ in stamp]))
+
+# Function to get the utilization grid, rebuilt when ingest rewrites the databases
+def get_room_grid():
+    return _room_grid(sources_stamp())
+
+# Function to retrieve period timings (all periods, or only the given ones)
+def get_period_timings(branch, periods=None):
+    db_path, table = table_source(BRANCH_CONFIG[branch]["timings_db"], "timings", branch)
+    query = f"SELECT Period, Start_Time, End_Time FROM {table}"
+    if periods is None:
+        return read_sql(db_path, query)
+    placeholders = ",".join(["?"] * len(periods))
+    return read_sql(db_path, f"{query} WHERE Period IN ({placeholders})", list(periods))
+
+# Function to export results to CSV
+def export_to_csv(dataframe, filename="timetable_results.csv"):
+    return dataframe.to_csv(index=False).encode('utf-8')
+
+# Function to export every section (or room / faculty) timetable of a branch for the whole week
+def export_week(branch, by="section", fmt="csv"):
+    buffer = io.BytesIO()
+    export_timetables(buffer, [branch], by=by, fmt=fmt)
+    return buffer.getvalue()
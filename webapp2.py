@@ -3,20 +3,35 @@ import pandas as pd
 import sqlite3
 from dotenv import load_dotenv
 import os
+import time
 import google.generativeai as genai
 import plotly.express as px
 
+from bulk_upload import apply_upload, stage_frame
+from column_mapping import ColumnMapper
+from dashboard_stats import install_dashboard_stats, period_utilization, read_dashboard_stats
+from llm_client import AsyncLLMClient, GeminiBackend, LLMError
+from pagination import DEFAULT_PAGE_SIZE, PAGE_SIZES, FramePager, KeysetPager
+from query_planner import QueryPlanner
+from sql_cache import SQLCache, schema_fingerprint
+from sql_guard import QueryRejected, SQLGuard
+from timetable_validator import TimetableValidator
+
 # Load environment variables
 load_dotenv()
 
 # Configure Google API key
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
-# Function to load Google Gemini Pro model
+# Function to load the Google Gemini Pro client (once per process; shares one
+# deadline/retry/concurrency-limited event loop across every session)
+@st.cache_resource
+def get_llm_client():
+    return AsyncLLMClient(GeminiBackend('gemini-pro'), timeout=30, stall_timeout=15)
+
+# Function to get a response from the Gemini Pro model
 def get_gemini_response(prompt):
-    model = genai.GenerativeModel('gemini-pro')
-    response = model.generate_content([prompt])
-    return response.text
+    return get_llm_client().generate(prompt)
 
 # Function to generate SQL query using prompt and question
 def generate_sql_query(prompt, question):
@@ -24,21 +39,105 @@ def generate_sql_query(prompt, question):
     sql_query = get_gemini_response(full_prompt).strip()
     return sql_query
 
+# Function to stream the SQL query chunk by chunk as the model writes it
+def stream_sql_query(prompt, question):
+    return get_llm_client().stream(f"{prompt}\n{question}")
+
+# Function to get the question -> SQL cache shared by every session
+@st.cache_resource
+def get_sql_cache():
+    return SQLCache()
+
+# Function to get the rule-based planner for a database, shared by every session
+@st.cache_resource
+def get_query_planner(db_path):
+    return QueryPlanner(db_path)
+
+# Function to get the room/professor/class occupancy index of a database, shared by every session
+@st.cache_resource
+def get_timetable_validator(db_path):
+    return TimetableValidator(db_path)
+
+# Function to get the limits generated SQL runs under (time budget, row cap, plan cost), shared by every session
+@st.cache_resource
+def get_sql_guard(db_path):
+    return SQLGuard(db_path)
+
 # Function to execute an SQL query on the database
+# (only INSERT/UPDATE/DELETE on TIMETABLE, under the guard's limits;
+# returns the clashes it introduced; only the slots it touched are checked)
 def execute_sql_query(sql, db):
+    validator = get_timetable_validator(db)
     conn = sqlite3.connect(db)
-    cur = conn.cursor()
-    cur.execute(sql)
-    conn.commit()
-    conn.close()
+    try:
+        validator.watch(conn)
+        get_sql_guard(db).write(conn, sql)
+        clashes = validator.apply_changes(conn)
+    finally:
+        conn.close()
+    return clashes
+
+# Function to show clashes with the single-row moves that would fix them
+def show_clashes(clashes, db_path):
+    if not clashes:
+        return
+    validator = get_timetable_validator(db_path)
+    st.markdown('<div class="error">', unsafe_allow_html=True)
+    st.write(f"Warning: this change introduced {len(clashes)} clash(es).")
+    for clash in clashes:
+        st.write(f"{clash.column.title()} {clash.value} is booked {len(clash.rows)} times on {clash.day} at {clash.time}.")
+        repairs = validator.propose_repairs(clash)
+        if repairs:
+            st.write("Suggested repairs (run one as a modification):")
+            st.dataframe(pd.DataFrame(repairs))
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# Function to run generated SQL read-only, within the guard's time budget and row cap
+def guarded_read_sql_query(sql, db, params=()):
+    return get_sql_guard(db).read(sql, params)
 
 # Function to retrieve query results from the database 
-def read_sql_query(sql, db):
+def read_sql_query(sql, db, params=()):
     conn = sqlite3.connect(db)
-    df = pd.read_sql_query(sql, conn)
+    df = pd.read_sql_query(sql, conn, params=params)
     conn.close()
     return df
 
+# Function to get a keyset pager over the TIMETABLE table, shared by every session
+@st.cache_resource
+def get_timetable_pager(db_path):
+    return KeysetPager(db_path, "TIMETABLE")
+
+# Function to show one page of a pager's rows with page-size and previous/next controls
+# (only the current page is fetched and sent to the browser; the cursor stack lives in session state)
+def show_paginated(key, pager):
+    size = st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key=f"{key}_size")
+    state = st.session_state.setdefault(f"{key}_pages", {"cursors": [None], "size": size})
+    if state["size"] != size:
+        state.update(cursors=[None], size=size)
+    page = pager.page(state["cursors"][-1], size)
+
+    first = (len(state["cursors"]) - 1) * size
+    st.dataframe(page.frame)
+    if page.frame.empty:
+        st.caption("No rows")
+    else:
+        st.caption(f"Rows {first + 1}-{first + len(page.frame)} of about {pager.estimate_rows()}")
+    previous, following = st.columns(2)
+    previous.button("Previous page", key=f"{key}_prev", disabled=len(state["cursors"]) == 1,
+                    on_click=lambda: state["cursors"].pop())
+    following.button("Next page", key=f"{key}_next", disabled=not page.has_more,
+                     on_click=lambda: state["cursors"].append(page.after))
+
+# Function to read the dashboard's maintained counts (installed with their triggers on first use)
+def get_dashboard_stats(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        install_dashboard_stats(conn)
+        return read_dashboard_stats(conn)
+    finally:
+        conn.close()
+
 # Function to add a column to the database
 def add_column_to_db(db_path, column_name):
     conn = sqlite3.connect(db_path)
@@ -48,13 +147,9 @@ def add_column_to_db(db_path, column_name):
     conn.close()
 
 # Function to map Excel columns to database columns using Gemini Pro API
+# (cached per header set and schema; exact/near-exact headers skip the model; the rest go in one prompt)
 def map_columns(excel_columns, db_columns):
-    mappings = {}
-    for excel_col in excel_columns:
-        prompt = f"Find the best match for the column '{excel_col}' from the following options: {', '.join(db_columns)}"
-        best_match = get_gemini_response(prompt).strip()
-        mappings[excel_col] = best_match
-    return mappings
+    return ColumnMapper(get_gemini_response).map(excel_columns, db_columns)
 
 # Function to process the Excel file and update the database
 def process_excel_file(uploaded_file, db_path, action):
@@ -73,32 +168,14 @@ def process_excel_file(uploaded_file, db_path, action):
             add_column_to_db(db_path, db_col)
             existing_columns.append(db_col)
 
-    for index, row in df.iterrows():
-        mapped_row = {column_mappings[col]: value for col, value in row.items()}
-
-        if action == "remove":
-            cursor.execute("DELETE FROM TIMETABLE WHERE NAME=?", (mapped_row.get('NAME'),))
-
-        elif action == "modify":
-            set_clause = ", ".join([f"{col}=?" for col in mapped_row.keys()])
-            values = tuple(mapped_row.values())
-            cursor.execute(f"UPDATE TIMETABLE SET {set_clause} WHERE NAME=?", values + (mapped_row.get('NAME'),))
-
-        else:
-            cursor.execute("SELECT * FROM TIMETABLE WHERE NAME=?", (mapped_row.get('NAME'),))
-            existing_entry = cursor.fetchone()
-            if existing_entry:
-                set_clause = ", ".join([f"{col}=?" for col in mapped_row.keys()])
-                values = tuple(mapped_row.values())
-                cursor.execute(f"UPDATE TIMETABLE SET {set_clause} WHERE NAME=?", values + (mapped_row.get('NAME'),))
-            else:
-                columns = ", ".join(mapped_row.keys())
-                placeholders = ", ".join(["?" for _ in mapped_row])
-                values = tuple(mapped_row.values())
-                cursor.execute(f"INSERT INTO TIMETABLE ({columns}) VALUES ({placeholders})", values)
-
-    conn.commit()
+    # Stage the whole sheet and apply it with set-based statements in one transaction
+    validator = get_timetable_validator(db_path)
+    validator.watch(conn)
+    staged = stage_frame(df, column_mappings)
+    apply_upload(conn, staged, action)
+    clashes = validator.apply_changes(conn)
     conn.close()
+    return clashes
 
 # Defining your prompts
 sql_prompt = """
@@ -214,24 +291,65 @@ if page == "Ask Question About the Timetable":
         if question:
             st.markdown('</div>', unsafe_allow_html=True)
             st.markdown('<div class="result-section">', unsafe_allow_html=True)
-            st.write("Generating SQL query...")
-            sql_query = generate_sql_query(sql_prompt, question)
-            st.write(f"Generated SQL query: {sql_query}")
+            db_path = '/home/mukesh/Github-my repos/Mini projet/Time_Table_Management_Using_GenAI/timetable.db'
+            sql_cache = get_sql_cache()
+            schema = schema_fingerprint(db_path)
+            started = time.perf_counter()
+            # Common question shapes are answered locally; the cache and then the model handle the rest
+            plan = get_query_planner(db_path).plan(question)
+            if plan is not None:
+                sql_query, params, served_by = plan.sql, plan.params, f"rules ({plan.intent})"
+                st.write(f"Planned SQL query: {sql_query} {list(params)}")
+            else:
+                params = ()
+                sql_query, cache_tier = sql_cache.get(question, schema)
+                if sql_query is None:
+                    st.write("Generating SQL query...")
+                    try:
+                        sql_query = st.write_stream(stream_sql_query(sql_prompt, question)).strip()
+                    except LLMError as e:
+                        st.markdown('<div class="error">', unsafe_allow_html=True)
+                        st.write(f"Error: {e}")
+                        st.markdown('</div>', unsafe_allow_html=True)
+                        st.stop()
+                    served_by = "llm"
+                else:
+                    st.write(f"Cached SQL query ({cache_tier} match): {sql_query}")
+                    served_by = f"cache ({cache_tier})"
 
             st.write("Fetching data from the database...")
-            db_path = '/home/mukesh/Github-my repos/Mini projet/Time_Table_Management_Using_GenAI/timetable.db'
             try:
-                results = read_sql_query(sql_query, db_path)
-                if not results.empty:
-                    st.write("Query Results:")
-                    st.dataframe(results)
-                else:
+                guarded = guarded_read_sql_query(sql_query, db_path, params)
+                results = guarded.frame
+                # Only model SQL that ran is worth reusing
+                if served_by == "llm":
+                    sql_cache.put(question, sql_query, schema)
+                # Kept for the page controls below, which rerun the script without the button press
+                st.session_state["ask_results"] = (FramePager(results), guarded.truncated)
+                st.session_state.pop("ask_pages", None)
+                if results.empty:
                     st.write("No results found.")
+            except QueryRejected as e:
+                st.markdown('<div class="error">', unsafe_allow_html=True)
+                st.write(f"Query not run: {e}")
+                st.markdown('</div>', unsafe_allow_html=True)
             except Exception as e:
                 st.markdown('<div class="error">', unsafe_allow_html=True)
                 st.write(f"Error: {e}")
                 st.markdown('</div>', unsafe_allow_html=True)
+            stats = sql_cache.stats
+            st.caption(
+                f"Served by {served_by} in {(time.perf_counter() - started) * 1000:.0f} ms. "
+                f"SQL cache: {stats['exact_hits']} exact / {stats['similar_hits']} similar hits, "
+                f"{stats['misses']} misses, {len(sql_cache)} entries"
+            )
             st.markdown('</div>', unsafe_allow_html=True)
+    pager, truncated = st.session_state.get("ask_results", (None, False))
+    if pager is not None and not pager.frame.empty:
+        st.write("Query Results:")
+        show_paginated("ask", pager)
+        if truncated:
+            st.caption(f"Only the first {len(pager.frame)} rows were fetched; narrow the question to see the rest.")
     st.markdown('</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -242,17 +360,21 @@ elif page == "Timetable Dashboard":
     st.markdown('<div class="dashboard-section">', unsafe_allow_html=True)
 
     db_path = 'timetable.db'
-    df = read_sql_query("SELECT * FROM TIMETABLE", db_path)
 
     st.write("### Timetable Overview")
-    st.dataframe(df)
-
-    st.write("### Class Distribution by Day")
-    fig = px.histogram(df, x='DAY', title='Class Distribution by Day')
-    st.plotly_chart(fig)
-
-    st.write("### Class Distribution by Subject")
-    fig = px.histogram(df, x='SUBJECT', title='Class Distribution by Subject')
+    show_paginated("dashboard", get_timetable_pager(db_path))
+
+    # Charts read the counts triggers keep up to date, a few rows each however large TIMETABLE gets
+    stats = get_dashboard_stats(db_path)
+    for dimension, label in [("DAY", "Day"), ("SUBJECT", "Subject"), ("ROOM", "Room"), ("PROFESSOR", "Faculty")]:
+        st.write(f"### Class Distribution by {label}")
+        fig = px.bar(stats[dimension], x='value', y='count', title=f'Class Distribution by {label}',
+                     labels={'value': dimension})
+        st.plotly_chart(fig)
+
+    st.write("### Room Utilization by Period")
+    fig = px.bar(period_utilization(stats), x='TIME', y='utilization', title='Share of Rooms in Use by Period')
+    fig.update_yaxes(tickformat='.0%')
     st.plotly_chart(fig)
 
     st.markdown('</div>', unsafe_allow_html=True)
@@ -272,14 +394,21 @@ elif page == "Modify Timetable":
             st.markdown('</div>', unsafe_allow_html=True)
             st.markdown('<div class="result-section">', unsafe_allow_html=True)
             st.write("Generating SQL query...")
-            sql_query = generate_sql_query(modification_prompt, modification_command)
+            try:
+                sql_query = generate_sql_query(modification_prompt, modification_command)
+            except LLMError as e:
+                st.markdown('<div class="error">', unsafe_allow_html=True)
+                st.write(f"Error: {e}")
+                st.markdown('</div>', unsafe_allow_html=True)
+                st.stop()
             st.write(f"Generated SQL query: {sql_query}")
 
             st.write("Executing query on the database...")
             db_path = 'timetable.db'
             try:
-                execute_sql_query(sql_query, db_path)
+                clashes = execute_sql_query(sql_query, db_path)
                 st.write("Modification successful.")
+                show_clashes(clashes, db_path)
             except Exception as e:
                 st.markdown('<div class="error">', unsafe_allow_html=True)
                 st.write(f"Error: {e}")
@@ -294,8 +423,9 @@ elif page == "Modify Timetable":
     if uploaded_file and st.button("Process File"):
         st.write("Processing file...")
         try:
-            process_excel_file(uploaded_file, 'timetable.db', action)
+            clashes = process_excel_file(uploaded_file, 'timetable.db', action)
             st.write("File processed successfully.")
+            show_clashes(clashes, 'timetable.db')
         except Exception as e:
             st.markdown('<div class="error">', unsafe_allow_html=True)
             st.write(f"Error: {e}")